@@ -0,0 +1,15 @@
+import type { AxiosResponse } from "axios";
+import api from "./axiosInstance";
+import type { Paginated } from "../types";
+
+// Suit les liens `next` des listes paginées par curseur jusqu'à la dernière page
+export const getAllPages = async <T>(url: string): Promise<T[]> => {
+  const results: T[] = [];
+  let next: string | null = url;
+  while (next) {
+    const res: AxiosResponse<Paginated<T>> = await api.get<Paginated<T>>(next);
+    results.push(...res.data.results);
+    next = res.data.next;
+  }
+  return results;
+};
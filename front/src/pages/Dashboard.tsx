@@ -3,6 +3,7 @@ import { useNavigate } from "react-router-dom";
 import EditProjectModal from "../components/EditProjectModal";
 import CreateProjectModal from "../components/CreateProjectModal";
 import api from "../api/axiosInstance";
+import { getAllPages } from "../api/pagination";
 import { useAuthContext } from "../context/auth";
 import type { Project, User } from "../types";
 
@@ -38,8 +39,7 @@ export default function Dashboard() {
   const fetchProjects = async () => {
     setLoading(true);
     try {
-      const res = await api.get<Project[]>("/projects/");
-      setProjects(res.data);
+      setProjects(await getAllPages<Project>("/projects/?page_size=500&count=false"));
     } catch {
       setErrorMessage("Impossible de récupérer les projets");
     } finally {
@@ -1,6 +1,7 @@
 import { useEffect, useState, useCallback } from "react";
 import { useParams } from "react-router-dom";
 import api from "../api/axiosInstance";
+import { getAllPages } from "../api/pagination";
 import { useAuthContext } from "../context/auth";
 import type { Project, Task, User, TaskStatus, TaskPriority } from "../types";
 import EditTaskModal from "../components/EditTaskModal";
@@ -62,8 +63,7 @@ export default function ProjectDetail() {
       const projectRes = await api.get<Project>(`/projects/${projectId}/`);
       setProject(projectRes.data);
 
-      const tasksRes = await api.get<Task[]>(`/tasks/?project_id=${projectId}`);
-      setTasks(tasksRes.data);
+      setTasks(await getAllPages<Task>(`/tasks/?project_id=${projectId}&page_size=500&count=false`));
     } catch (err: unknown) {
       console.error(err);
       setErrorMessage(err instanceof Error ? err.message : "Erreur lors du chargement");
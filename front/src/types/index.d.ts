@@ -64,3 +64,11 @@ export interface User {
   username: string;
 }
 
+
+// Pagination
+export interface Paginated<T> {
+  next: string | null;
+  previous: string | null;
+  count?: number;
+  results: T[];
+}
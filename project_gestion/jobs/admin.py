@@ -0,0 +1,7 @@
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "attempts", "created_by", "created_at", "finished_at")
+    list_filter = ("kind", "status")
@@ -0,0 +1,63 @@
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from projects.deletion import CascadeDeleter, DeletionReport
+from projects.models import Project
+from tasks import export, imports
+from .queue import register, report
+
+
+@register("projects.delete")
+def delete_project(job):
+    project = Project.objects.filter(pk=job.payload["project"]).first()
+    if project is None:
+        # Already gone, e.g. a retry after the last batch
+        return {"project": job.payload["project"], **DeletionReport().as_dict()}
+    deleter = CascadeDeleter(on_progress=lambda r: report(job, **r.as_dict()))
+    return {"project": project.pk, **deleter.delete_project(project).as_dict()}
+
+
+def spool_upload(stream, name):
+    """Copy a request body to storage in bounded reads; returns the stored name."""
+    with tempfile.TemporaryFile() as file:
+        while chunk := stream.read(64 * 1024):
+            file.write(chunk)
+        file.seek(0)
+        return default_storage.save(name, File(file))
+
+
+@register("tasks.import")
+def import_tasks(job):
+    """Imports the upload spooled by ProjectViewSet.import_tasks; rows already imported are not undone on failure."""
+    name = job.payload["file"]
+    try:
+        project = Project.objects.get(pk=job.payload["project"])
+        user = User.objects.get(pk=job.payload["user"])
+        importer = imports.TaskImporter(
+            user, project, on_progress=lambda r: report(job, rows=r.rows, created=r.created, failed=r.failed)
+        )
+        with default_storage.open(name, "rb") as stream:
+            return importer.run(imports.PARSERS[job.payload["format"]](stream)).as_dict()
+    finally:
+        # Imports are never retried (a second run would duplicate the created tasks)
+        default_storage.delete(name)
+
+
+@register("projects.export")
+def export_tasks(job):
+    """Writes the export to a temporary file, then to storage; served by /api/jobs/{id}/download/."""
+    project = Project.objects.get(pk=job.payload["project"])
+    format = job.payload["format"]
+    build, content_type = export.FORMATS[format]
+    with tempfile.TemporaryFile() as file:
+        for count, line in enumerate(build(project), start=1):
+            file.write(line)
+            if count % export.CHUNK_SIZE == 0:
+                report(job, lines=count)
+        size = file.tell()
+        file.seek(0)
+        name = default_storage.save(f"jobs/project-{project.id}-{job.pk}.{format}", File(file))
+    return {"file": name, "content_type": content_type, "size": size}
@@ -0,0 +1,63 @@
+import os
+import signal
+import socket
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from jobs import queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs (project deletion, large imports, exports) with a pool of worker threads. "
+        "Several processes, on several hosts, can run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument("--poll", type=float, default=1.0, help="Seconds to wait when no job is runnable.")
+        parser.add_argument("--kind", action="append", dest="kinds", help="Only run jobs of this kind (repeatable).")
+        parser.add_argument("--once", action="store_true", help="Run the runnable jobs, then exit.")
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            count = queue.run_pending(self.worker_name(0), options["kinds"])
+            self.stdout.write(f"{count} jobs run.")
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+        threads = [
+            threading.Thread(target=self.work, args=(self.worker_name(i), options, stop), name=f"job-worker-{i}")
+            for i in range(options["threads"])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f"{len(threads)} workers started, waiting for jobs.")
+        while any(thread.is_alive() for thread in threads):
+            # A timeout keeps the main thread responsive to signals
+            for thread in threads:
+                thread.join(timeout=0.5)
+        self.stdout.write("Workers stopped.")
+
+    @staticmethod
+    def worker_name(index):
+        return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+    def work(self, worker, options, stop):
+        try:
+            while not stop.is_set():
+                # Long-lived thread: drop connections that are broken or past CONN_MAX_AGE
+                close_old_connections()
+                job = queue.claim(worker, options["kinds"])
+                if job is None:
+                    stop.wait(options["poll"])
+                    continue
+                self.stdout.write(f"{worker} running {job}")
+                job = queue.execute(job)
+                self.stdout.write(f"{worker} {job}")
+        finally:
+            connection.close()
@@ -0,0 +1,108 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# kind -> handler(job), filled by register()
+HANDLERS = {}
+
+
+def register(kind):
+    """Decorator: ``handler(job)`` runs jobs of ``kind`` and returns their JSON result."""
+    def decorator(handler):
+        HANDLERS[kind] = handler
+        return handler
+    return decorator
+
+
+def enqueue(kind, payload, user=None, max_attempts=3):
+    if kind not in HANDLERS:
+        raise LookupError(f"No handler registered for job kind {kind!r}.")
+    return Job.objects.create(kind=kind, payload=payload, created_by=user, max_attempts=max_attempts)
+
+
+def lease_seconds():
+    return getattr(settings, "JOBS_LEASE_SECONDS", 600)
+
+
+def claim(worker, kinds=None):
+    """
+    Take the next runnable job for ``worker``, or None. Queued jobs whose
+    time has come, and running jobs whose worker stopped reporting for
+    longer than the lease, are eligible. On PostgreSQL, SKIP LOCKED lets
+    concurrent workers each take a different job without waiting.
+    """
+    now = timezone.now()
+    runnable = Job.objects.filter(
+        Q(status=Job.Status.QUEUED, run_after__lte=now)
+        | Q(status=Job.Status.RUNNING, locked_at__lt=now - timedelta(seconds=lease_seconds()))
+    )
+    if kinds:
+        runnable = runnable.filter(kind__in=kinds)
+    with transaction.atomic():
+        job = runnable.select_for_update(skip_locked=True).order_by("run_after", "id").first()
+        if job is None:
+            return None
+        job.status = Job.Status.RUNNING
+        job.attempts += 1
+        job.locked_by = worker
+        job.locked_at = now
+        job.started_at = job.started_at or now
+        job.save(update_fields=["status", "attempts", "locked_by", "locked_at", "started_at"])
+    return job
+
+
+def report(job, **progress):
+    """Record progress; also renews the worker's lease on the job."""
+    job.progress = {**job.progress, **progress}
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(progress=job.progress, locked_at=timezone.now())
+
+
+def execute(job):
+    """Run a claimed job; failures are retried with exponential backoff until max_attempts."""
+    try:
+        handler = HANDLERS.get(job.kind)
+        if handler is None:
+            raise LookupError(f"No handler registered for job kind {job.kind!r}.")
+        if job.attempts > job.max_attempts:
+            # Claimed again after its worker died on the last attempt
+            raise RuntimeError("Worker lost while running the last attempt.")
+        result = handler(job)
+    except Exception:
+        logger.exception("Job %s (%s) failed, attempt %d of %d", job.pk, job.kind, job.attempts, job.max_attempts)
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            delay = getattr(settings, "JOBS_RETRY_DELAY_SECONDS", 30) * 2 ** (job.attempts - 1)
+            job.status, job.run_after = Job.Status.QUEUED, timezone.now() + timedelta(seconds=delay)
+        else:
+            job.status, job.finished_at = Job.Status.FAILED, timezone.now()
+            # The spooled upload (imports) is of no use anymore, even when the handler never got to run
+            if "file" in job.payload:
+                default_storage.delete(job.payload["file"])
+    else:
+        job.status, job.result, job.error, job.finished_at = Job.Status.SUCCEEDED, result, "", timezone.now()
+
+    fields = ["status", "result", "error", "run_after", "finished_at", "progress"]
+    values = {field: getattr(job, field) for field in fields}
+    # A worker whose lease was taken over must not overwrite the new run's state
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(locked_by="", locked_at=None, **values)
+    job.locked_by, job.locked_at = "", None
+    return job
+
+
+def run_pending(worker="inline", kinds=None):
+    """Run jobs until none is runnable; returns how many ran. For tests and ``run_workers --once``."""
+    count = 0
+    while (job := claim(worker, kinds)) is not None:
+        execute(job)
+        count += 1
+    return count
@@ -0,0 +1,202 @@
+import io
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jobs import queue
+from jobs.models import Job
+from projects.models import Project, ProjectMember
+from sync.models import Tombstone
+from tasks.models import Task
+
+
+class QueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        self.addCleanup(queue.HANDLERS.pop, "test.flaky", None)
+
+        @queue.register("test.flaky")
+        def flaky(job):
+            self.calls.append(job.attempts)
+            if len(self.calls) <= job.payload["failures"]:
+                raise ValueError("boom")
+            queue.report(job, done=True)
+            return {"calls": len(self.calls)}
+
+    def test_success(self):
+        job = queue.enqueue("test.flaky", {"failures": 0})
+        self.assertEqual(queue.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.progress, job.attempts), ("SUCCEEDED", {"calls": 1}, {"done": True}, 1))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_retried_with_backoff_then_failed(self):
+        job = queue.enqueue("test.flaky", {"failures": 5}, max_attempts=2)
+        with self.assertLogs("jobs.queue", "ERROR"):
+            self.assertEqual(queue.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("QUEUED", 1))
+        self.assertIn("ValueError: boom", job.error)
+        self.assertGreater(job.run_after, timezone.now())
+        # Not runnable before its retry time
+        self.assertEqual(queue.run_pending(), 0)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs("jobs.queue", "ERROR"):
+            self.assertEqual(queue.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("FAILED", 2))
+
+    def test_abandoned_job_is_taken_over(self):
+        job = queue.enqueue("test.flaky", {"failures": 0})
+        claimed = queue.claim("lost-worker")
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertIsNone(queue.claim("other-worker"))
+
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(queue.run_pending("other-worker"), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("SUCCEEDED", 2))
+        # The lost worker finishing late changes nothing
+        queue.execute(claimed)
+        job.refresh_from_db()
+        self.assertEqual(job.result, {"calls": 1})
+
+    def test_unknown_kind(self):
+        with self.assertRaises(LookupError):
+            queue.enqueue("test.unknown", {})
+
+    def test_run_workers_once(self):
+        queue.enqueue("test.flaky", {"failures": 0})
+        out = io.StringIO()
+        call_command("run_workers", once=True, stdout=out)
+        self.assertIn("1 jobs run.", out.getvalue())
+
+
+class ProjectJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        settings = override_settings(MEDIA_ROOT=media)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        for i in range(3):
+            task = Task.objects.create(project=self.project, title=f"Tâche {i}", created_by=self.toto)
+            task.assignees.add(self.toto)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.toto)
+
+    def job_status(self, response, client=None):
+        self.assertEqual(response.status_code, 202, response.content)
+        return (client or self.client).get(response["Location"])
+
+    @override_settings(JOBS_INLINE_DELETE_MAX_TASKS=2)
+    def test_large_project_deleted_by_a_job(self):
+        response = self.client.delete(f"/api/projects/{self.project.id}/")
+        self.assertEqual(self.job_status(response).data["status"], "QUEUED")
+        self.assertTrue(Project.objects.filter(pk=self.project.pk).exists())
+
+        queue.run_pending()
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertFalse(Task.objects.filter(project_id=self.project.pk).exists())
+        self.assertEqual(Tombstone.objects.filter(kind="task").count(), 3)
+        status = self.client.get(response["Location"]).data
+        self.assertEqual((status["status"], status["result"]["tasks"]), ("SUCCEEDED", 3))
+
+    @override_settings(JOBS_INLINE_DELETE_MAX_TASKS=2)
+    def test_project_hidden_until_deleted_and_job_reused(self):
+        ProjectMember.objects.create(project=self.project, user=self.tata, role="member")
+        url = f"/api/projects/{self.project.id}/"
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.client.delete(url)
+        self.assertEqual(first.status_code, 202)
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.patch(url, {"name": "Renommé"}, format="json").status_code, 404)
+        self.assertEqual(self.client.get("/api/tasks/").data["results"], [])
+        member = APIClient()
+        member.force_authenticate(user=self.tata)
+        self.assertEqual(member.get("/api/projects/").data["results"], [])
+        response = member.post("/api/tasks/", {"project": self.project.id, "title": "Trop tard"}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+        second = self.client.delete(url)
+        self.assertEqual(second["Location"], first["Location"])
+        self.assertEqual(Job.objects.filter(kind="projects.delete").count(), 1)
+
+        queue.run_pending()
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+
+    def test_small_project_deleted_inline(self):
+        response = self.client.delete(f"/api/projects/{self.project.id}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOBS_INLINE_IMPORT_MAX_BYTES=10)
+    def test_large_import_runs_as_a_job(self):
+        body = "".join(json.dumps({"title": f"Importée {i}", "assignees": ["toto"]}) + "\n" for i in range(4))
+        response = self.client.post(
+            f"/api/projects/{self.project.id}/import/", body, content_type="application/x-ndjson"
+        )
+        self.assertEqual(self.job_status(response).data["kind"], "tasks.import")
+        self.assertEqual(Task.objects.count(), 3)
+
+        queue.run_pending()
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.result["created"]), ("SUCCEEDED", 4))
+        self.assertEqual(Task.objects.filter(title__startswith="Importée", assignees=self.toto).count(), 4)
+        self.assertEqual(job.max_attempts, 1)
+
+    @override_settings(JOBS_INLINE_IMPORT_MAX_BYTES=10)
+    def test_upload_removed_when_the_last_attempt_was_lost(self):
+        body = json.dumps({"title": "Importée"}) + "\n"
+        self.client.post(f"/api/projects/{self.project.id}/import/", body, content_type="application/x-ndjson")
+        job = queue.claim("lost-worker")
+        self.assertTrue(default_storage.exists(job.payload["file"]))
+
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        with self.assertLogs("jobs.queue", "ERROR"):
+            queue.run_pending("other-worker")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("FAILED", 2))
+        self.assertFalse(default_storage.exists(job.payload["file"]))
+        self.assertEqual(Task.objects.count(), 3)
+
+    def test_export_job_and_download(self):
+        response = self.client.post(f"/api/projects/{self.project.id}/export/job/", {"format": "csv"}, format="json")
+        location = response["Location"]
+        self.assertEqual(self.job_status(response).status_code, 200)
+        self.assertEqual(self.client.get(f"{location}download/").status_code, 404)
+
+        queue.run_pending()
+        download = self.client.get(f"{location}download/")
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(download["Content-Type"], "text/csv; charset=utf-8")
+        streamed = self.client.get(f"/api/projects/{self.project.id}/export/?format=csv")
+        self.assertEqual(b"".join(download.streaming_content), b"".join(streamed.streaming_content))
+
+        # Someone else's job does not exist for them
+        other = APIClient()
+        other.force_authenticate(user=self.tata)
+        self.assertEqual(other.get(location).status_code, 404)
+
+    def test_export_job_checks(self):
+        url = f"/api/projects/{self.project.id}/export/job/"
+        self.assertEqual(self.client.post(url, {"format": "xml"}, format="json").status_code, 400)
+        self.client.force_authenticate(user=self.tata)
+        self.assertEqual(self.client.post(url, {}, format="json").status_code, 404)
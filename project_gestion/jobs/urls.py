@@ -0,0 +1,11 @@
+# jobs/urls.py
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import JobViewSet
+
+router = DefaultRouter()
+router.register(r'', JobViewSet, basename='job')
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
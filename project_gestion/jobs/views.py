@@ -0,0 +1,40 @@
+from django.core.files.storage import default_storage
+from django.http import FileResponse
+from django.urls import reverse
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+def accepted(job):
+    """202 response for work handed to a job, pointing at its status."""
+    return Response(
+        JobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={"Location": reverse("job-detail", args=[job.pk])}
+    )
+
+
+class JobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """Status of the caller's own jobs. Polled right after enqueueing: always read from the primary."""
+
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return Job.objects.filter(created_by=self.request.user)
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        result = job.result or {}
+        if job.status != Job.Status.SUCCEEDED or not result.get("file") or not default_storage.exists(result["file"]):
+            raise NotFound("This job has no file to download.")
+        return FileResponse(
+            default_storage.open(result["file"], "rb"),
+            as_attachment=True,
+            filename=result["file"].rpartition("/")[2],
+            content_type=result.get("content_type"),
+        )
@@ -9,8 +9,13 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_gestion.settings')
 
 application = get_asgi_application()
+if settings.DEBUG:
+    # What runserver did: serve the admin's static files in development
+    application = ASGIStaticFilesHandler(application)
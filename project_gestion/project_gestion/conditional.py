@@ -0,0 +1,84 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers, quote_etag
+from django.utils.http import http_date
+
+
+class ConditionalRequestMixin:
+    """
+    ETag / Last-Modified validators for ModelViewSets over TimeStampedModel.
+
+    Lists are fingerprinted with one ``max(updated_at), count(*)`` aggregate
+    over the filtered queryset, details with the row's ``updated_at``, so a
+    matching ``If-None-Match`` (or, on details, ``If-Modified-Since``)
+    returns 304 before anything is serialized. Updates and deletes honour
+    ``If-Match`` and answer 412 when the client's copy is stale.
+    """
+
+    def list(self, request, *args, **kwargs):
+        def render():
+            return super(ConditionalRequestMixin, self).list(request, *args, **kwargs)
+
+        include_count = getattr(self.paginator, "get_include_count", None)
+        if include_count is not None and not include_count(request):
+            # The ETag needs the count: a client that opted out of it gets no validators either
+            return render()
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.aggregate(last_modified=Max("updated_at"), count=Count("pk"))
+        self.list_count = stats["count"]
+        etag = self.make_etag("list", request.user.pk, stats["last_modified"], stats["count"], request.get_full_path())
+        # No Last-Modified: deleting a row does not move max(updated_at), only the count in the ETag sees it
+        return self.conditional_response(request, etag, None, render)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.conditional_response(
+            request, self.get_object_etag(instance), instance.updated_at,
+            lambda: super(ConditionalRequestMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+    def update(self, request, *args, **kwargs):
+        instance = self.get_object()
+        failed = get_conditional_response(request, etag=self.get_object_etag(instance))
+        if failed is not None:
+            return failed
+        response = super().update(request, *args, **kwargs)
+        return self.add_validators(response, self.get_object_etag(instance), instance.updated_at)
+
+    def destroy(self, request, *args, **kwargs):
+        failed = get_conditional_response(request, etag=self.get_object_etag(self.get_object()))
+        if failed is not None:
+            return failed
+        return super().destroy(request, *args, **kwargs)
+
+    def get_object(self):
+        # Preconditions and the action itself share one lookup
+        if not hasattr(self, "_conditional_object"):
+            self._conditional_object = super().get_object()
+        return self._conditional_object
+
+    def get_object_etag(self, instance):
+        return self.make_etag("detail", instance.pk, instance.updated_at)
+
+    def make_etag(self, *parts):
+        scope = getattr(self, "basename", None) or type(self).__name__
+        digest = hashlib.md5(repr((scope,) + parts).encode(), usedforsecurity=False).hexdigest()
+        return quote_etag(digest)
+
+    def conditional_response(self, request, etag, last_modified, render):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = render()
+        return self.add_validators(response, etag, last_modified)
+
+    @staticmethod
+    def add_validators(response, etag, last_modified):
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = http_date(last_modified.timestamp())
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ["Authorization"])
+        return response
@@ -0,0 +1,229 @@
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+# Stats of the request being served, seen by the query wrapper in whatever thread runs the view
+_current = ContextVar("metrics_request", default=None)
+
+
+class Metric:
+    def __init__(self, name, help, labels):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _label_text(self, values, extra=()):
+        pairs = list(zip(self.labels, values)) + list(extra)
+        if not pairs:
+            return ""
+        escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def collect(self):
+        with self._lock:
+            series = sorted(self._series.items())
+        return [f"{self.name}_total{self._label_text(labels)} {value}" for labels, value in series]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels, buckets):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf), then the sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def collect(self):
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        lines = []
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{self.name}_bucket{self._label_text(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(labels)} {values[-1]}")
+            lines.append(f"{self.name}_count{self._label_text(labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def reset(self):
+        for metric in self.metrics:
+            with metric._lock:
+                metric._series.clear()
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "Time spent serving the request.", ("route", "method", "status"),
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+))
+REQUEST_QUERIES = registry.register(Histogram(
+    "http_request_db_queries", "SQL queries run while serving the request.", ("route",),
+    (0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+))
+REQUEST_DB_DURATION = registry.register(Histogram(
+    "http_request_db_duration_seconds", "Time spent in SQL while serving the request.", ("route",),
+    (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+))
+RESPONSE_SIZE = registry.register(Histogram(
+    "http_response_size_bytes", "Size of non-streaming response bodies.", ("route",),
+    (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+))
+QUERY_BUDGET_EXCEEDED = registry.register(Counter(
+    "http_request_query_budget_exceeded", "Requests that ran more than METRICS_QUERY_BUDGET queries.", ("route",),
+))
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+def count_queries(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_time += time.perf_counter() - start
+        stats.queries += 1
+
+
+def install_query_wrapper():
+    # Connections are per thread: runs in the thread that will serve the view
+    for connection in connections.all():
+        if count_queries not in connection.execute_wrappers:
+            connection.execute_wrappers.append(count_queries)
+
+
+def route_name(request):
+    """``TaskViewSet.list`` for DRF views, the URL name (or view path) otherwise."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unmatched>"
+    view = getattr(match.func, "cls", None)
+    if view is not None:
+        actions = getattr(match.func, "actions", None) or {}
+        action = actions.get(request.method.lower(), request.method.lower())
+        return f"{view.__name__}.{action}"
+    return match.url_name or match._func_path
+
+
+def record(request, response, stats, duration):
+    route = route_name(request)
+    REQUEST_DURATION.observe((route, request.method, str(response.status_code)), duration)
+    REQUEST_QUERIES.observe((route,), stats.queries)
+    REQUEST_DB_DURATION.observe((route,), stats.db_time)
+    if not response.streaming:
+        RESPONSE_SIZE.observe((route,), len(response.content))
+
+    budget = settings.METRICS_QUERY_BUDGET
+    if budget is not None and stats.queries > budget:
+        QUERY_BUDGET_EXCEEDED.inc((route,))
+        logger.warning(
+            "%s %s (%s) ran %d SQL queries, budget is %d",
+            request.method, request.path, route, stats.queries, budget,
+        )
+
+
+class MetricsMiddleware:
+    """
+    Per-route latency, SQL query count / time and response size. Queries
+    are counted while the view runs; a streaming body's queries and size
+    are not. Values live in this process only.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        install_query_wrapper()
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        await sync_to_async(install_query_wrapper)()
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        record(request, response, stats, time.perf_counter() - start)
+        return response
+
+
+def metrics_view(request):
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        return HttpResponse(status=403)
+    if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse(status=403)
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,189 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination.
+
+    Each page is fetched with a ``WHERE (updated_at, id) < (<last seen>)``
+    filter instead of an OFFSET, so with a matching composite index every
+    page is a bounded index range scan whatever its depth. The ordering
+    fields must be non-null and end with a unique column (``id``).
+    """
+
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    ordering = ("-updated_at", "-id")
+    include_count = True
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(view)
+        position, reverse = self.decode_cursor(request)
+        if position is not None:
+            position = self.coerce_position(queryset, position)
+
+        self.count = self.get_count(queryset, view) if self.get_include_count(request) else None
+
+        if position is not None:
+            queryset = queryset.filter(self.build_seek_filter(position, reverse))
+
+        order_by = [self._flip(field) for field in self.ordering] if reverse else list(self.ordering)
+        rows = list(queryset.order_by(*order_by)[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = position is not None, has_more
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        payload = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {"type": "integer"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, view):
+        if view is not None and hasattr(view, "get_keyset_ordering"):
+            return tuple(view.get_keyset_ordering())
+        return tuple(getattr(view, "keyset_ordering", self.ordering))
+
+    def get_include_count(self, request):
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return self.include_count
+        return value.lower() not in ("0", "false", "no", "off")
+
+    def get_count(self, queryset, view):
+        # Views that already aggregated the list (conditional GET) share the count
+        count = getattr(view, "list_count", None)
+        return queryset.count() if count is None else count
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def build_seek_filter(self, position, reverse):
+        """
+        Expand ``(f1, f2, ...) > (p1, p2, ...)`` into
+        ``f1 >= p1 AND (f1 > p1 OR (f1 = p1 AND f2 > p2) ...)``.
+        The redundant bound on the leading column lets the planner turn
+        the predicate into an index range.
+        """
+        fields = [(field.lstrip("-"), field.startswith("-") != reverse) for field in self.ordering]
+        seek = Q()
+        equal = {}
+        for (name, descending), value in zip(fields, position):
+            seek |= Q(**equal, **{f"{name}__{'lt' if descending else 'gt'}": value})
+            equal[name] = value
+        leading, descending = fields[0]
+        return Q(**{f"{leading}__{'lte' if descending else 'gte'}": position[0]}) & seek
+
+    def encode_cursor(self, row, reverse):
+        values = [self._dump(self._value(row, field.lstrip("-"))) for field in self.ordering]
+        token = json.dumps({"p": values, "r": int(reverse)}, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(token.encode()).decode()
+        # ?count= stays in the links: a client that opted out of the total keeps it off on every page
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            token = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            position = [self._load(value) for value in token["p"]]
+            reverse = bool(token.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def coerce_position(self, queryset, position):
+        """Check each cursor value against its ordering field, so a forged one is a 404 and not a 500."""
+        coerced = []
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            annotation = queryset.query.annotations.get(name)
+            model_field = annotation.output_field if annotation is not None else queryset.model._meta.get_field(name)
+            try:
+                value = model_field.to_python(value)
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            coerced.append(value)
+        return coerced
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _value(row, name):
+        return row[name] if isinstance(row, dict) else getattr(row, name)
+
+    @staticmethod
+    def _dump(value):
+        if isinstance(value, datetime):
+            return {"dt": value.isoformat()}
+        if isinstance(value, date):
+            return {"d": value.isoformat()}
+        return value
+
+    @staticmethod
+    def _load(value):
+        if isinstance(value, dict):
+            if "dt" in value:
+                return datetime.fromisoformat(value["dt"])
+            if "d" in value:
+                return date.fromisoformat(value["d"])
+            raise ValueError("Unknown cursor value.")
+        return value
@@ -0,0 +1,56 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - the stdlib json path below takes over
+    orjson = None
+
+
+def _default(obj):
+    # Everything orjson does not know natively (Decimal, lazy strings, QuerySets...)
+    # is encoded the way DRF's encoder does it
+    return JSONEncoder().default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson-backed JSONRenderer producing the same documents as DRF's:
+    compact, UTF-8, UTC datetimes with a ``Z`` suffix, ISO dates, and
+    U+2028/U+2029 escaped. Falls back to the stdlib renderer when orjson
+    is not installed, or for indents orjson cannot produce.
+    """
+
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        options = self.options
+        if indent is not None:
+            if indent != 2:
+                return super().render(data, accepted_media_type, renderer_context)
+            options |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=_default, option=options)
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """orjson-backed JSONParser for UTF-8 bodies; other charsets go through the stdlib parser."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
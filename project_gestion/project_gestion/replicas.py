@@ -0,0 +1,71 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+_read_alias = ContextVar("read_alias", default=None)
+
+
+def replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICAS", ()))
+
+
+def _pin_key(user_id):
+    return f"db:pinned:{user_id}"
+
+
+def pin_to_primary(user):
+    """Send this user's reads to the primary until replicas have caught up with their write."""
+    seconds = getattr(settings, "DATABASE_REPLICA_PIN_SECONDS", 5)
+    if user is not None and user.is_authenticated and seconds:
+        cache.set(_pin_key(user.pk), True, seconds)
+
+
+def is_pinned(user):
+    return user is not None and user.is_authenticated and cache.get(_pin_key(user.pk)) is not None
+
+
+class PrimaryReplicaRouter:
+    """
+    Reads go to the replica chosen for the current request (see
+    ReplicaReadMixin), everything else to the primary. Outside of a
+    routed request the router stays out of the way.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Serves safe (GET/HEAD/OPTIONS) requests from a read replica, unless the
+    user wrote something within DATABASE_REPLICA_PIN_SECONDS; unsafe
+    requests stay on the primary and start that window.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        replicas = replica_aliases()
+        if replicas and request.method in ("GET", "HEAD", "OPTIONS") and not is_pinned(request.user):
+            self._read_alias_token = _read_alias.set(random.choice(replicas))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_read_alias_token", None)
+        if token is not None:
+            _read_alias.reset(token)
+            self._read_alias_token = None
+        elif request.method not in ("GET", "HEAD", "OPTIONS"):
+            pin_to_primary(getattr(request, "user", None))
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,6 +43,10 @@ INSTALLED_APPS = [
     'users',
     'projects',
     'tasks',
+    'sync',
+    'realtime',
+    'search',
+    'jobs',
     "django_extensions",
     "drf_spectacular",
     "corsheaders",
@@ -50,12 +55,22 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # orjson when installed, DRF's stdlib json otherwise
+    'DEFAULT_RENDERER_CLASSES': (
+        'project_gestion.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'project_gestion.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 CORS_ALLOW_CREDENTIALS = True
@@ -69,8 +84,12 @@ CORS_ALLOW_HEADERS = [
     "dnt",
     "cache-control",
     "x-requested-with",
+    "if-match",
+    "if-none-match",
 ]
 
+CORS_EXPOSE_HEADERS = ["etag", "last-modified"]
+
 
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
@@ -86,6 +105,7 @@ SPECTACULAR_SETTINGS = {
 
 
 MIDDLEWARE = [
+    'project_gestion.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -119,18 +139,101 @@ WSGI_APPLICATION = 'project_gestion.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 0))
+
+
+def database_settings(host, port):
+    config = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("DB_NAME", "project_gestion_db"),
+        "USER": os.environ.get("DB_USER", "project_user"),
+        "PASSWORD": os.environ.get("DB_PASSWORD", "technique"),
+        "HOST": host,
+        "PORT": port,
+        # Persistent connections, checked before reuse; the pool replaces them when enabled
+        "CONN_MAX_AGE": 0 if DB_POOL_MAX_SIZE else int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        # Required behind PgBouncer in transaction pooling mode
+        "DISABLE_SERVER_SIDE_CURSORS": os.environ.get("DB_DISABLE_SERVER_SIDE_CURSORS", "0") == "1",
+    }
+    if DB_POOL_MAX_SIZE:
+        # Django's native pool (psycopg 3 and psycopg-pool, both in requirements.txt)
+        config["OPTIONS"] = {"pool": {"min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)), "max_size": DB_POOL_MAX_SIZE}}
+    return config
+
+
 DATABASES = {
+    "default": database_settings(os.environ.get("DB_HOST", "db"), os.environ.get("DB_PORT", "5432")),
+}
+
+# Read replicas, "host[:port],host[:port]": exposed as replica1, replica2, ...
+# GET requests of the API viewsets read from them (project_gestion.replicas),
+# except for a user who wrote within DATABASE_REPLICA_PIN_SECONDS.
+DATABASE_REPLICAS = []
+for number, address in enumerate(filter(None, os.environ.get("DB_REPLICA_HOSTS", "").split(",")), start=1):
+    host, _, port = address.strip().partition(":")
+    alias = f"replica{number}"
+    DATABASES[alias] = {**database_settings(host, port or DATABASES["default"]["PORT"]), "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["project_gestion.replicas.PrimaryReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get("DB_REPLICA_PIN_SECONDS", 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is per process: point LOCATION at a FileBasedCache directory
+# when running several workers so invalidations reach all of them.
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": "project_gestion_db",
-        "USER": "project_user",
-        "PASSWORD": "technique",
-        "HOST": "db",
-        #"HOST": "localhost",
-        "PORT": "5432",
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "project-gestion",
     }
 }
 
+PROJECT_ACCESS_CACHE_TIMEOUT = 300
+# /api/users/me/dashboard/, rebuilt sooner when a task of the user's projects is written
+DASHBOARD_CACHE_SECONDS = int(os.environ.get("DASHBOARD_CACHE_SECONDS", 60))
+
+# Delta sync (/api/sync/)
+SYNC_OVERLAP_SECONDS = 5
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+
+# Board push events (/api/projects/{id}/events/). InMemoryBroker only reaches
+# clients of the same worker; use realtime.brokers.RedisBroker across workers.
+REALTIME_BROKER = {
+    "BACKEND": "realtime.brokers.InMemoryBroker",
+    "OPTIONS": {"max_queue": 100},
+}
+REALTIME_KEEPALIVE_SECONDS = 15
+# Lifetime of the single-use ?ticket= that opens a stream (POST .../events/ticket/)
+REALTIME_TICKET_SECONDS = 30
+# An open stream re-checks its user's access at least this often (and whenever the members change)
+REALTIME_ACCESS_CHECK_SECONDS = 60
+
+# Request metrics, served at /metrics (project_gestion.metrics). A request running more
+# SQL queries than the budget is logged; None (an empty METRICS_QUERY_BUDGET) disables the
+# check. Scrapers must send "Authorization: Bearer <METRICS_TOKEN>"; without a token,
+# /metrics is only served when DEBUG is on.
+METRICS_QUERY_BUDGET = os.environ.get("METRICS_QUERY_BUDGET", "50").strip()
+METRICS_QUERY_BUDGET = int(METRICS_QUERY_BUDGET) if METRICS_QUERY_BUDGET else None
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Background jobs (jobs app), run by "manage.py run_workers". A running job whose worker
+# has not reported for JOBS_LEASE_SECONDS is taken over by another worker. Projects with
+# more tasks, and import bodies larger than these limits, are handled by a job.
+JOBS_LEASE_SECONDS = int(os.environ.get("JOBS_LEASE_SECONDS", 600))
+JOBS_RETRY_DELAY_SECONDS = 30
+JOBS_INLINE_DELETE_MAX_TASKS = int(os.environ.get("JOBS_INLINE_DELETE_MAX_TASKS", 1000))
+JOBS_INLINE_IMPORT_MAX_BYTES = int(os.environ.get("JOBS_INLINE_IMPORT_MAX_BYTES", 1024 * 1024))
+# Job files (spooled imports, finished exports)
+MEDIA_ROOT = os.environ.get("MEDIA_ROOT", BASE_DIR / "media")
+
+# Users resolved from access tokens are kept per process (users.authentication).
+# Saves invalidate the local entry; other workers see the change within the TTL.
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", 1024))
+AUTH_USER_CACHE_SECONDS = int(os.environ.get("AUTH_USER_CACHE_SECONDS", 30))
 
 
 # Password validation
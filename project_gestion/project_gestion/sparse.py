@@ -0,0 +1,100 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Renders only the fields listed in ``context["sparse_fields"]`` (set by
+    SparseFieldsMixin). Input fields and validation are left untouched.
+    """
+
+    @property
+    def _readable_fields(self):
+        selected = self.context.get("sparse_fields")
+        for field in super()._readable_fields:
+            if selected is None or field.field_name in selected:
+                yield field
+
+    def renders(self, name):
+        selected = self.context.get("sparse_fields")
+        return selected is None or name in selected
+
+
+class SparseFieldsMixin:
+    """
+    ``?fields=a,b`` / ``?exclude=c`` on the serializer output, and
+    ``?view=compact`` on lists: rows built straight from ``.values()``
+    with the columns in ``compact_fields`` ({output name: column}), then
+    completed by ``add_compact_relations``.
+    """
+
+    compact_fields = None
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["sparse_fields"] = self.get_sparse_fields(context)
+        return context
+
+    def get_sparse_fields(self, context=None):
+        if hasattr(self, "_sparse_fields"):
+            return self._sparse_fields
+        fields = self._split(self.request.query_params.get("fields"))
+        exclude = self._split(self.request.query_params.get("exclude"))
+        selected = None
+        if fields or exclude:
+            serializer = self.get_serializer_class()(context=context or {})
+            available = [name for name, field in serializer.fields.items() if not field.write_only]
+            unknown = sorted((set(fields) | set(exclude)) - set(available))
+            if unknown:
+                raise ValidationError({"fields": f"Unknown fields: {', '.join(unknown)}."})
+            selected = {name for name in available if (not fields or name in fields) and name not in exclude}
+        self._sparse_fields = selected
+        return selected
+
+    def renders(self, name):
+        selected = self.get_serializer_context()["sparse_fields"]
+        return selected is None or name in selected
+
+    def only_sparse_columns(self, queryset, *required):
+        """Load only the model columns behind the selected fields (lists only)."""
+        context = self.get_serializer_context()
+        selected = context["sparse_fields"]
+        if selected is None or self.action != "list":
+            return queryset
+        serializer = self.get_serializer_class()(context=context)
+        columns = {queryset.model._meta.pk.name, *required}
+        columns.update(name.lstrip("-") for name in self.get_keyset_ordering())
+        columns.update(serializer.fields[name].source for name in selected)
+        return queryset.only(*[name for name in columns if self._is_column(queryset.model, name)])
+
+    def is_compact(self):
+        view = self.request.query_params.get("view", "full")
+        if view not in ("full", "compact") or (view == "compact" and not self.compact_fields):
+            raise ValidationError({"view": f"Unsupported view: {view}."})
+        return view == "compact" and self.action == "list"
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_compact():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        ordering = [name.lstrip("-") for name in self.get_keyset_ordering()]
+        rows = queryset.values(*dict.fromkeys([*self.compact_fields.values(), *ordering]))
+        page = self.paginate_queryset(rows)
+        results = [{name: row[column] for name, column in self.compact_fields.items()} for row in (rows if page is None else page)]
+        self.add_compact_relations(results)
+        return Response(results) if page is None else self.get_paginated_response(results)
+
+    def add_compact_relations(self, rows):
+        pass
+
+    @staticmethod
+    def _split(value):
+        return [name.strip() for name in value.split(",") if name.strip()] if value else []
+
+    @staticmethod
+    def _is_column(model, name):
+        try:
+            return model._meta.get_field(name).concrete
+        except FieldDoesNotExist:
+            return False
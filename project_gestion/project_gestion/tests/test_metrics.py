@@ -0,0 +1,87 @@
+import re
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from project_gestion.metrics import REQUEST_QUERIES, registry
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+
+
+def sample(text, name, **labels):
+    wanted = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}\{{{re.escape(wanted)}\}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+@override_settings(METRICS_TOKEN="secret")
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.addCleanup(registry.reset)
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        Task.objects.create(project=self.project, title="Tâche", created_by=self.toto)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.toto)
+
+    def metrics(self):
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_labels_by_viewset_action(self):
+        self.client.get("/api/tasks/")
+        self.client.get("/api/tasks/")
+        self.client.post(f"/api/projects/{self.project.id}/transfer_ownership/", {}, format="json")
+        text = self.metrics()
+
+        self.assertEqual(sample(text, "http_request_duration_seconds_count", route="TaskViewSet.list", method="GET", status="200"), 2)
+        self.assertEqual(
+            sample(text, "http_request_duration_seconds_count",
+                   route="ProjectViewSet.transfer_ownership", method="POST", status="400"),
+            1,
+        )
+        self.assertGreater(sample(text, "http_request_db_queries_sum", route="TaskViewSet.list"), 0)
+        self.assertGreater(sample(text, "http_response_size_bytes_sum", route="TaskViewSet.list"), 0)
+        self.assertEqual(sample(text, "http_request_db_queries_bucket", route="TaskViewSet.list", le="+Inf"), 2)
+        self.assertIn("# TYPE http_request_duration_seconds histogram", text)
+
+    def test_counts_every_query_of_the_request(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(f"/api/projects/{self.project.id}/")
+        series = REQUEST_QUERIES._series[("ProjectViewSet.retrieve",)]
+        # One observation, whose value (the histogram sum) is every query of the request
+        self.assertEqual(sum(series[:-1]), 1)
+        self.assertEqual(series[-1], len(captured))
+
+    @override_settings(METRICS_QUERY_BUDGET=1)
+    def test_query_budget_warning(self):
+        with self.assertLogs("project_gestion.metrics", "WARNING") as logs:
+            self.client.get("/api/tasks/")
+        self.assertIn("TaskViewSet.list", logs.output[0])
+        text = self.metrics()
+        self.assertEqual(sample(text, "http_request_query_budget_exceeded_total", route="TaskViewSet.list"), 1)
+
+    def test_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_without_token_only_in_debug(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+    async def test_async_requests(self):
+        token = str(AccessToken.for_user(self.toto))
+        await self.async_client.get("/api/tasks/", headers={"Authorization": f"Bearer {token}"})
+        series = REQUEST_QUERIES._series[("TaskViewSet.list",)]
+        self.assertGreater(series[-1], 0)
@@ -0,0 +1,70 @@
+# project_gestion/project_gestion/tests/test_renderers.py
+import io
+import json
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from project_gestion import renderers
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    data = {
+        "created_at": datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=dt_timezone.utc),
+        "updated_at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+        "due_date": date(2025, 2, 1),
+        "amount": Decimal("1.5"),
+        "title": "Tâche\u2028ligne",
+        "items": (1, 2),
+    }
+
+    def test_same_bytes_as_drf(self):
+        self.assertEqual(renderers.FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_indent(self):
+        rendered = renderers.FastJSONRenderer().render({"a": [1]}, "application/json; indent=2")
+        self.assertEqual(json.loads(rendered), {"a": [1]})
+        self.assertIn(b"\n  ", rendered)
+
+    def test_fallback_without_orjson(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(renderers.FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+            self.assertEqual(renderers.FastJSONParser().parse(io.BytesIO(b'{"a": 1}')), {"a": 1})
+
+    def test_parser(self):
+        parser = renderers.FastJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"title": "Tâche"}'.encode())), {"title": "Tâche"})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"title": NaN}'))
+        latin = parser.parse(io.BytesIO('{"t": "é"}'.encode("latin-1")), parser_context={"encoding": "latin-1"})
+        self.assertEqual(latin, {"t": "é"})
+
+
+class FastJSONApiTests(APITestCase):
+    def test_task_round_trip(self):
+        toto = User.objects.create_user(username="toto", password="toto")
+        project = Project.objects.create(name="Projet", owner=toto)
+        ProjectMember.objects.create(project=project, user=toto, role="owner")
+        self.client.force_authenticate(user=toto)
+
+        response = self.client.post(
+            "/api/tasks/", json.dumps({"project": project.id, "title": "Tâche", "due_date": "2025-03-04"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        body = json.loads(self.client.get(f"/api/tasks/{response.data['id']}/").content)
+        self.assertEqual(body["due_date"], "2025-03-04")
+        self.assertEqual(body["title"], "Tâche")
+        self.assertEqual(Task.objects.get().due_date, date(2025, 3, 4))
+
+        response = self.client.post("/api/tasks/", b"{bad", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,80 @@
+# project_gestion/project_gestion/tests/test_replicas.py
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+
+User = get_user_model()
+REPLICA = "replica_test"
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], DATABASE_REPLICA_PIN_SECONDS=60)
+class ReplicaRoutingTests(APITestCase):
+    """Primary and replica are two separate SQLite databases; "replication" is done by hand."""
+
+    @classmethod
+    def setUpClass(cls):
+        # An in-memory database for these tests only; the runner never sees it in `databases`
+        settings = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        connections.settings[REPLICA] = connections.configure_settings({"default": {}, REPLICA: settings})[REPLICA]
+        call_command("migrate", database=REPLICA, verbosity=0)
+        cls.databases = {"default", REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self):
+        cache.clear()  # read-your-writes pins left by other tests for reused user ids
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        ProjectMember.objects.create(project=self.project, user=self.tata, role="member")
+        self.task = Task.objects.create(project=self.project, title="Tâche", created_by=self.toto)
+        self.replicate()
+        self.client.force_authenticate(user=self.toto)
+
+    def replicate(self):
+        for model in (User, Project, ProjectMember, Task):
+            rows = list(model.objects.using("default").order_by("pk"))
+            model.objects.using(REPLICA).all().delete()
+            model.objects.using(REPLICA).bulk_create(rows)
+
+    def titles(self):
+        return [row["title"] for row in self.client.get("/api/tasks/").data["results"]]
+
+    def test_reads_go_to_the_replica(self):
+        Task.objects.using(REPLICA).filter(pk=self.task.pk).update(title="Copie réplica")
+        self.assertEqual(self.titles(), ["Copie réplica"])
+        self.assertEqual(self.client.get(f"/api/projects/{self.project.id}/").status_code, 200)
+
+        User.objects.using(REPLICA).filter(pk=self.tata.pk).update(username="tata-replica")
+        usernames = {user["username"] for user in self.client.get("/api/users/").data}
+        self.assertIn("tata-replica", usernames)
+
+    def test_writer_reads_its_own_writes(self):
+        response = self.client.patch(f"/api/tasks/{self.task.id}/", {"title": "Modifiée"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.using(REPLICA).get(pk=self.task.pk).title, "Tâche")
+
+        self.assertEqual(self.titles(), ["Modifiée"])
+        self.client.force_authenticate(user=self.tata)
+        self.assertEqual(self.titles(), ["Tâche"])
+
+    @override_settings(DATABASE_REPLICA_PIN_SECONDS=0)
+    def test_without_pinning(self):
+        self.client.patch(f"/api/tasks/{self.task.id}/", {"title": "Modifiée"}, format="json")
+        self.assertEqual(self.titles(), ["Tâche"])
+
+    def test_outside_requests_everything_uses_the_primary(self):
+        self.assertEqual(Task.objects.all().db, "default")
+        self.assertEqual(Task.objects.get(pk=self.task.pk)._state.db, "default")
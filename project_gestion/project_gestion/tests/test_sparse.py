@@ -0,0 +1,86 @@
+# project_gestion/project_gestion/tests/test_sparse.py
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class SparseFieldsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.project = Project.objects.create(name="Projet Toto", description="Long texte", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        ProjectMember.objects.create(project=self.project, user=self.tata, role="member")
+        for i in range(3):
+            task = Task.objects.create(project=self.project, title=f"Tâche {i}", description="x" * 500, created_by=self.toto)
+            task.assignees.set([self.tata, self.toto][: i])
+        self.client.force_authenticate(user=self.toto)
+
+    def test_fields_and_exclude(self):
+        response = self.client.get("/api/tasks/?fields=id,title,status")
+        self.assertEqual(set(response.data["results"][0]), {"id", "title", "status"})
+
+        response = self.client.get("/api/tasks/?exclude=description,assignees_info")
+        row = response.data["results"][0]
+        self.assertNotIn("description", row)
+        self.assertNotIn("assignees_info", row)
+        self.assertIn("priority", row)
+
+        response = self.client.get("/api/tasks/?fields=id,nope")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_sparse_list_skips_columns_and_prefetch(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get("/api/tasks/?fields=id,title&count=false")
+        page = [q["sql"] for q in ctx.captured_queries if "tasks_task" in q["sql"] and "LIMIT" in q["sql"]]
+        self.assertEqual(len(page), 1)
+        self.assertNotIn('"description"', page[0])
+        self.assertFalse(any("tasks_task_assignees" in q["sql"] for q in ctx.captured_queries))
+
+    def test_fields_do_not_restrict_writes(self):
+        task = Task.objects.first()
+        response = self.client.patch(f"/api/tasks/{task.id}/?fields=id", {"title": "Renommée", "status": "DONE"}, format="json")
+        self.assertEqual(response.data, {"id": task.id})
+        task.refresh_from_db()
+        self.assertEqual((task.title, task.status), ("Renommée", "DONE"))
+
+    def test_compact_view(self):
+        response = self.client.get("/api/tasks/?view=compact&page_size=2")
+        rows = response.data["results"]
+        self.assertEqual(set(rows[0]), {"id", "project", "title", "status", "priority", "assignees"})
+        next_rows = self.client.get(response.data["next"]).data["results"]
+
+        by_title = {row["title"]: row for row in rows + next_rows}
+        self.assertEqual(by_title["Tâche 0"]["assignees"], [])
+        self.assertEqual(by_title["Tâche 2"]["assignees"], sorted([self.toto.id, self.tata.id]))
+        self.assertEqual(by_title["Tâche 2"]["project"], self.project.id)
+
+        with self.assertNumQueries(3):  # count + page + assignee ids
+            self.client.get("/api/tasks/?view=compact")
+        Task.objects.bulk_create([Task(project=self.project, title=f"T{i}") for i in range(20)])
+        with self.assertNumQueries(3):
+            self.client.get("/api/tasks/?view=compact")
+
+    def test_compact_view_is_list_only(self):
+        response = self.client.get("/api/tasks/?view=table")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get("/api/projects/?view=compact")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_project_fields(self):
+        with self.assertNumQueries(2):  # count + page, no members prefetch
+            response = self.client.get("/api/projects/?fields=id,name")
+        self.assertEqual(response.data["results"], [{"id": self.project.id, "name": "Projet Toto"}])
+
+        response = self.client.get("/api/projects/?stats=true&fields=id,stats")
+        self.assertEqual(response.data["results"][0]["stats"]["total"], 3)
+        response = self.client.get(f"/api/projects/{self.project.id}/?exclude=members_info,description")
+        self.assertEqual(set(response.data), {"id", "name", "owner", "created_at", "updated_at"})
@@ -1,12 +1,19 @@
 from django.contrib import admin
 from django.urls import path, include
+from realtime.views import project_events, stream_ticket
+from project_gestion.metrics import metrics_view
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("api/projects/<int:project_id>/events/", project_events, name="project-events"),
+    path("api/projects/<int:project_id>/events/ticket/", stream_ticket, name="project-events-ticket"),
     path("api/projects/", include("projects.urls")),
     path("api/tasks/", include("tasks.urls")),
     path("api/users/", include("users.urls")),
+    path("api/sync/", include("sync.urls")),
+    path("api/jobs/", include("jobs.urls")),
+    path("metrics", metrics_view, name="metrics"),
     #DOC
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
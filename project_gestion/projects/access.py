@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from .models import Project, ProjectMember
+
+CACHE_TIMEOUT = getattr(settings, "PROJECT_ACCESS_CACHE_TIMEOUT", 300)
+
+
+def _cache_key(user_id):
+    return f"projects:access:{user_id}"
+
+
+def get_project_roles(user):
+    """Map of project id -> role for every project the user owns or is a member of."""
+    if user is None or not user.is_authenticated:
+        return {}
+    key = _cache_key(user.id)
+    roles = cache.get(key)
+    if roles is None:
+        # Cached for minutes: never fill it from a replica that may lag behind a membership change
+        primary = router.db_for_write(ProjectMember)
+        # Projects waiting for their deletion job are out of reach already
+        owned = set(
+            Project.objects.using(primary)
+            .filter(owner_id=user.id, deletion_requested_at__isnull=True).values_list("id", flat=True)
+        )
+        roles = {
+            project_id: "member" if role == "owner" and project_id not in owned else role
+            for project_id, role in ProjectMember.objects.using(primary)
+            .filter(user_id=user.id, project__deletion_requested_at__isnull=True).values_list("project_id", "role")
+        }
+        roles.update(dict.fromkeys(owned, "owner"))
+        cache.set(key, roles, CACHE_TIMEOUT)
+    return roles
+
+
+def accessible_project_ids(user):
+    return list(get_project_roles(user))
+
+
+def get_project_role(user, project_id):
+    return get_project_roles(user).get(project_id)
+
+
+def is_project_owner(user, project_id):
+    return get_project_role(user, project_id) == "owner"
+
+
+def invalidate_users(user_ids):
+    # After commit: a request reading the roles before that would cache the old ones again
+    keys = [_cache_key(user_id) for user_id in set(user_ids)]
+    transaction.on_commit(lambda: cache.delete_many(keys), using=router.db_for_write(ProjectMember))
+
+
+def invalidate_project(project):
+    user_ids = list(ProjectMember.objects.filter(project_id=project.pk).values_list("user_id", flat=True))
+    invalidate_users(user_ids + [project.owner_id])
@@ -1,6 +1,7 @@
 # projects/admin.py
 from django.contrib import admin
 from .models import Project, ProjectMember
+from search.admin import FullTextSearchAdminMixin
 
 # Inline pour voir les membres directement dans un projet
 class ProjectMemberInline(admin.TabularInline):
@@ -11,9 +12,9 @@ class ProjectMemberInline(admin.TabularInline):
     show_change_link = True
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ("id", "name", "owner", "description")
-    search_fields = ("name", "owner__username")
+    search_fields = ("owner__username",)  # name and description: FullTextSearchAdminMixin
     list_filter = ("owner",)
     inlines = [ProjectMemberInline]  # Affiche les membres dans le projet
 
@@ -0,0 +1,145 @@
+from collections import Counter
+from dataclasses import asdict, dataclass
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from realtime.events import publish_on_commit
+from search import engine as search
+from sync.models import Tombstone
+from tasks import counters
+from tasks.models import Task
+from users import dashboard
+from . import access
+from .models import Project, ProjectMember
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class DeletionReport:
+    projects: int = 0
+    tasks: int = 0
+    assignments: int = 0
+    memberships: int = 0
+    unassigned: int = 0
+    uncredited: int = 0
+
+    def as_dict(self):
+        return asdict(self)
+
+
+class CascadeDeleter:
+    """
+    Deletes projects and users without Django's collector, which would load
+    every related row and remove them in one transaction. Dependent rows go
+    ``batch_size`` at a time, each batch in its own short transaction, with
+    plain ``DELETE ... WHERE id IN (...)`` statements; what the delete
+    signals would have done (tombstones, counters, search index, access
+    and dashboard caches) is done per batch. The object itself goes last
+    through ``delete()``, once nothing heavy refers to it.
+    ``on_progress(report)`` is called after every batch.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE, on_progress=None):
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.report = DeletionReport()
+
+    def delete_project(self, project):
+        # Members first: the project leaves their lists (and sync) right away
+        while self._delete_memberships(project_id=project.pk):
+            pass
+        while self._delete_tasks(project.pk):
+            pass
+        project_id = project.pk
+        project.delete()
+        self.report.projects += 1
+        publish_on_commit(project_id, "project.deleted", lambda: {"id": project_id})
+        return self.report
+
+    def delete_user(self, user):
+        for project in Project.objects.filter(owner_id=user.pk).order_by("id").only("id", "owner_id"):
+            self.delete_project(project)
+        while self._delete_memberships(user_id=user.pk):
+            pass
+        while self._unassign(user.pk):
+            pass
+        while self._uncredit(user.pk):
+            pass
+        user.delete()
+        return self.report
+
+    @staticmethod
+    def _raw_delete(model, column, ids):
+        connection = connections[router.db_for_write(model)]
+        table, column = connection.ops.quote_name(model._meta.db_table), connection.ops.quote_name(column)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({', '.join(['%s'] * len(ids))})", ids)
+            return cursor.rowcount
+
+    def _batch(self, queryset, *fields):
+        return list(queryset.order_by("id").values_list("id", *fields)[: self.batch_size])
+
+    def _progress(self):
+        if self.on_progress:
+            self.on_progress(self.report)
+
+    def _delete_memberships(self, **filters):
+        with transaction.atomic():
+            rows = self._batch(ProjectMember.objects.filter(**filters), "project_id", "user_id")
+            if not rows:
+                return False
+            self.report.memberships += self._raw_delete(ProjectMember, "id", [row[0] for row in rows])
+            Tombstone.objects.bulk_create([
+                Tombstone(kind=Tombstone.Kind.MEMBERSHIP, object_id=id, project_id=project_id, user_id=user_id)
+                for id, project_id, user_id in rows
+            ])
+        access.invalidate_users([user_id for _, _, user_id in rows])
+        dashboard.invalidate_projects([project_id for _, project_id, _ in rows])
+        self._progress()
+        return True
+
+    def _delete_tasks(self, project_id):
+        with transaction.atomic():
+            rows = self._batch(Task.objects.filter(project_id=project_id), "status", "priority")
+            if not rows:
+                return False
+            ids = [row[0] for row in rows]
+            self.report.assignments += self._raw_delete(Task.assignees.through, "task_id", ids)
+            self.report.tasks += self._raw_delete(Task, "id", ids)
+            Tombstone.objects.bulk_create(
+                [Tombstone(kind=Tombstone.Kind.TASK, object_id=id, project_id=project_id) for id in ids]
+            )
+            deltas = Counter()
+            for _, status, priority in rows:
+                deltas[(project_id, status, priority)] -= 1
+            counters.apply(deltas)
+            search.unindex(Task, ids)
+        dashboard.invalidate_projects([project_id])
+        self._progress()
+        return True
+
+    def _unassign(self, user_id):
+        Through = Task.assignees.through
+        with transaction.atomic():
+            rows = self._batch(Through.objects.filter(user_id=user_id), "task_id")
+            if not rows:
+                return False
+            self.report.unassigned += self._raw_delete(Through, "id", [id for id, _ in rows])
+            task_ids = [task_id for _, task_id in rows]
+            # The tasks' representation changed: delta sync picks them up by updated_at
+            Task.objects.filter(id__in=task_ids).update(updated_at=timezone.now())
+            project_ids = set(Task.objects.filter(id__in=task_ids).values_list("project_id", flat=True))
+        dashboard.invalidate_projects(project_ids)
+        self._progress()
+        return True
+
+    def _uncredit(self, user_id):
+        with transaction.atomic():
+            ids = [id for id, in self._batch(Task.objects.filter(created_by_id=user_id))]
+            if not ids:
+                return False
+            self.report.uncredited += Task.objects.filter(id__in=ids).update(created_by=None, updated_at=timezone.now())
+        self._progress()
+        return True
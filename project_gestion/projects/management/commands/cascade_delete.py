@@ -0,0 +1,52 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.deletion import BATCH_SIZE, CascadeDeleter
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete projects and/or users with everything that depends on them, in short batches "
+        "(see projects.deletion) instead of one large cascading transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, action="append", default=[], help="Project id (repeatable).")
+        parser.add_argument("--user", action="append", default=[], help="Username (repeatable); owned projects go too.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--noinput", action="store_false", dest="interactive")
+
+    def handle(self, *args, **options):
+        projects = list(Project.objects.filter(id__in=options["project"]).order_by("id"))
+        users = list(User.objects.filter(username__in=options["user"]).order_by("id"))
+        missing = sorted(set(options["project"]) - {p.id for p in projects}) + sorted(
+            set(options["user"]) - {u.username for u in users}
+        )
+        if missing:
+            raise CommandError(f"Not found: {', '.join(map(str, missing))}.")
+        if not projects and not users:
+            raise CommandError("Nothing to delete, use --project and/or --user.")
+
+        targets = [f"project {p.id} ({p.name})" for p in projects] + [f"user {u.username}" for u in users]
+        if options["interactive"]:
+            answer = input(f"This permanently deletes {', '.join(targets)} and their data. Type 'yes' to continue: ")
+            if answer != "yes":
+                raise CommandError("Deletion cancelled.")
+
+        def progress(report):
+            self.stdout.write(
+                f"{report.tasks} tasks, {report.memberships} memberships, "
+                f"{report.unassigned + report.uncredited} task references removed"
+            )
+
+        deleter = CascadeDeleter(batch_size=options["batch_size"], on_progress=progress)
+        for project in projects:
+            deleter.delete_project(project)
+        for user in users:
+            deleter.delete_user(user)
+        report = deleter.report
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {report.projects} projects, {report.tasks} tasks, {report.memberships} memberships "
+            f"and {len(users)} users."
+        ))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:47
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from search import postgres
+
+
+def install_trigger(apps, schema_editor):
+    postgres.install(schema_editor, "projects_project", (("name", "A"), ("description", "B")), "project_search_vector_idx")
+
+
+def uninstall_trigger(apps, schema_editor):
+    postgres.uninstall(schema_editor, "projects_project", "project_search_vector_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_visibility_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(install_trigger, uninstall_trigger),
+    ]
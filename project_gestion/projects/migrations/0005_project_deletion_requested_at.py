@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='deletion_requested_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-17 23:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_deletion_requested_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectmember',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
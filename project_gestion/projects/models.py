@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 
@@ -17,6 +18,15 @@ class Project(TimeStampedModel):
         through="ProjectMember",
         related_name="projects"
     )
+    # Maintained by a database trigger on PostgreSQL (search.postgres)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Set while a background job deletes the project: it is hidden from everyone meanwhile
+    deletion_requested_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="project_updated_id_idx"),
+        ]
 
 class ProjectMember(models.Model):
     ROLE_CHOICES = (
@@ -27,6 +37,11 @@ class ProjectMember(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default="member")
+    # When the user joined: sync sends the whole project to them from then on
+    created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ("project", "user")
+        indexes = [
+            models.Index(fields=["user", "project"], name="projectmember_user_project_idx"),
+        ]
@@ -0,0 +1,18 @@
+from django.db.models import Prefetch, prefetch_related_objects
+from .models import ProjectMember
+
+
+def members_prefetch():
+    # ProjectMemberSerializer renders member.user
+    return Prefetch("projectmember_set", queryset=ProjectMember.objects.select_related("user").order_by("id"))
+
+
+def with_members(queryset):
+    return queryset.select_related("owner").prefetch_related(members_prefetch())
+
+
+def ensure_members(project):
+    # Instances coming back from a write have no prefetch cache
+    if "projectmember_set" not in getattr(project, "_prefetched_objects_cache", {}):
+        prefetch_related_objects([project], members_prefetch())
+    return project
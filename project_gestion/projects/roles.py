@@ -0,0 +1,101 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+
+from realtime.events import publish_on_commit
+from users import dashboard
+from . import access
+from .models import Project, ProjectMember
+
+# Locks are always taken project row first, then its member rows: a transfer
+# and a member list update of the same project queue up instead of deadlocking.
+
+
+def _role_case(roles):
+    return Case(*(When(user_id=user_id, then=Value(role)) for user_id, role in roles.items()), default=F("role"))
+
+
+@transaction.atomic
+def transfer_ownership(project, user, new_owner_id):
+    """
+    Make ``new_owner_id`` (already a member) the owner of ``project`` in
+    place of ``user``. The owner check is part of the UPDATE, so of two
+    concurrent transfers only the first one applies. Returns the new
+    owner's username.
+    """
+    try:
+        new_owner_id = int(new_owner_id)
+    except (TypeError, ValueError):
+        raise ValidationError({"new_owner_id": "A valid integer is required."})
+    if not Project.objects.filter(pk=project.pk, owner_id=user.id).update(owner_id=new_owner_id, updated_at=timezone.now()):
+        raise PermissionDenied("Only the owner can transfer ownership.")
+
+    locked = dict(
+        ProjectMember.objects.select_for_update(of=("self",))
+        .filter(project_id=project.pk, user_id__in=[user.id, new_owner_id])
+        .values_list("user_id", "user__username")
+    )
+    if new_owner_id not in locked:
+        # Raising rolls the owner change back
+        if not User.objects.filter(id=new_owner_id).exists():
+            raise NotFound("User not found.")
+        raise ValidationError({"detail": "User must be a member of the project to become owner."})
+
+    roles = {user.id: "member", new_owner_id: "owner"}
+    ProjectMember.objects.filter(project_id=project.pk, user_id__in=roles).update(role=_role_case(roles))
+
+    # .update() sends no post_save: invalidate what the Project signals would have
+    project.owner_id = new_owner_id
+    access.invalidate_users(roles)
+    dashboard.invalidate_projects([project.pk])
+    publish_on_commit(project.pk, "members.changed", lambda: {
+        "owner": new_owner_id,
+        "updated": [{"user": user_id, "role": role} for user_id, role in roles.items()],
+    })
+    return locked[new_owner_id]
+
+
+def sync_members(project, roles):
+    """
+    Make the non-owner members of ``project`` exactly ``{user_id: role}``;
+    the owner's row is left to transfer_ownership. Call it inside the
+    transaction that saved the project, which holds the project row lock.
+    """
+    existing = dict(
+        ProjectMember.objects.select_for_update()
+        .filter(project_id=project.pk)
+        .values_list("user_id", "role")
+    )
+
+    to_create = [
+        ProjectMember(project_id=project.pk, user_id=user_id, role=role)
+        for user_id, role in roles.items() if user_id not in existing
+    ]
+    to_update = {
+        user_id: role for user_id, role in roles.items()
+        if existing.get(user_id) not in (None, role, "owner")
+    }
+    to_delete = [
+        user_id for user_id, role in existing.items()
+        if user_id not in roles and role != "owner"
+    ]
+
+    ProjectMember.objects.bulk_create(to_create)
+    if to_update:
+        # One statement whatever the number of changed roles
+        ProjectMember.objects.filter(project_id=project.pk, user_id__in=to_update).update(role=_role_case(to_update))
+    if to_delete:
+        ProjectMember.objects.filter(project_id=project.pk, user_id__in=to_delete).delete()
+    access.invalidate_users([m.user_id for m in to_create] + list(to_update) + to_delete)
+    if to_update:
+        dashboard.invalidate_projects([project.pk])
+
+    if to_create or to_update or to_delete:
+        changes = {
+            "added": [{"user": m.user_id, "role": m.role} for m in to_create],
+            "updated": [{"user": user_id, "role": role} for user_id, role in to_update.items()],
+            "removed": to_delete,
+        }
+        publish_on_commit(project.pk, "members.changed", lambda: changes)
@@ -1,7 +1,13 @@
-from django.shortcuts import get_object_or_404
+from django.db import transaction
 from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
 from .models import Project, ProjectMember
+from . import access, queries
+from .roles import sync_members
 from django.contrib.auth.models import User
+from realtime.events import publish_on_commit
+from tasks import counters
+from project_gestion.sparse import SparseFieldsSerializerMixin
 
 class ProjectMemberInputSerializer(serializers.Serializer):
     id = serializers.IntegerField()
@@ -14,49 +20,75 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
         model = ProjectMember
         fields = ["id", "user", "role"]
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     owner = serializers.StringRelatedField(read_only=True)
     members = ProjectMemberInputSerializer(many=True, write_only=True, required=False)
     members_info = ProjectMemberSerializer(source="projectmember_set", many=True, read_only=True)
+    stats = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
-        fields = ["id", "name", "description", "owner", "members", "members_info", "created_at", "updated_at"]
+        fields = ["id", "name", "description", "owner", "members", "members_info", "stats", "created_at", "updated_at"]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # Task counters are only embedded on request (ProjectViewSet's ?stats=true)
+        if not getattr(self.context.get("view"), "include_stats", False):
+            fields.pop("stats")
+        return fields
+
+    def get_stats(self, obj):
+        return counters.project_stats(obj.task_counters.all())
+
+    def to_representation(self, instance):
+        if self.renders("members_info"):
+            instance = queries.ensure_members(instance)
+        return super().to_representation(instance)
+
+    def validate_members(self, members):
+        requested = {m["id"] for m in members}
+        found = set(User.objects.filter(id__in=requested).values_list("id", flat=True))
+        unknown = sorted(requested - found)
+        if unknown:
+            raise serializers.ValidationError(f"Unknown user ids: {', '.join(map(str, unknown))}.")
+        return members
+
+    @transaction.atomic
     def create(self, validated_data):
         members_data = validated_data.pop("members", [])
-        project = Project.objects.create(owner=self.context["request"].user, **validated_data)
-
-        ProjectMember.objects.create(project=project, user=self.context["request"].user, role="owner")
+        owner = self.context["request"].user
+        project = Project.objects.create(owner=owner, **validated_data)
 
-        for member_data in members_data:
-            user = get_object_or_404(User, id=member_data["id"])
-            ProjectMember.objects.create(
-                project=project,
-                user=user,
-                role=member_data.get("role", "member")
-            )
+        roles = self._member_roles(members_data, owner_id=owner.id)
+        ProjectMember.objects.bulk_create(
+            [ProjectMember(project=project, user=owner, role="owner")]
+            + [ProjectMember(project=project, user_id=user_id, role=role) for user_id, role in roles.items()]
+        )
+        access.invalidate_users([owner.id, *roles])
 
         return project
-    
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         members_data = validated_data.pop("members", None)
 
+        # The instance was read before any lock: a transfer_ownership committed since then must
+        # neither be undone by saving a stale owner_id nor leave the previous owner editing
+        instance.refresh_from_db(from_queryset=Project.objects.select_for_update(), fields=["owner"])
+        if instance.owner_id != self.context["request"].user.id:
+            raise PermissionDenied("Only the owner can modify the project.")
+
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        instance.save(update_fields=[*validated_data, "updated_at"])
 
         if members_data is not None:
-            for member_data in members_data:
-                user = User.objects.get(id=member_data["id"])
-                project_member, created = ProjectMember.objects.update_or_create(
-                    project=instance,
-                    user=user,
-                    defaults={"role": member_data.get("role", "member")},
-                )
-            current_ids = [m["id"] for m in members_data]
-            ProjectMember.objects.filter(project=instance).exclude(user__id__in=current_ids).exclude(role="owner").delete()
+            sync_members(instance, self._member_roles(members_data, owner_id=instance.owner_id))
 
+        publish_on_commit(instance.id, "project.updated", lambda: self.to_representation(instance))
         return instance
 
+    @staticmethod
+    def _member_roles(members_data, owner_id):
+        # The owner's row is managed by create/transfer_ownership, never by the member list
+        return {m["id"]: m.get("role", "member") for m in members_data if m["id"] != owner_id}
@@ -0,0 +1,35 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from users import dashboard
+from . import access
+from .models import Project, ProjectMember
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def invalidate_member_access(sender, instance, **kwargs):
+    access.invalidate_users([instance.user_id])
+    dashboard.invalidate_projects([instance.project_id])
+
+
+@receiver(post_save, sender=Project)
+def invalidate_project_access(sender, instance, created, **kwargs):
+    if created:
+        access.invalidate_users([instance.owner_id])
+    else:
+        # The owner may have changed: the previous one is still a member
+        access.invalidate_project(instance)
+        dashboard.invalidate_projects([instance.pk])
+
+
+@receiver(post_delete, sender=Project)
+def invalidate_deleted_project_access(sender, instance, **kwargs):
+    access.invalidate_users([instance.owner_id])
+
+
+@receiver(post_save, sender=User)
+def invalidate_new_user_access(sender, instance, created, **kwargs):
+    # Guards against a reused primary key picking up a stale entry
+    if created:
+        access.invalidate_users([instance.id])
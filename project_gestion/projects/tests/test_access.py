@@ -0,0 +1,77 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from projects import access
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+
+
+class ProjectAccessCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        self.client = APIClient()
+
+    def test_roles_cached(self):
+        self.assertEqual(access.get_project_roles(self.toto), {self.project.id: "owner"})
+        with self.assertNumQueries(0):
+            self.assertTrue(access.is_project_owner(self.toto, self.project.id))
+
+    def test_member_added_and_removed(self):
+        self.assertEqual(access.get_project_roles(self.tata), {})
+        with self.captureOnCommitCallbacks(execute=True):
+            member = ProjectMember.objects.create(project=self.project, user=self.tata, role="manager")
+        self.assertEqual(access.get_project_roles(self.tata), {self.project.id: "manager"})
+        with self.captureOnCommitCallbacks(execute=True):
+            member.delete()
+        self.assertEqual(access.get_project_roles(self.tata), {})
+
+    def test_project_deleted(self):
+        access.get_project_roles(self.toto)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertEqual(access.get_project_roles(self.toto), {})
+
+    def test_transfer_ownership_invalidates(self):
+        ProjectMember.objects.create(project=self.project, user=self.tata)
+        access.get_project_roles(self.toto)
+        access.get_project_roles(self.tata)
+
+        self.client.force_authenticate(user=self.toto)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/projects/{self.project.id}/transfer_ownership/",
+                {"new_owner_id": self.tata.id}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(access.get_project_role(self.toto, self.project.id), "member")
+        self.assertEqual(access.get_project_role(self.tata, self.project.id), "owner")
+
+    def test_task_write_uses_cached_access(self):
+        task = Task.objects.create(project=self.project, title="Tâche", created_by=self.toto)
+        self.client.force_authenticate(user=self.tata)
+        response = self.client.patch(f"/api/tasks/{task.id}/", {"title": "Hack"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectMember.objects.create(project=self.project, user=self.tata)
+        response = self.client.get(f"/api/tasks/{task.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post("/api/tasks/", {"project": self.project.id, "title": "Nouvelle"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_invalidated_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectMember.objects.create(project=self.project, user=self.tata, role="manager")
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            ProjectMember.objects.filter(user=self.tata).delete()
+        # Another request read the committed roles before this deletion committed
+        cache.set(access._cache_key(self.tata.id), {self.project.id: "manager"})
+        for callback in callbacks:
+            callback()
+        self.assertEqual(access.get_project_roles(self.tata), {})
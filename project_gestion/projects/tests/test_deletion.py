@@ -0,0 +1,86 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from projects import access
+from projects.deletion import CascadeDeleter
+from projects.models import Project, ProjectMember
+from search.models import SearchTerm
+from sync.models import Tombstone
+from tasks.models import Task, TaskCounter
+
+
+class CascadeDeletionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        ProjectMember.objects.create(project=self.project, user=self.tata, role="member")
+        for i in range(5):
+            task = Task.objects.create(project=self.project, title=f"Tâche {i}", created_by=self.toto)
+            task.assignees.add(self.toto, self.tata)
+
+        self.other = Project.objects.create(name="Projet Tata", owner=self.tata)
+        ProjectMember.objects.create(project=self.other, user=self.tata, role="owner")
+        ProjectMember.objects.create(project=self.other, user=self.toto, role="member")
+        self.kept = Task.objects.create(project=self.other, title="Gardée", created_by=self.toto)
+        self.kept.assignees.add(self.toto, self.tata)
+
+    def test_delete_project_in_batches(self):
+        access.get_project_roles(self.tata)
+        project_id = self.project.pk
+        progress = []
+        deleter = CascadeDeleter(batch_size=2, on_progress=lambda r: progress.append(r.tasks))
+        with CaptureQueriesContext(connection) as captured, self.captureOnCommitCallbacks(execute=True):
+            report = deleter.delete_project(self.project)
+
+        self.assertEqual((report.projects, report.tasks, report.assignments, report.memberships), (1, 5, 10, 2))
+        self.assertEqual(progress, [0, 2, 4, 5])
+        task_deletes = [q["sql"] for q in captured if q["sql"].startswith('DELETE FROM "tasks_task" ')]
+        self.assertEqual(len(task_deletes), 3)
+
+        self.assertFalse(Project.objects.filter(pk=project_id).exists())
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(Task.assignees.through.objects.count(), 2)
+        self.assertFalse(TaskCounter.objects.filter(project_id=project_id).exists())
+        self.assertFalse(SearchTerm.objects.filter(kind="task").exclude(object_id=self.kept.id).exists())
+        tombstones = Tombstone.objects.filter(project_id=project_id)
+        self.assertEqual(tombstones.filter(kind="task").count(), 5)
+        self.assertEqual(tombstones.filter(kind="membership").count(), 2)
+        self.assertEqual(tombstones.filter(kind="project").count(), 1)
+        self.assertEqual(access.get_project_roles(self.tata), {self.other.id: "owner"})
+
+    def test_delete_user(self):
+        report = CascadeDeleter(batch_size=2).delete_user(self.toto)
+
+        self.assertFalse(User.objects.filter(username="toto").exists())
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertEqual((report.projects, report.tasks, report.unassigned, report.uncredited), (1, 5, 1, 1))
+        self.kept.refresh_from_db()
+        self.assertIsNone(self.kept.created_by)
+        self.assertEqual(list(self.kept.assignees.all()), [self.tata])
+        self.assertEqual(list(ProjectMember.objects.values_list("project_id", "user_id")), [(self.other.id, self.tata.id)])
+        self.assertEqual(TaskCounter.objects.get(project=self.other, status="TODO", priority="MEDIUM").count, 1)
+
+    def test_destroy_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(user=self.toto)
+        response = client.delete(f"/api/projects/{self.project.id}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(Tombstone.objects.filter(kind="task").count(), 5)
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command("cascade_delete", project=[self.other.id], user=["toto"], interactive=False, stdout=out)
+        self.assertIn("Deleted 2 projects, 6 tasks", out.getvalue())
+        self.assertEqual(list(User.objects.values_list("username", flat=True)), ["tata"])
+        self.assertFalse(Project.objects.exists())
@@ -1,11 +1,14 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
-from projects.models import Project
+from projects.models import Project, ProjectMember
 
 class ProjectTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.toto = User.objects.create_user(username="toto", password="toto")
         self.tata = User.objects.create_user(username="tata", password="tata")
         self.tutu = User.objects.create_user(username="tutu", password="tutu")
@@ -31,7 +34,7 @@ class ProjectTests(TestCase):
         self.client.force_authenticate(user=self.toto)
         response = self.client.get("/api/projects/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertGreaterEqual(len(response.data["results"]), 1)
 
     def test_get_projects_unauthenticated(self):
         self.client.force_authenticate(user=None)
@@ -134,8 +137,44 @@ class ProjectTests(TestCase):
             "/api/projects/",
             {
                 "name": "Invalid member project",
-                "members": [{"id": 9999, "role": "member"}]
+                "members": [{"id": 9999, "role": "member"}, {"id": 9998}, {"id": self.tata.id}]
             },
             format="json"
         )
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("9998, 9999", str(response.data["members"]))
+        self.assertFalse(Project.objects.filter(name="Invalid member project").exists())
+
+    # MEMBERS SYNC
+    def test_update_project_members_sync(self):
+        self.client.force_authenticate(user=self.toto)
+        response = self.client.patch(
+            f"/api/projects/{self.project.id}/",
+            {"members": [{"id": self.tutu.id, "role": "member"}, {"id": self.tata.id, "role": "manager"}]},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        roles = dict(ProjectMember.objects.filter(project=self.project).values_list("user__username", "role"))
+        self.assertEqual(roles, {"toto": "owner", "tutu": "member", "tata": "manager"})
+
+    def test_update_project_members_keeps_owner(self):
+        self.client.force_authenticate(user=self.toto)
+        response = self.client.patch(
+            f"/api/projects/{self.project.id}/",
+            {"members": [{"id": self.toto.id, "role": "member"}]},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        roles = dict(ProjectMember.objects.filter(project=self.project).values_list("user__username", "role"))
+        self.assertEqual(roles, {"toto": "owner"})
+
+    def test_update_project_members_query_count(self):
+        users = User.objects.bulk_create([User(username=f"user{i}") for i in range(50)])
+        self.client.force_authenticate(user=self.toto)
+        members = [{"id": u.id, "role": "member"} for u in users]
+        # Without PostgreSQL the save also rewrites the project's inverted search index
+        expected = 14 if connection.vendor == "postgresql" else 16
+        with self.assertNumQueries(expected):
+            response = self.client.patch(f"/api/projects/{self.project.id}/", {"members": members}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(ProjectMember.objects.filter(project=self.project).count(), 51)
@@ -0,0 +1,164 @@
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.test import APIClient
+
+from projects import roles
+from projects.models import Project, ProjectMember
+from projects.serializers import ProjectSerializer
+
+
+class RoleServiceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.tutu = User.objects.create_user(username="tutu", password="tutu")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.bulk_create([
+            ProjectMember(project=self.project, user=self.toto, role="owner"),
+            ProjectMember(project=self.project, user=self.tata, role="member"),
+            ProjectMember(project=self.project, user=self.tutu, role="manager"),
+        ])
+
+    def member_roles(self):
+        return dict(ProjectMember.objects.filter(project=self.project).values_list("user__username", "role"))
+
+    def test_transfer_statements(self):
+        client = APIClient()
+        client.force_authenticate(user=self.toto)
+        with CaptureQueriesContext(connection) as captured:
+            response = client.post(
+                f"/api/projects/{self.project.id}/transfer_ownership/", {"new_owner_id": self.tata.id}, format="json"
+            )
+        self.assertEqual(response.data, {"detail": "Ownership transferred to tata."})
+        self.assertEqual(self.member_roles(), {"toto": "member", "tata": "owner", "tutu": "manager"})
+        # After get_object: the owner-checked UPDATE, the locked members and one CASE update
+        statements = [q["sql"] for q in captured if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        transfer = statements[next(i for i, sql in enumerate(statements) if sql.startswith("UPDATE")):]
+        self.assertEqual(len(transfer), 3, transfer)
+        self.assertIn('"owner_id" = ', transfer[0].split("WHERE")[1])
+        self.assertIn("CASE WHEN", transfer[2])
+
+    def test_stale_owner_cannot_transfer_twice(self):
+        roles.transfer_ownership(self.project, self.toto, self.tata.id)
+        # Still holding the project as loaded before the first transfer
+        with self.assertRaises(PermissionDenied):
+            roles.transfer_ownership(self.project, self.toto, self.tutu.id)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.owner, self.tata)
+
+    def test_stale_update_keeps_transfer(self):
+        # The project as a PATCH loaded it, before a concurrent transfer committed
+        stale = Project.objects.get(pk=self.project.pk)
+        roles.transfer_ownership(self.project, self.toto, self.tata.id)
+
+        def update(user):
+            serializer = ProjectSerializer(stale, data={"name": "Renommé"}, partial=True, context={"request": SimpleNamespace(user=user)})
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        with self.assertRaises(PermissionDenied):
+            update(self.toto)
+        update(self.tata)
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.name, self.project.owner), ("Renommé", self.tata))
+        self.assertEqual(self.member_roles(), {"toto": "member", "tata": "owner", "tutu": "manager"})
+
+    def test_failed_transfer_rolls_back(self):
+        outsider = User.objects.create_user(username="test", password="test")
+        with self.assertRaises(Exception):
+            roles.transfer_ownership(self.project, self.toto, outsider.id)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.owner, self.toto)
+        self.assertEqual(self.member_roles()["toto"], "owner")
+
+    def test_sync_members_single_role_update(self):
+        outsider = User.objects.create_user(username="test", password="test")
+        with CaptureQueriesContext(connection) as captured, transaction.atomic():
+            roles.sync_members(self.project, {
+                self.tata.id: "manager", self.tutu.id: "member", outsider.id: "member", self.toto.id: "member",
+            })
+        updates = [q["sql"] for q in captured if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        # The owner's row is never demoted by a member list
+        self.assertEqual(self.member_roles(), {"toto": "owner", "tata": "manager", "tutu": "member", "test": "member"})
+
+
+class ConcurrentRoleChangeTests(TransactionTestCase):
+    PROJECTS = 3
+    USERS = 5
+    THREADS = 8
+    OPERATIONS = 25
+
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(username=f"user{i}", password="x") for i in range(self.USERS)]
+        self.projects = []
+        for i in range(self.PROJECTS):
+            project = Project.objects.create(name=f"Projet {i}", owner=self.users[0])
+            ProjectMember.objects.bulk_create(
+                [ProjectMember(project=project, user=self.users[0], role="owner")]
+                + [ProjectMember(project=project, user=user, role="member") for user in self.users[1:]]
+            )
+            self.projects.append(project)
+
+    def operation(self, rng):
+        pk = rng.choice(self.projects).pk
+        if rng.random() < 0.5:
+            # Whoever the caller believes is the owner; a stale belief must fail, not corrupt
+            project = Project.objects.get(pk=pk)
+            owner = User.objects.get(pk=project.owner_id)
+            try:
+                roles.transfer_ownership(project, owner, rng.choice(self.users).id)
+            except PermissionDenied:
+                pass
+        else:
+            with transaction.atomic():
+                project = Project.objects.select_for_update().get(pk=pk)
+                project.save()
+                roles.sync_members(project, {
+                    user.id: rng.choice(["member", "manager"]) for user in self.users
+                })
+
+    def worker(self, seed, errors):
+        rng = random.Random(seed)
+        deadline = time.monotonic() + 60
+        try:
+            for _ in range(self.OPERATIONS):
+                while True:
+                    try:
+                        self.operation(rng)
+                        break
+                    except OperationalError as error:
+                        # SQLite locks the whole database and fails instead of waiting; any other
+                        # error (a deadlock on PostgreSQL) means the lock order is wrong
+                        if "locked" not in str(error) or time.monotonic() > deadline:
+                            raise
+                        time.sleep(rng.random() * 0.02)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            connection.close()
+
+    def test_parallel_transfers_and_role_updates_keep_one_owner(self):
+        errors = []
+        threads = [threading.Thread(target=self.worker, args=(seed, errors)) for seed in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+        for project in Project.objects.all():
+            owners = list(ProjectMember.objects.filter(project=project, role="owner").values_list("user_id", flat=True))
+            self.assertEqual(owners, [project.owner_id])
+            self.assertEqual(ProjectMember.objects.filter(project=project).count(), self.USERS)
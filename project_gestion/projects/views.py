@@ -1,50 +1,172 @@
 # projects/views.py
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, UnsupportedMediaType, ValidationError
 from .models import Project, ProjectMember
 from .serializers import ProjectMemberSerializer, ProjectSerializer
 from .permissions import IsOwnerOrReadOnly
-from django.contrib.auth.models import User
 from rest_framework.response import Response
 from rest_framework import status
+from project_gestion.pagination import KeysetPagination
+from project_gestion.conditional import ConditionalRequestMixin
+from project_gestion.replicas import ReplicaReadMixin
+from project_gestion.sparse import SparseFieldsMixin
+from . import access, queries, roles
+from .deletion import CascadeDeleter
+from tasks import counters
+from tasks.export import FORMATS as EXPORT_FORMATS, CSVRenderer, NDJSONRenderer, streaming_response
+from tasks.imports import FORMATS as IMPORT_FORMATS, PARSERS as IMPORT_PARSERS, TaskImporter
+from search import engine as search
+from users import dashboard
+from jobs import queue as jobs
+from jobs.models import Job
+from jobs.handlers import spool_upload
+from jobs.views import accepted
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ReplicaReadMixin, ConditionalRequestMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        return Project.objects.all()
+        if self.action == "destroy":
+            # A repeated DELETE of a project waiting for its job gets that job back
+            return Project.objects.all()
+        queryset = Project.objects.filter(deletion_requested_at__isnull=True)
+        if self.action in ("stats", "export", "export_job", "import_tasks"):
+            return queryset
+        q = self.request.query_params.get("q")
+        if q:
+            queryset = search.search(queryset, q)
+        queryset = queryset.order_by(*self.get_keyset_ordering())
+        if self.renders("owner"):
+            queryset = queryset.select_related("owner")
+        if self.renders("members_info"):
+            queryset = queryset.prefetch_related(queries.members_prefetch())
+        queryset = self.only_sparse_columns(queryset, "owner")
+        if self.include_stats and self.renders("stats"):
+            queryset = queryset.prefetch_related("task_counters")
+        return queryset
+
+    def get_keyset_ordering(self):
+        if self.request.query_params.get("q"):
+            return ("-search_rank", "-id")
+        return ("-updated_at", "-id")
+
+    @property
+    def include_stats(self):
+        return self.request.query_params.get("stats", "").lower() in ("1", "true", "yes", "on")
+
+    def list(self, request, *args, **kwargs):
+        if self.include_stats:
+            # Counters change with tasks, not with projects.updated_at: no list validators
+            return SparseFieldsMixin.list(self, request, *args, **kwargs)
+        return super().list(request, *args, **kwargs)
+
+    def get_object_etag(self, instance):
+        if self.include_stats:
+            cells = sorted((c.status, c.priority, c.count) for c in instance.task_counters.all())
+            return self.make_etag("detail", instance.pk, instance.updated_at, cells)
+        return super().get_object_etag(instance)
 
     def perform_create(self, serializer):
         serializer.save()
 
+    def destroy(self, request, *args, **kwargs):
+        response = super().destroy(request, *args, **kwargs)
+        job = getattr(self, "_deletion_job", None)
+        return accepted(job) if job is not None else response
+
+    def perform_destroy(self, instance):
+        # Cascading through many tasks would hold the request (and locks) for long: hand it to a job
+        tasks = instance.task_counters.aggregate(total=Sum("count"))["total"] or 0
+        if instance.deletion_requested_at is not None or tasks > settings.JOBS_INLINE_DELETE_MAX_TASKS:
+            self._deletion_job = self.request_deletion(instance)
+            return
+        CascadeDeleter().delete_project(instance)
+
+    @transaction.atomic
+    def request_deletion(self, instance):
+        """Hide the project and queue its deletion job, or return the one already queued."""
+        # The row lock makes concurrent DELETEs find each other's job
+        project = Project.objects.select_for_update().get(pk=instance.pk)
+        job = Job.objects.filter(
+            kind="projects.delete", payload__project=project.pk, status__in=[Job.Status.QUEUED, Job.Status.RUNNING]
+        ).order_by("id").first()
+        if job is not None:
+            return job
+        if project.deletion_requested_at is None:
+            # .update(): no post_save, updated_at kept; invalidate what hiding it changes
+            Project.objects.filter(pk=project.pk).update(deletion_requested_at=timezone.now())
+            access.invalidate_project(project)
+            dashboard.invalidate_projects([project.pk])
+        return jobs.enqueue("projects.delete", {"project": project.pk}, user=self.request.user)
+
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        project = self.get_object()
+        return Response({"project": project.id, **counters.project_stats(project.task_counters.all())})
+
+    @action(detail=True, methods=["get"], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request, pk=None):
+        project = self.get_object()
+        if access.get_project_role(request.user, project.id) is None:
+            raise NotFound()
+        return streaming_response(request, project, request.accepted_renderer.format)
+
+    @action(detail=True, methods=["post"], url_path="export/job", permission_classes=[permissions.IsAuthenticated])
+    def export_job(self, request, pk=None):
+        project = self.get_object()
+        if access.get_project_role(request.user, project.id) is None:
+            raise NotFound()
+        format = request.data.get("format", "ndjson")
+        if format not in EXPORT_FORMATS:
+            raise ValidationError({"format": f"Choose one of: {', '.join(EXPORT_FORMATS)}."})
+        return accepted(jobs.enqueue("projects.export", {"project": project.id, "format": format}, user=request.user))
+
+    @action(detail=True, methods=["post"], url_path="import", permission_classes=[permissions.IsAuthenticated])
+    def import_tasks(self, request, pk=None):
+        project = self.get_object()
+        if access.get_project_role(request.user, project.id) is None:
+            raise PermissionDenied("You must be a project member to create a task.")
+        format = IMPORT_FORMATS.get(request.content_type.split(";")[0].strip())
+        if format is None:
+            raise UnsupportedMediaType(request.content_type)
+        # The body is parsed line by line from the request stream, never loaded whole
+        stream = request.stream or []
+        if int(request.META.get("CONTENT_LENGTH") or 0) > settings.JOBS_INLINE_IMPORT_MAX_BYTES:
+            name = spool_upload(stream, f"jobs/import-{project.id}.{format}")
+            payload = {"project": project.id, "user": request.user.id, "format": format, "file": name}
+            return accepted(jobs.enqueue("tasks.import", payload, user=request.user, max_attempts=1))
+        # Inline imports are small: all or nothing, so a body that cannot be read to the end is simply sent again
+        with transaction.atomic():
+            report = TaskImporter(request.user, project).run(IMPORT_PARSERS[format](stream))
+            if not report.complete:
+                transaction.set_rollback(True)
+                return Response(
+                    {"detail": "The file could not be read to the end: nothing was imported.", "errors": report.errors},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        return Response(report.as_dict())
+
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
     def transfer_ownership(self, request, pk=None):
         project = self.get_object()
 
-        if project.owner != request.user:
+        if project.owner_id != request.user.id:
             return Response({"detail": "Only the owner can transfer ownership."}, status=status.HTTP_403_FORBIDDEN)
 
         new_owner_id = request.data.get("new_owner_id")
         if not new_owner_id:
             return Response({"detail": "new_owner_id is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            new_owner = User.objects.get(id=new_owner_id)
-        except User.DoesNotExist:
-            return Response({"detail": "User not found."}, status=status.HTTP_404_NOT_FOUND)
-
-        if not ProjectMember.objects.filter(project=project, user=new_owner).exists():
-            return Response({"detail": "User must be a member of the project to become owner."}, status=status.HTTP_400_BAD_REQUEST)
-
-        project.owner = new_owner
-        project.save()
-
-        ProjectMember.objects.filter(project=project, user=request.user).update(role="member")
-        ProjectMember.objects.filter(project=project, user=new_owner).update(role="owner")
-
-        return Response({"detail": f"Ownership transferred to {new_owner.username}."})
+        username = roles.transfer_ownership(project, request.user, new_owner_id)
+        return Response({"detail": f"Ownership transferred to {username}."})
 
 
 class ProjectMemberViewSet(viewsets.ModelViewSet):
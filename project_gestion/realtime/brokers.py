@@ -0,0 +1,129 @@
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+def offer(queue, event):
+    # Slow consumers lose their oldest events rather than growing without bound
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+class BaseBroker:
+    """
+    Fan-out of board events to subscribers.
+
+    ``publish`` is called from synchronous request code (any thread);
+    ``subscribe`` is used from the async streaming views.
+    """
+
+    def __init__(self, max_queue=100, **options):
+        self.max_queue = max_queue
+        self.options = options
+
+    def publish(self, channel, event):
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        """Async context manager yielding an ``asyncio.Queue`` of events."""
+        raise NotImplementedError
+
+
+class InMemoryBroker(BaseBroker):
+    """Single-process broker: events only reach clients connected to the same worker."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(offer, queue, event)
+            except RuntimeError:
+                # Subscriber loop already closed; it unsubscribes on its way out
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.max_queue))
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(channel, set())
+                subscribers.discard(entry)
+                if not subscribers:
+                    self._subscribers.pop(channel, None)
+
+
+class RedisBroker(BaseBroker):
+    """
+    Multi-worker broker over Redis pub/sub (needs the optional ``redis``
+    package). Tests and single-worker setups use InMemoryBroker instead.
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", prefix="kanbios:", **options):
+        super().__init__(**options)
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured("RedisBroker requires the 'redis' package.") from exc
+        self.url, self.prefix = url, prefix
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, event):
+        self._client.publish(self.prefix + channel, json.dumps(event))
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.prefix + channel)
+        queue = asyncio.Queue(maxsize=self.max_queue)
+        relay = asyncio.create_task(self._relay(pubsub, queue))
+        try:
+            yield queue
+        finally:
+            relay.cancel()
+            await pubsub.unsubscribe()
+            await client.aclose()
+
+    @staticmethod
+    async def _relay(pubsub, queue):
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                offer(queue, json.loads(message["data"]))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                config = getattr(settings, "REALTIME_BROKER", {})
+                backend = import_string(config.get("BACKEND", "realtime.brokers.InMemoryBroker"))
+                _broker = backend(**config.get("OPTIONS", {}))
+    return _broker
+
+
+def reset_broker():
+    global _broker
+    _broker = None
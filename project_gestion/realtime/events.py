@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.utils import timezone
+from .brokers import get_broker
+
+
+def project_channel(project_id):
+    return f"project:{project_id}"
+
+
+def publish_on_commit(project_id, event_type, build_payload):
+    """
+    Queue an event for the project's subscribers once the surrounding
+    transaction commits; ``build_payload`` runs at that point so clients
+    never see rolled back state.
+    """
+    def send():
+        get_broker().publish(project_channel(project_id), {
+            "type": event_type,
+            "project": project_id,
+            "at": timezone.now().isoformat(),
+            "data": build_payload(),
+        })
+
+    # Robust: a broker outage is logged, it must not fail a request whose write is already committed
+    transaction.on_commit(send, robust=True)
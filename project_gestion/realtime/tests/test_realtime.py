@@ -0,0 +1,197 @@
+import asyncio
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from projects.models import Project, ProjectMember
+from realtime.brokers import BaseBroker, InMemoryBroker, get_broker, reset_broker
+from realtime.events import project_channel
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class RecordingBroker(BaseBroker):
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.events = []
+
+    def publish(self, channel, event):
+        self.events.append((channel, event))
+
+
+class InMemoryBrokerTests(TestCase):
+    async def test_publish_reaches_subscribers_of_the_channel(self):
+        broker = InMemoryBroker(max_queue=2)
+        async with broker.subscribe("project:1") as queue, broker.subscribe("project:2") as other:
+            for i in range(3):
+                broker.publish("project:1", {"n": i})
+            await asyncio.sleep(0)
+            self.assertEqual([queue.get_nowait(), queue.get_nowait()], [{"n": 1}, {"n": 2}])
+            self.assertTrue(other.empty())
+        self.assertEqual(broker._subscribers, {})
+
+
+class FailingBroker(BaseBroker):
+    def publish(self, channel, event):
+        raise ConnectionError("broker down")
+
+
+@override_settings(REALTIME_BROKER={"BACKEND": "realtime.tests.test_realtime.RecordingBroker"})
+class PublishTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_broker()
+        self.addCleanup(reset_broker)
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.toto)
+
+    def test_task_events_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post("/api/tasks/", {"project": self.project.id, "title": "Nouvelle"}, format="json")
+        self.assertEqual(get_broker().events, [])
+
+        for callback in callbacks:
+            callback()
+        channel, event = get_broker().events[0]
+        self.assertEqual(channel, project_channel(self.project.id))
+        self.assertEqual(event["type"], "task.created")
+        self.assertEqual(event["data"]["id"], response.data["id"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/tasks/{response.data['id']}/")
+        self.assertEqual(get_broker().events[-1][1]["type"], "task.deleted")
+
+    @override_settings(REALTIME_BROKER={"BACKEND": "realtime.tests.test_realtime.FailingBroker"})
+    def test_broker_failure_does_not_fail_the_write(self):
+        reset_broker()
+        with self.assertLogs("django", "ERROR"), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/tasks/", {"project": self.project.id, "title": "Nouvelle"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Task.objects.filter(title="Nouvelle").exists())
+
+    def test_member_events(self):
+        tata = User.objects.create_user(username="tata", password="tata")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/projects/{self.project.id}/", {"members": [{"id": tata.id}]}, format="json")
+        types = [event["type"] for _, event in get_broker().events]
+        self.assertEqual(types, ["members.changed", "project.updated"])
+        self.assertEqual(get_broker().events[0][1]["data"]["added"], [{"user": tata.id, "role": "member"}])
+
+    def test_bulk_events(self):
+        task = Task.objects.create(project=self.project, title="Tâche", created_by=self.toto)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/tasks/bulk/", {"operations": [{"op": "move", "id": task.id, "status": "DONE"}]}, format="json")
+        _, event = get_broker().events[-1]
+        self.assertEqual(event["type"], "tasks.bulk")
+        self.assertEqual(event["data"]["upserted"][0]["status"], "DONE")
+
+
+class ProjectEventsViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_broker()
+        self.addCleanup(reset_broker)
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+
+    def url(self, suffix=""):
+        return f"/api/projects/{self.project.id}/events/{suffix}"
+
+    async def ticket(self, user):
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+        response = await self.async_client.post(self.url("ticket/"), headers=headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["ticket"]
+
+    async def open_stream(self, user):
+        response = await self.async_client.get(self.url(), {"ticket": await self.ticket(user)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 5000\n\n")
+        return stream
+
+    async def test_stream_events(self):
+        stream = await self.open_stream(self.toto)
+        get_broker().publish(project_channel(self.project.id), {"type": "task.updated", "data": {"id": 1}})
+        chunk = await asyncio.wait_for(anext(stream), timeout=2)
+        event, data = chunk.decode().strip().split("\n")
+        self.assertEqual(event, "event: task.updated")
+        self.assertEqual(json.loads(data.removeprefix("data: "))["data"], {"id": 1})
+        await stream.aclose()
+
+    async def test_ticket_is_single_use_and_scoped(self):
+        ticket = await self.ticket(self.toto)
+        other = await Project.objects.acreate(name="Autre", owner=self.toto)
+        response = await self.async_client.get(f"/api/projects/{other.id}/events/", {"ticket": ticket})
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.get(self.url(), {"ticket": ticket})
+        self.assertEqual(response.status_code, 200)
+        await response.streaming_content.aclose()
+        response = await self.async_client.get(self.url(), {"ticket": ticket})
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(REALTIME_TICKET_SECONDS=0)
+    async def test_expired_ticket(self):
+        ticket = await self.ticket(self.toto)
+        await asyncio.sleep(1.1)
+        response = await self.async_client.get(self.url(), {"ticket": ticket})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_access_token_not_accepted_in_url(self):
+        response = await self.async_client.get(self.url(), {"token": str(AccessToken.for_user(self.toto))})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_header_authentication(self):
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.toto)}"}
+        response = await self.async_client.get(self.url(), headers=headers)
+        self.assertEqual(response.status_code, 200)
+        await response.streaming_content.aclose()
+
+    async def test_removed_member_stream_ends(self):
+        await ProjectMember.objects.acreate(project=self.project, user=self.tata)
+        stream = await self.open_stream(self.tata)
+        get_broker().publish(project_channel(self.project.id), {
+            "type": "members.changed", "data": {"added": [], "updated": [], "removed": [self.tata.id]},
+        })
+        chunk = await asyncio.wait_for(anext(stream), timeout=2)
+        self.assertTrue(chunk.startswith(b"event: access.revoked\n"))
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+
+    @override_settings(REALTIME_KEEPALIVE_SECONDS=0.05, REALTIME_ACCESS_CHECK_SECONDS=0)
+    async def test_access_rechecked_while_idle(self):
+        membership = await ProjectMember.objects.acreate(project=self.project, user=self.tata)
+        stream = await self.open_stream(self.tata)
+        self.assertEqual(await asyncio.wait_for(anext(stream), timeout=2), b": keepalive\n\n")
+
+        # Removed without any event, e.g. from the admin
+        await membership.adelete()
+        cache.clear()
+        chunk = await asyncio.wait_for(anext(stream), timeout=2)
+        self.assertTrue(chunk.startswith(b"event: access.revoked\n"))
+
+    async def test_stream_requires_auth(self):
+        response = await self.async_client.get(self.url())
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_requires_membership(self):
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.tata)}"}
+        response = await self.async_client.post(self.url("ticket/"), headers=headers)
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get(self.url(), headers=headers)
+        self.assertEqual(response.status_code, 404)
+
+    def test_stream_refused_under_wsgi(self):
+        response = self.client.get(self.url(), headers={"Authorization": f"Bearer {AccessToken.for_user(self.toto)}"})
+        self.assertEqual(response.status_code, 501)
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from projects import access
+from users.authentication import CachedJWTAuthentication
+from .brokers import get_broker
+from .events import project_channel
+
+TICKET_SALT = "realtime.stream"
+
+
+def issue_ticket(user, project_id):
+    return signing.dumps({"user": user.id, "project": project_id, "nonce": secrets.token_urlsafe(8)}, salt=TICKET_SALT)
+
+
+def redeem_ticket(ticket, project_id):
+    """The user id of a valid, unused ticket for this project, else None."""
+    try:
+        claims = signing.loads(ticket, salt=TICKET_SALT, max_age=settings.REALTIME_TICKET_SECONDS)
+    except signing.BadSignature:
+        return None
+    if claims.get("project") != project_id:
+        return None
+    # Single use: a ticket read back from an access log cannot open another stream
+    if not cache.add(f"realtime:ticket:{ticket}", True, settings.REALTIME_TICKET_SECONDS):
+        return None
+    return claims["user"]
+
+
+def authenticate(request, project_id):
+    # EventSource cannot send headers: browsers pass a stream ticket as ?ticket=, never their access token
+    ticket = request.GET.get("ticket")
+    if ticket is not None:
+        user_id = redeem_ticket(ticket, project_id)
+        return get_user_model().objects.filter(pk=user_id, is_active=True).first() if user_id else None
+    auth = CachedJWTAuthentication()
+    header = auth.get_header(request)
+    raw = auth.get_raw_token(header) if header else None
+    if raw is None:
+        return None
+    try:
+        return auth.get_user(auth.get_validated_token(raw))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated])
+def stream_ticket(request, project_id):
+    """A short-lived, single-use ticket opening the project's event stream."""
+    if access.get_project_role(request.user, project_id) is None:
+        raise NotFound()
+    return Response({"ticket": issue_ticket(request.user, project_id), "expires_in": settings.REALTIME_TICKET_SECONDS})
+
+
+def revokes_access(event, user):
+    # Said by the payload itself: the access cache of this process may not be invalidated yet
+    if event["type"] == "project.deleted":
+        return True
+    return event["type"] == "members.changed" and user.id in event["data"].get("removed", ())
+
+
+async def event_stream(user, project_id, keepalive, access_check):
+    """
+    The project's events until the user loses access to it, which is checked
+    when its members change and at least every ``access_check`` seconds.
+    """
+    loop = asyncio.get_running_loop()
+    async with get_broker().subscribe(project_channel(project_id)) as queue:
+        yield "retry: 5000\n\n"
+        checked = loop.time()
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                event = None
+
+            if event is not None and revokes_access(event, user):
+                lost = True
+            elif (event is not None and event["type"] == "members.changed") or loop.time() - checked >= access_check:
+                checked = loop.time()
+                lost = await sync_to_async(access.get_project_role)(user, project_id) is None
+            else:
+                lost = False
+            if lost:
+                # EventSource gives up after this: reconnecting gets a 404
+                yield f"event: access.revoked\ndata: {json.dumps({'project': project_id})}\n\n"
+                return
+
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def project_events(request, project_id):
+    """Server-sent events for one board; serve through the ASGI application."""
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI the endless stream would be consumed synchronously, holding a worker per subscriber
+        return JsonResponse({"detail": "Server-sent events require the ASGI application."}, status=501)
+    user = await sync_to_async(authenticate)(request, project_id)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    if await sync_to_async(access.get_project_role)(user, project_id) is None:
+        return JsonResponse({"detail": "Not found."}, status=404)
+
+    return StreamingHttpResponse(
+        event_stream(user, project_id, settings.REALTIME_KEEPALIVE_SECONDS, settings.REALTIME_ACCESS_CHECK_SECONDS),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,4 +1,5 @@
 #!/bin/sh
 # entrypoint.sh
 
-python manage.py migrate && python manage.py runserver 0.0.0.0:8000
+# ASGI: the server-sent events stream keeps its connection open without holding a worker
+python manage.py migrate && exec uvicorn project_gestion.asgi:application --host 0.0.0.0 --port 8000 --reload
@@ -0,0 +1,20 @@
+from django.db.models import Q
+
+from . import engine
+
+
+class FullTextSearchAdminMixin:
+    """
+    Admin search box backed by the search index instead of ILIKE scans over
+    the indexed text. ``search_fields`` lists the lookups on related rows
+    (project, owner...), still matched with the default ILIKE search.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        matched = Q(pk__in=engine.search(queryset, search_term).values("pk"))
+        if self.get_search_fields(request):
+            related, _ = super().get_search_results(request, queryset, search_term)
+            matched |= Q(pk__in=related.values("pk"))
+        return queryset.filter(matched), False
@@ -0,0 +1,121 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections, router
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Cast
+
+from projects.models import Project
+from tasks.models import Task
+from .models import SearchTerm
+from .postgres import CONFIG
+
+MAX_TERMS = 8
+TERM_LENGTH = SearchTerm._meta.get_field("term").max_length
+
+# (field, weight) per searchable model; weights map to tsvector labels A/B
+FIELDS = {
+    Task: (("title", 2), ("description", 1)),
+    Project: (("name", 2), ("description", 1)),
+}
+KINDS = {Task: SearchTerm.Kind.TASK, Project: SearchTerm.Kind.PROJECT}
+WORD = re.compile(r"\w+")
+
+
+def terms(text):
+    return [word[:TERM_LENGTH] for word in WORD.findall((text or "").lower())]
+
+
+def query_terms(q):
+    return list(dict.fromkeys(terms(q)))[:MAX_TERMS]
+
+
+def to_tsquery(words):
+    # Words are \w+ only, so they cannot carry tsquery operators
+    return " & ".join(f"{word}:*" for word in words)
+
+
+class PostgresSearch:
+    """Stored tsvector columns, filled by triggers and GIN indexed (see search.postgres)."""
+
+    def search(self, queryset, words):
+        query = SearchQuery(to_tsquery(words), search_type="raw", config=CONFIG)
+        # ts_rank returns a float4; as a float8 the rank round-trips exactly through keyset cursors
+        rank = Cast(SearchRank(F("search_vector"), query), FloatField())
+        return queryset.filter(search_vector=query).annotate(search_rank=rank)
+
+    def index(self, instances):
+        pass
+
+    def unindex(self, model, ids):
+        pass
+
+
+class InvertedIndexSearch:
+    """
+    Fallback for databases without full-text search: one SearchTerm row per
+    distinct word of an object, prefix matched with an index range scan.
+    Every query word must match; the rank sums the matched words' weights.
+    """
+
+    def search(self, queryset, words):
+        kind = KINDS[queryset.model]
+        matched = Q()
+        for word in words:
+            prefix = self.prefix(word)
+            queryset = queryset.filter(pk__in=SearchTerm.objects.filter(prefix, kind=kind).values("object_id"))
+            matched |= prefix
+        rank = (
+            SearchTerm.objects.filter(matched, kind=kind, object_id=OuterRef("pk"))
+            .values("object_id")
+            .annotate(total=Sum("weight"))
+            .values("total")
+        )
+        return queryset.annotate(search_rank=Cast(Subquery(rank), FloatField()))
+
+    @staticmethod
+    def prefix(word):
+        return Q(term__gte=word, term__lt=word + "\U0010ffff")
+
+    def index(self, instances):
+        if not instances:
+            return
+        model = type(instances[0])
+        kind = KINDS[model]
+        rows = []
+        for instance in instances:
+            weights = {}
+            for field, weight in FIELDS[model]:
+                for term in terms(getattr(instance, field)):
+                    weights[term] = max(weights.get(term, 0), weight)
+            rows += [SearchTerm(kind=kind, term=term, object_id=instance.pk, weight=w) for term, w in weights.items()]
+        self.unindex(model, [instance.pk for instance in instances])
+        SearchTerm.objects.bulk_create(rows, batch_size=1000)
+
+    def unindex(self, model, ids):
+        SearchTerm.objects.filter(kind=KINDS[model], object_id__in=ids).delete()
+
+
+def get_backend(using):
+    if connections[using].vendor == "postgresql":
+        return PostgresSearch()
+    return InvertedIndexSearch()
+
+
+def search(queryset, q):
+    """Filter ``queryset`` to the rows matching every word of ``q`` (as prefixes), annotated with ``search_rank``."""
+    words = query_terms(q)
+    if not words:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+    return get_backend(queryset.db).search(queryset, words)
+
+
+def index(instances):
+    instances = list(instances)
+    if instances:
+        get_backend(router.db_for_write(type(instances[0]))).index(instances)
+
+
+def unindex(model, ids):
+    if ids:
+        get_backend(router.db_for_write(model)).unindex(model, ids)
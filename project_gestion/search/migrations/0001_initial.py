@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:47
+
+from django.db import migrations, models
+
+from search.engine import terms
+
+
+def index_existing_rows(apps, schema_editor):
+    # PostgreSQL searches the stored vectors; the inverted index is for the other backends
+    if schema_editor.connection.vendor == "postgresql":
+        return
+    SearchTerm = apps.get_model("search", "SearchTerm")
+    sources = (("task", "tasks", "Task", "title"), ("project", "projects", "Project", "name"))
+    for kind, app, model, title in sources:
+        rows = []
+        for pk, heading, description in apps.get_model(app, model).objects.values_list("pk", title, "description").iterator():
+            weights = dict.fromkeys(terms(description), 1) | dict.fromkeys(terms(heading), 2)
+            rows += [SearchTerm(kind=kind, term=term, object_id=pk, weight=w) for term, w in weights.items()]
+        SearchTerm.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0004_project_search_vector'),
+        ('tasks', '0005_task_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('project', 'Project')], max_length=10)),
+                ('term', models.CharField(max_length=64)),
+                ('object_id', models.BigIntegerField()),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'term', 'object_id'], name='searchterm_kind_term_idx'), models.Index(fields=['kind', 'object_id'], name='searchterm_kind_object_idx')],
+            },
+        ),
+        migrations.RunPython(index_existing_rows, migrations.RunPython.noop),
+    ]
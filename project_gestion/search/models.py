@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class SearchTerm(models.Model):
+    """
+    Inverted index row (term -> object) used where the database has no
+    full-text search; on PostgreSQL the models' search_vector replaces it.
+    """
+
+    class Kind(models.TextChoices):
+        TASK = "task", "Task"
+        PROJECT = "project", "Project"
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    term = models.CharField(max_length=64)
+    object_id = models.BigIntegerField()
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["kind", "term", "object_id"], name="searchterm_kind_term_idx"),
+            models.Index(fields=["kind", "object_id"], name="searchterm_kind_object_idx"),
+        ]
@@ -0,0 +1,41 @@
+"""
+PostgreSQL side of the search index: a trigger keeps each table's
+``search_vector`` in step with its text columns (bulk writes included)
+and a GIN index serves the ``@@`` lookups. Used from migrations; every
+helper is a no-op on other databases.
+"""
+
+CONFIG = "simple"
+
+
+def install(schema_editor, table, columns, index_name):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    vector = " || ".join(
+        f"setweight(to_tsvector('{CONFIG}', coalesce({{row}}{column}, '')), '{label}')"
+        for column, label in columns
+    )
+    names = ", ".join(column for column, _ in columns)
+    schema_editor.execute(f"""
+        CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {vector.format(row="NEW.")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    schema_editor.execute(f"""
+        CREATE TRIGGER {table}_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF {names} ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+    """)
+    schema_editor.execute(f"UPDATE {table} SET search_vector = {vector.format(row='')}")
+    schema_editor.execute(f"CREATE INDEX {index_name} ON {table} USING gin (search_vector)")
+
+
+def uninstall(schema_editor, table, index_name):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {index_name}")
+    schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table}")
+    schema_editor.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from projects.models import Project
+from tasks.models import Task
+from . import engine
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Project)
+def index_saved(sender, instance, update_fields=None, **kwargs):
+    fields = {field for field, _ in engine.FIELDS[sender]}
+    if update_fields is None or fields & set(update_fields):
+        engine.index([instance])
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Project)
+def unindex_deleted(sender, instance, **kwargs):
+    engine.unindex(sender, [instance.pk])
@@ -0,0 +1,108 @@
+# project_gestion/search/tests/test_search.py
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.backends.postgresql.base import DatabaseWrapper
+from django.test import RequestFactory
+from rest_framework.test import APITestCase
+from project_gestion.pagination import KeysetPagination
+from projects.models import Project, ProjectMember
+from search import engine
+from search.models import SearchTerm
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class SearchEngineTests(APITestCase):
+    def test_query_terms(self):
+        self.assertEqual(engine.query_terms("Tâche  urgente, tâche!"), ["tâche", "urgente"])
+        self.assertEqual(engine.to_tsquery(["tâche", "urg"]), "tâche:* & urg:*")
+
+    def test_postgres_rank_is_double_precision(self):
+        # Compiled for PostgreSQL without connecting: ts_rank's float4 would not round-trip through the cursor
+        postgres = DatabaseWrapper({**connection.settings_dict, "ENGINE": "django.db.backends.postgresql"}, alias="pg")
+        pagination = KeysetPagination()
+        pagination.ordering = ("-search_rank", "-id")
+        queryset = engine.PostgresSearch().search(Task.objects.all(), ["factur"])
+        queryset = queryset.filter(pagination.build_seek_filter([0.0607927, 12], reverse=False))
+        sql, params = queryset.query.get_compiler(connection=postgres).as_sql()
+        self.assertEqual(sql.count("::double precision"), 4, sql)
+        self.assertIn(0.0607927, params)
+
+
+class TaskSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tutu = User.objects.create_user(username="tutu", password="tutu")
+        self.project = Project.objects.create(name="Refonte du site", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        self.other = Project.objects.create(name="Site privé", owner=self.tutu)
+        ProjectMember.objects.create(project=self.other, user=self.tutu, role="owner")
+
+        self.in_title = Task.objects.create(project=self.project, title="Corriger la facturation", created_by=self.toto)
+        self.in_description = Task.objects.create(
+            project=self.project, title="Bug", description="Le module de facturation plante", created_by=self.toto
+        )
+        Task.objects.create(project=self.project, title="Écrire la doc", created_by=self.toto)
+        Task.objects.create(project=self.other, title="Facturation privée", created_by=self.tutu)
+        self.client.force_authenticate(user=self.toto)
+
+    def search(self, q, url="/api/tasks/"):
+        response = self.client.get(url, {"q": q})
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.data["results"]]
+
+    def test_prefix_search_ranks_title_first(self):
+        self.assertEqual(self.search("factur"), [self.in_title.id, self.in_description.id])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.search("factur plante"), [self.in_description.id])
+        self.assertEqual(self.search("factur inconnu"), [])
+        self.assertEqual(self.search("!!"), [])
+
+    def test_index_follows_writes(self):
+        self.client.patch(f"/api/tasks/{self.in_title.id}/", {"title": "Corriger la TVA"}, format="json")
+        self.assertEqual(self.search("factur"), [self.in_description.id])
+        self.assertEqual(self.search("tva"), [self.in_title.id])
+
+        self.client.delete(f"/api/tasks/{self.in_description.id}/")
+        self.assertFalse(SearchTerm.objects.filter(kind="task", object_id=self.in_description.id).exists())
+
+        self.client.post("/api/tasks/bulk/", {"operations": [
+            {"op": "create", "data": {"project": self.project.id, "title": "Facturation annuelle"}},
+        ]}, format="json")
+        self.assertEqual(len(self.search("factur annuel")), 1)
+
+    def test_search_pages_by_rank(self):
+        for i in range(3):
+            Task.objects.create(project=self.project, title=f"Facturation {i}", created_by=self.toto)
+        response = self.client.get("/api/tasks/", {"q": "factur", "page_size": 2})
+        seen = [row["id"] for row in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            seen += [row["id"] for row in response.data["results"]]
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+        self.assertEqual(seen[-1], self.in_description.id)
+
+    def test_project_search(self):
+        self.assertEqual(self.search("sit", url="/api/projects/"), [self.other.id, self.project.id])
+        self.assertEqual(self.search("refonte", url="/api/projects/"), [self.project.id])
+
+    def test_admin_search(self):
+        request = RequestFactory().get("/admin/tasks/task/")
+        queryset, may_have_duplicates = site._registry[Task].get_search_results(request, Task.objects.all(), "factur")
+        self.assertFalse(may_have_duplicates)
+        self.assertEqual(set(queryset.values_list("id", flat=True)), {self.in_title.id, self.in_description.id, self.other.tasks.get().id})
+
+    def test_admin_search_related_fields(self):
+        request = RequestFactory().get("/admin/tasks/task/")
+        queryset, _ = site._registry[Task].get_search_results(request, Task.objects.all(), "tutu")
+        self.assertEqual(list(queryset), [self.other.tasks.get()])
+        queryset, _ = site._registry[Task].get_search_results(request, Task.objects.all(), "refonte")
+        self.assertEqual(queryset.count(), 3)
+        queryset, _ = site._registry[Project].get_search_results(request, Project.objects.all(), "toto")
+        self.assertEqual(list(queryset), [self.project])
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sync.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Delete tombstones older than the sync retention window."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=getattr(settings, "SYNC_TOMBSTONE_RETENTION_DAYS", 30))
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(f"{deleted} tombstones deleted.")
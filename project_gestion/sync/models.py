@@ -0,0 +1,20 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    class Kind(models.TextChoices):
+        TASK = "task", "Task"
+        PROJECT = "project", "Project"
+        MEMBERSHIP = "membership", "Membership"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    project_id = models.BigIntegerField(null=True, blank=True)
+    user_id = models.IntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_id_idx"),
+        ]
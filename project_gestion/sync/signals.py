@@ -0,0 +1,52 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+from .models import Tombstone
+
+
+@receiver(post_delete, sender=Task)
+def record_task_deletion(sender, instance, **kwargs):
+    Tombstone.objects.create(kind=Tombstone.Kind.TASK, object_id=instance.pk, project_id=instance.project_id)
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_project(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding or (update_fields is not None and "project" not in update_fields):
+        return
+    loaded = getattr(instance, "_counted_as", None)
+    if loaded is not None:
+        instance._previous_project_id = loaded[0]
+    else:
+        instance._previous_project_id = Task.objects.filter(pk=instance.pk).values_list("project_id", flat=True).first()
+
+
+@receiver(post_save, sender=Task)
+def record_task_move(sender, instance, created, **kwargs):
+    previous = instance.__dict__.pop("_previous_project_id", None)
+    if previous is not None and previous != instance.project_id:
+        # Gone from the old project: clients that only see that one must drop it
+        Tombstone.objects.create(kind=Tombstone.Kind.TASK, object_id=instance.pk, project_id=previous)
+
+
+@receiver(post_delete, sender=Project)
+def record_project_deletion(sender, instance, **kwargs):
+    # The owner may have no member row, hence no membership tombstone: this one is theirs
+    Tombstone.objects.create(
+        kind=Tombstone.Kind.PROJECT, object_id=instance.pk, project_id=instance.pk, user_id=instance.owner_id,
+    )
+
+
+@receiver(post_delete, sender=ProjectMember)
+def record_membership_deletion(sender, instance, **kwargs):
+    Tombstone.objects.create(
+        kind=Tombstone.Kind.MEMBERSHIP, object_id=instance.pk,
+        project_id=instance.project_id, user_id=instance.user_id,
+    )
+
+
+@receiver(post_save, sender=ProjectMember)
+def touch_project_on_membership_change(sender, instance, **kwargs):
+    # Memberships have no timestamp of their own: they travel with their project
+    Project.objects.filter(pk=instance.project_id).update(updated_at=timezone.now())
@@ -0,0 +1,139 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+
+User = get_user_model()
+
+
+@override_settings(SYNC_OVERLAP_SECONDS=0)
+class SyncTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        self.task = Task.objects.create(project=self.project, title="Tâche 1", created_by=self.toto)
+        self.other = Project.objects.create(name="Autre", owner=self.tata)
+        Task.objects.create(project=self.other, title="Cachée", created_by=self.tata)
+        self.client.force_authenticate(user=self.toto)
+
+    def sync(self, token=None):
+        response = self.client.get("/api/sync/", {"since": token} if token else {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_full_sync(self):
+        data = self.sync()
+        self.assertTrue(data["full"])
+        self.assertEqual([p["id"] for p in data["projects"]], [self.project.id])
+        self.assertEqual([t["id"] for t in data["tasks"]], [self.task.id])
+        self.assertEqual(data["memberships"][0]["user"], self.toto.id)
+
+    def test_no_changes(self):
+        token = self.sync()["token"]
+        data = self.sync(token)
+        self.assertFalse(data["full"])
+        self.assertEqual((data["projects"], data["tasks"]), ([], []))
+        self.assertEqual(data["deleted"], {"projects": [], "tasks": [], "memberships": []})
+
+    def test_changes_since_token(self):
+        token = self.sync()["token"]
+        self.task.title = "Modifiée"
+        self.task.save()
+        created = Task.objects.create(project=self.project, title="Nouvelle", created_by=self.toto)
+        Task.objects.create(project=self.other, title="Ailleurs", created_by=self.tata)
+
+        data = self.sync(token)
+        self.assertCountEqual([t["id"] for t in data["tasks"]], [self.task.id, created.id])
+        self.assertEqual(data["projects"], [])
+
+    def test_deletions(self):
+        membership = ProjectMember.objects.create(project=self.project, user=self.tata)
+        token = self.sync()["token"]
+        task_id, membership_id = self.task.id, membership.id
+        self.task.delete()
+        membership.delete()
+
+        data = self.sync(token)
+        self.assertEqual(data["deleted"]["tasks"], [task_id])
+        self.assertEqual(data["deleted"]["memberships"], [membership_id])
+
+    def test_moved_task_leaves_old_project(self):
+        titi = User.objects.create_user(username="titi", password="titi")
+        ProjectMember.objects.create(project=self.project, user=titi)
+        ProjectMember.objects.create(project=self.other, user=self.toto)
+        bulk_moved = Task.objects.create(project=self.project, title="En lot", created_by=self.toto)
+        self.client.force_authenticate(user=titi)
+        titi_token = self.sync()["token"]
+        self.client.force_authenticate(user=self.toto)
+        toto_token = self.sync()["token"]
+
+        response = self.client.patch(f"/api/tasks/{self.task.id}/", {"project": self.other.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post("/api/tasks/bulk/", {"operations": [
+            {"op": "update", "id": bulk_moved.id, "data": {"project": self.other.id}},
+        ]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Sees both projects: the tasks are sent again, not deleted
+        data = self.sync(toto_token)
+        self.assertCountEqual([t["id"] for t in data["tasks"]], [self.task.id, bulk_moved.id])
+        self.assertEqual(data["deleted"]["tasks"], [])
+
+        # Sees only the old project: both are gone from it
+        self.client.force_authenticate(user=titi)
+        data = self.sync(titi_token)
+        self.assertEqual(data["tasks"], [])
+        self.assertEqual(data["deleted"]["tasks"], sorted([self.task.id, bulk_moved.id]))
+
+    def test_membership_change_sends_project(self):
+        token = self.sync()["token"]
+        ProjectMember.objects.create(project=self.project, user=self.tata, role="manager")
+        data = self.sync(token)
+        self.assertEqual([p["id"] for p in data["projects"]], [self.project.id])
+        self.assertIn(self.tata.id, [m["user"] for m in data["memberships"]])
+
+    def test_joined_project_sends_its_tasks(self):
+        self.client.force_authenticate(user=self.tata)
+        token = self.sync()["token"]
+        hidden = Task.objects.create(project=self.project, title="Ancienne", created_by=self.toto)
+        Task.objects.filter(project=self.project).update(updated_at=timezone.now() - timedelta(days=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectMember.objects.create(project=self.project, user=self.tata)
+
+        data = self.sync(token)
+        self.assertIn(self.project.id, [p["id"] for p in data["projects"]])
+        self.assertCountEqual([t["id"] for t in data["tasks"]], [self.task.id, hidden.id])
+
+        # Only once: the next delta has nothing new
+        self.assertEqual(self.sync(data["token"])["tasks"], [])
+
+    def test_removed_member_drops_project(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            member = ProjectMember.objects.create(project=self.other, user=self.toto)
+        token = self.sync()["token"]
+        with self.captureOnCommitCallbacks(execute=True):
+            member.delete()
+        data = self.sync(token)
+        self.assertEqual(data["deleted"]["projects"], [self.other.id])
+
+    def test_deleted_project_reaches_owner_without_membership(self):
+        self.client.force_authenticate(user=self.tata)
+        token = self.sync()["token"]
+        other_id = self.other.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/projects/{other_id}/")
+        data = self.sync(token)
+        self.assertEqual(data["deleted"]["projects"], [other_id])
+
+    def test_invalid_token(self):
+        response = self.client.get("/api/sync/", {"since": "garbage"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,101 @@
+import base64
+import binascii
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from projects import access
+from projects import queries as project_queries
+from projects.models import Project, ProjectMember
+from projects.serializers import ProjectSerializer
+from tasks import queries as task_queries
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+from .models import Tombstone
+
+
+def encode_token(moment):
+    return base64.urlsafe_b64encode(moment.isoformat().encode()).decode()
+
+
+def decode_token(token):
+    try:
+        moment = datetime.fromisoformat(base64.urlsafe_b64decode(token.encode()).decode())
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValidationError({"since": "Invalid sync token."})
+    if timezone.is_naive(moment):
+        raise ValidationError({"since": "Invalid sync token."})
+    return moment
+
+
+class SyncView(APIView):
+    """
+    Changes feed: everything visible to the caller that was created,
+    updated or deleted after ``since``, plus the token for the next call.
+    Without a token (or with one older than the tombstone retention) the
+    full visible state is returned with ``"full": true``.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        now = timezone.now()
+        since = request.query_params.get("since")
+        # Rows committed slightly after the token was issued can carry an earlier
+        # updated_at; re-sending that window is harmless since clients upsert.
+        overlap = timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+        since = decode_token(since) - overlap if since else None
+        full = since is None or since < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+        user = request.user
+        project_ids = access.accessible_project_ids(user)
+
+        projects = Project.objects.filter(pk__in=project_ids)
+        tasks = Task.objects.filter(project_id__in=project_ids)
+        if not full:
+            # A project joined since the token comes with all of its tasks, however old
+            joined = ProjectMember.objects.filter(user_id=user.id, project_id__in=project_ids, created_at__gt=since)
+            projects = projects.filter(updated_at__gt=since)
+            tasks = tasks.filter(Q(updated_at__gt=since) | Q(project_id__in=joined.values("project_id")))
+        projects = list(project_queries.with_members(projects.order_by("id")))
+        tasks = list(task_queries.for_list(tasks.order_by("id")))
+
+        memberships = [
+            {"id": m.id, "project": project.id, "user": m.user_id, "role": m.role}
+            for project in projects
+            for m in project.projectmember_set.all()
+        ]
+
+        return Response({
+            "token": encode_token(now),
+            "full": full,
+            "projects": ProjectSerializer(projects, many=True, context={"request": request}).data,
+            "tasks": TaskSerializer(tasks, many=True, context={"request": request}).data,
+            "memberships": memberships,
+            "deleted": {} if full else self.deletions(user, project_ids, since, {task.id for task in tasks}),
+        })
+
+    @staticmethod
+    def deletions(user, project_ids, since, sent_task_ids):
+        deleted = {"projects": set(), "tasks": set(), "memberships": set()}
+        visible = set(project_ids)
+        own = [Tombstone.Kind.MEMBERSHIP, Tombstone.Kind.PROJECT]
+        rows = Tombstone.objects.filter(
+            Q(project_id__in=project_ids) | Q(kind__in=own, user_id=user.id),
+            deleted_at__gt=since,
+        ).values_list("kind", "object_id", "project_id", "user_id")
+        for kind, object_id, project_id, user_id in rows.iterator():
+            if kind in own and user_id == user.id and project_id not in visible:
+                # Removed from the project, or it was deleted (as its owner): drop it entirely
+                deleted["projects"].add(project_id)
+            elif project_id in visible:
+                deleted[f"{kind}s"].add(object_id)
+        # Moved between two visible projects: the task is sent again, not deleted
+        deleted["tasks"] -= sent_task_ids
+        return {key: sorted(ids) for key, ids in deleted.items()}
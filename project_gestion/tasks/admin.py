@@ -1,6 +1,7 @@
 # tasks/admin.py
 from django.contrib import admin
-from .models import Task
+from .models import DueDigest, Task
+from search.admin import FullTextSearchAdminMixin
 
 class TaskAssigneesInline(admin.TabularInline):
     model = Task.assignees.through  # relation many-to-many
@@ -9,8 +10,13 @@ class TaskAssigneesInline(admin.TabularInline):
     verbose_name_plural = "Assignees"
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ("id", "title", "project", "status", "priority", "due_date", "created_by")
     list_filter = ("status", "priority", "project")
-    search_fields = ("title", "project__name", "created_by__username")
+    search_fields = ("project__name", "created_by__username")  # title and description: FullTextSearchAdminMixin
     inlines = [TaskAssigneesInline]
+
+@admin.register(DueDigest)
+class DueDigestAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "date", "overdue", "due_soon")
+    list_filter = ("date",)
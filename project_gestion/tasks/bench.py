@@ -0,0 +1,247 @@
+import math
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from projects.models import Project, ProjectMember
+from search import engine as search
+from . import counters
+from .models import Task
+
+
+@dataclass
+class Dataset:
+    user_ids: list = field(default_factory=list)
+    project_ids: list = field(default_factory=list)
+    members: dict = field(default_factory=dict)
+    task_count: int = 0
+
+
+def seed_dataset(users=200, projects=50, members_per_project=10, tasks_per_project=200,
+                 max_assignees=3, seed=0, prefix="bench", batch_size=2000):
+    """
+    Bulk-insert a synthetic board population. Bypasses model signals, so
+    anything maintained by them must be rebuilt by the caller if needed
+    (task counters and the search index are refreshed here).
+    """
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    dataset = Dataset()
+
+    created = User.objects.bulk_create(
+        [User(username=f"{prefix}_{i}", password="!") for i in range(users)],
+        batch_size=batch_size,
+    )
+    dataset.user_ids = [u.id for u in created]
+
+    owners = [rng.choice(dataset.user_ids) for _ in range(projects)]
+    created = Project.objects.bulk_create(
+        [Project(name=f"{prefix} project {i}", description="", owner_id=owner) for i, owner in enumerate(owners)],
+        batch_size=batch_size,
+    )
+    dataset.project_ids = [p.id for p in created]
+    search.index(created)
+
+    memberships = []
+    for project_id, owner in zip(dataset.project_ids, owners):
+        others = [u for u in rng.sample(dataset.user_ids, min(members_per_project, users)) if u != owner]
+        dataset.members[project_id] = [owner] + others
+        memberships.append(ProjectMember(project_id=project_id, user_id=owner, role="owner"))
+        memberships.extend(
+            ProjectMember(project_id=project_id, user_id=u, role=rng.choice(("manager", "member", "member")))
+            for u in others
+        )
+    ProjectMember.objects.bulk_create(memberships, batch_size=batch_size)
+
+    statuses = list(Task.Status.values)
+    priorities = list(Task.Priority.values)
+    Through = Task.assignees.through
+    for project_id in dataset.project_ids:
+        members = dataset.members[project_id]
+        tasks = Task.objects.bulk_create(
+            [
+                Task(
+                    project_id=project_id,
+                    title=f"{prefix} task {project_id}-{i}",
+                    description=f"Synthetic task {i} of project {project_id}",
+                    status=rng.choice(statuses),
+                    priority=rng.choice(priorities),
+                    created_by_id=rng.choice(members),
+                    due_date=today + timedelta(days=rng.randint(-60, 60)) if rng.random() < 0.8 else None,
+                )
+                for i in range(tasks_per_project)
+            ],
+            batch_size=batch_size,
+        )
+        links = [
+            Through(task_id=task.id, user_id=user_id)
+            for task in tasks
+            for user_id in rng.sample(members, rng.randint(0, min(max_assignees, len(members))))
+        ]
+        Through.objects.bulk_create(links, batch_size=batch_size)
+        search.index(tasks)
+        dataset.task_count += len(tasks)
+
+    counters.rebuild(dataset.project_ids)
+    return dataset
+
+
+def load_dataset(prefix="bench"):
+    """The Dataset ``seed_dataset`` stored under ``prefix``, read back from the database."""
+    dataset = Dataset()
+    dataset.user_ids = list(User.objects.filter(username__startswith=f"{prefix}_").order_by("id").values_list("id", flat=True))
+    projects = Project.objects.filter(owner_id__in=dataset.user_ids, name__startswith=f"{prefix} project ")
+    dataset.project_ids = list(projects.order_by("id").values_list("id", flat=True))
+    members = ProjectMember.objects.filter(project_id__in=dataset.project_ids).order_by("role", "id")
+    for project_id, user_id, role in members.values_list("project_id", "user_id", "role"):
+        # The owner first, as seed_dataset builds it
+        dataset.members.setdefault(project_id, [])
+        if role == "owner":
+            dataset.members[project_id].insert(0, user_id)
+        else:
+            dataset.members[project_id].append(user_id)
+    dataset.task_count = Task.objects.filter(project_id__in=dataset.project_ids).count()
+    return dataset
+
+
+def percentile(values, p):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+@dataclass
+class Actor:
+    user: User
+    client: Client
+    project_ids: list
+    # (id, priority) of tasks the actor may update
+    tasks: list
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # (actor, iteration, rng) -> (path, json body or None)
+    build: object
+    expect: int = 200
+
+
+def _update_task(actor, i, rng):
+    # Rewrites a priority with the value it already has: the full write path, the dataset unchanged
+    task_id, priority = rng.choice(actor.tasks)
+    return f"/api/tasks/{task_id}/", {"priority": priority}
+
+
+SCENARIOS = [
+    Scenario("projects.list", "get", lambda a, i, rng: ("/api/projects/", None)),
+    Scenario("projects.list_stats", "get", lambda a, i, rng: ("/api/projects/?stats=true", None)),
+    Scenario("tasks.list", "get", lambda a, i, rng: ("/api/tasks/", None)),
+    Scenario("tasks.list_compact", "get", lambda a, i, rng: ("/api/tasks/?view=compact", None)),
+    Scenario("tasks.filter", "get", lambda a, i, rng: (
+        f"/api/tasks/?project_id={rng.choice(a.project_ids)}"
+        f"&status={rng.choice(Task.Status.values)}&priority={rng.choice(Task.Priority.values)}", None,
+    )),
+    Scenario("tasks.search", "get", lambda a, i, rng: (f"/api/tasks/?q=task {rng.randint(0, 99)}", None)),
+    Scenario("tasks.retrieve", "get", lambda a, i, rng: (f"/api/tasks/{rng.choice(a.tasks)[0]}/", None)),
+    Scenario("tasks.create", "post", lambda a, i, rng: ("/api/tasks/", {
+        "project": rng.choice(a.project_ids), "title": f"bench created {i}",
+        "priority": rng.choice(Task.Priority.values), "assignees": [a.user.id],
+    }), expect=201),
+    Scenario("tasks.update", "patch", _update_task),
+]
+
+
+class ApiBenchmark:
+    """
+    Drives the real URL routes in-process (middleware, JWT authentication,
+    views, serializers) as the owners of a seeded dataset, and measures
+    latency, SQL queries and throughput per scenario.
+    """
+
+    def __init__(self, dataset, clients=5, requests=100, warmup=5, seed=0):
+        self.requests = requests
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        host = next((h for h in settings.ALLOWED_HOSTS if h not in ("*",) and not h.startswith(".")), "localhost")
+
+        owners = {}
+        for project_id in dataset.project_ids:
+            owners.setdefault(dataset.members[project_id][0], []).append(project_id)
+        self.actors = []
+        for user_id, project_ids in sorted(owners.items(), key=lambda item: (-len(item[1]), item[0]))[:clients]:
+            user = User.objects.get(id=user_id)
+            client = Client(HTTP_HOST=host, HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+            tasks = list(Task.objects.filter(project_id__in=project_ids).order_by("id").values_list("id", "priority")[:1000])
+            self.actors.append(Actor(user, client, project_ids, tasks))
+        if not self.actors:
+            raise ValueError("The dataset has no projects.")
+
+    def run(self, scenarios=SCENARIOS):
+        results = {}
+        for scenario in scenarios:
+            created = []
+            for i in range(self.warmup):
+                self._request(scenario, i, created)
+            timings, query_counts, statuses = [], [], Counter()
+            start = time.perf_counter()
+            for i in range(self.requests):
+                elapsed, queries, status = self._request(scenario, self.warmup + i, created)
+                timings.append(elapsed)
+                query_counts.append(queries)
+                statuses[status] += 1
+            total = time.perf_counter() - start
+            # Leave the dataset as it was for the next scenario and the next run
+            Task.objects.filter(id__in=created).delete()
+            results[scenario.name] = {
+                "method": scenario.method.upper(),
+                "requests": self.requests,
+                "p50_ms": round(percentile(timings, 50) * 1000, 3),
+                "p95_ms": round(percentile(timings, 95) * 1000, 3),
+                "mean_ms": round(sum(timings) / len(timings) * 1000, 3),
+                "queries_mean": round(sum(query_counts) / len(query_counts), 2),
+                "queries_max": max(query_counts),
+                "throughput_rps": round(self.requests / total, 1),
+                "errors": sum(count for status, count in statuses.items() if status != scenario.expect),
+                "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            }
+        return results
+
+    def _request(self, scenario, i, created):
+        actor = self.actors[i % len(self.actors)]
+        path, body = scenario.build(actor, i, self.rng)
+        kwargs = {"data": body, "content_type": "application/json"} if body is not None else {}
+        with ExitStack() as stack:
+            captures = [stack.enter_context(CaptureQueriesContext(connection)) for connection in connections.all()]
+            start = time.perf_counter()
+            response = getattr(actor.client, scenario.method)(path, **kwargs)
+            elapsed = time.perf_counter() - start
+        if scenario.method == "post" and response.status_code == 201:
+            created.append(response.json()["id"])
+        return elapsed, sum(len(capture) for capture in captures), response.status_code
+
+
+def compare(previous, current, threshold=0.2):
+    """Rows of (scenario, metric, before, after, change) that got worse by more than ``threshold``."""
+    regressions = []
+    for name, after in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "queries_mean"):
+            old, new = before[metric], after[metric]
+            if new > old * (1 + threshold) and (metric != "queries_mean" or new - old >= 1):
+                regressions.append((name, metric, old, new, (new - old) / old if old else math.inf))
+    return regressions
@@ -0,0 +1,219 @@
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from projects import access
+from realtime.events import publish_on_commit
+from search import engine as search
+from sync.models import Tombstone
+from users import dashboard
+from . import counters, queries
+from .models import Task
+from .serializers import TaskSerializer
+
+MAX_OPERATIONS = 1000
+BATCH_SIZE = 500
+
+
+class BulkRequestSerializer(serializers.Serializer):
+    mode = serializers.ChoiceField(choices=["atomic", "best_effort"], default="atomic")
+    operations = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=MAX_OPERATIONS
+    )
+
+
+class BulkOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=["create", "update", "move", "delete"])
+    id = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        op = attrs["op"]
+        if op != "create" and "id" not in attrs:
+            raise serializers.ValidationError({"id": "This field is required."})
+        if op == "move" and "status" not in attrs:
+            raise serializers.ValidationError({"status": "This field is required."})
+        if op in ("create", "update") and "data" not in attrs:
+            raise serializers.ValidationError({"data": "This field is required."})
+        return attrs
+
+
+class BulkTaskDataSerializer(TaskSerializer):
+    # Plain id: projects are checked in one pass against the access cache instead of one lookup per row
+    project = serializers.IntegerField(source="project_id")
+
+
+@dataclass
+class BulkItem:
+    index: int
+    op: str = None
+    id: int = None
+    values: dict = field(default_factory=dict)
+    assignees: list = None
+    task: Task = None
+    errors: object = None
+
+    def result(self, status):
+        result = {"index": self.index, "op": self.op, "status": status, "id": self.id}
+        if self.errors is not None:
+            result["errors"] = self.errors
+        return result
+
+
+class TaskBulkProcessor:
+    """
+    Validates a list of task operations together, then applies the valid
+    ones with bulk_create / bulk_update / one DELETE in a single transaction.
+
+    In ``atomic`` mode any invalid operation rejects the whole batch; in
+    ``best_effort`` mode the invalid ones are reported and skipped.
+    """
+
+    def __init__(self, user, operations, mode="atomic"):
+        self.user = user
+        self.mode = mode
+        self.items = [self._parse(index, raw) for index, raw in enumerate(operations)]
+
+    @transaction.atomic
+    def run(self):
+        # One transaction from the checks on: the tasks stay locked until their counters have moved
+        self._check()
+        failed = any(item.errors is not None for item in self.items)
+        if failed and self.mode == "atomic":
+            self.applied = False
+            return [item.result("error" if item.errors is not None else "skipped") for item in self.items]
+
+        valid = [item for item in self.items if item.errors is None]
+        self._apply(valid)
+        self.applied = True
+        return [item.result("error" if item.errors is not None else "ok") for item in self.items]
+
+    def _parse(self, index, raw):
+        item = BulkItem(index=index)
+        operation = BulkOperationSerializer(data=raw)
+        if not operation.is_valid():
+            item.op = raw.get("op") if isinstance(raw, dict) else None
+            item.errors = operation.errors
+            return item
+
+        attrs = operation.validated_data
+        item.op, item.id = attrs["op"], attrs.get("id")
+        if item.op == "move":
+            item.values = {"status": attrs["status"]}
+        elif item.op in ("create", "update"):
+            data = BulkTaskDataSerializer(data=attrs["data"], partial=item.op == "update")
+            if not data.is_valid():
+                item.errors = data.errors
+                return item
+            item.values = dict(data.validated_data)
+            item.assignees = item.values.pop("assignees", None)
+        return item
+
+    def _check(self):
+        roles = access.get_project_roles(self.user)
+        ids = [item.id for item in self.items if item.errors is None and item.id is not None]
+        # In id order, so two batches touching the same tasks queue up instead of deadlocking
+        tasks = queries.cached_visible_tasks(self.user).select_for_update(of=("self",)).order_by("pk").in_bulk(ids)
+
+        seen = set()
+        for item in self.items:
+            if item.errors is not None:
+                continue
+            if item.id is not None:
+                item.task = tasks.get(item.id)
+                if item.task is None:
+                    item.errors = {"id": "Not found."}
+                    continue
+                if item.id in seen:
+                    item.errors = {"id": "Task referenced by several operations."}
+                    continue
+                seen.add(item.id)
+                if item.task.created_by_id != self.user.id and roles.get(item.task.project_id) != "owner":
+                    item.errors = {"detail": "You do not have permission to perform this action."}
+                    continue
+            project_id = item.values.get("project_id")
+            if project_id is not None and project_id not in roles:
+                item.errors = {"project": "You must be a project member to create a task."}
+
+        wanted = {user_id for item in self.items if item.errors is None for user_id in item.assignees or ()}
+        self.known_users = set(User.objects.filter(id__in=wanted).values_list("id", flat=True)) if wanted else set()
+
+    def _apply(self, items):
+        creates = [item for item in items if item.op == "create"]
+        updates = [item for item in items if item.op in ("update", "move")]
+        deletes = [item for item in items if item.op == "delete"]
+        deltas = Counter()
+
+        if creates:
+            created = Task.objects.bulk_create(
+                [Task(created_by=self.user, **item.values) for item in creates], batch_size=BATCH_SIZE
+            )
+            for item, task in zip(creates, created):
+                item.task, item.id = task, task.id
+                deltas[task.counter_key()] += 1
+
+        if updates:
+            now = timezone.now()
+            fields = {"updated_at"}
+            moves = []
+            for item in updates:
+                before = item.task.counter_key()
+                for attr, value in item.values.items():
+                    setattr(item.task, attr, value)
+                item.task.updated_at = now
+                deltas.update(counters.moved(before, item.task.counter_key()))
+                fields.update(item.values)
+                if before[0] != item.task.project_id:
+                    moves.append(Tombstone(kind=Tombstone.Kind.TASK, object_id=item.id, project_id=before[0]))
+            Task.objects.bulk_update([item.task for item in updates], sorted(fields), batch_size=BATCH_SIZE)
+            # bulk_update sends no signal: record the moves out of a project as sync.signals would
+            Tombstone.objects.bulk_create(moves, batch_size=BATCH_SIZE)
+
+        relinked = [item for item in creates + updates if item.assignees is not None]
+        if relinked:
+            Through = Task.assignees.through
+            Through.objects.filter(task_id__in=[item.id for item in relinked if item.op != "create"]).delete()
+            Through.objects.bulk_create(
+                [
+                    Through(task_id=item.id, user_id=user_id)
+                    for item in relinked
+                    for user_id in dict.fromkeys(item.assignees)
+                    if user_id in self.known_users
+                ],
+                batch_size=BATCH_SIZE,
+            )
+
+        # bulk_create / bulk_update skip the counter and search signals; the DELETE below goes through them
+        counters.apply(deltas)
+        # A task moved to another project left its previous project's key in deltas
+        dashboard.invalidate_projects(
+            {item.task.project_id for item in creates + updates} | {project for project, _, _ in deltas}
+        )
+        search.index(
+            item.task for item in creates + updates
+            if item.op == "create" or {"title", "description"} & item.values.keys()
+        )
+
+        if deletes:
+            Task.objects.filter(id__in=[item.id for item in deletes]).delete()
+
+        self._publish(creates + updates, deletes)
+
+    @staticmethod
+    def _publish(upserts, deletes):
+        by_project = {}
+        for item in upserts:
+            by_project.setdefault(item.task.project_id, ([], []))[0].append(item.id)
+        for item in deletes:
+            by_project.setdefault(item.task.project_id, ([], []))[1].append(item.id)
+
+        for project_id, (upserted, deleted) in by_project.items():
+            def build(upserted=upserted, deleted=deleted):
+                tasks = queries.for_list(Task.objects.filter(id__in=upserted).order_by("id"))
+                return {"upserted": TaskSerializer(tasks, many=True).data, "deleted": deleted}
+            publish_on_commit(project_id, "tasks.bulk", build)
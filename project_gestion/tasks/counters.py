@@ -0,0 +1,76 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Task, TaskCounter
+
+
+def apply(deltas):
+    """
+    Apply ``{(project_id, status, priority): delta}`` to the counters with
+    ``count = count + delta`` updates, so concurrent writers never lose an
+    increment. Call it inside the transaction that changed the tasks.
+    """
+    for (project_id, status, priority), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        cell = TaskCounter.objects.filter(project_id=project_id, status=status, priority=priority)
+        if cell.update(count=F("count") + delta) or delta < 0:
+            # A missing cell on a decrement means the project is being deleted
+            # (or the counters drifted): nothing to do, rebuild repairs drift.
+            continue
+        TaskCounter.objects.bulk_create(
+            [TaskCounter(project_id=project_id, status=status, priority=priority)], ignore_conflicts=True
+        )
+        cell.update(count=F("count") + delta)
+
+
+def moved(before, after):
+    deltas = Counter()
+    if before != after:
+        if before is not None:
+            deltas[before] -= 1
+        if after is not None:
+            deltas[after] += 1
+    return deltas
+
+
+def project_stats(counters):
+    status = dict.fromkeys(Task.Status.values, 0)
+    priority = dict.fromkeys(Task.Priority.values, 0)
+    for counter in counters:
+        status[counter.status] = status.get(counter.status, 0) + counter.count
+        priority[counter.priority] = priority.get(counter.priority, 0) + counter.count
+    return {"total": sum(status.values()), "status": status, "priority": priority}
+
+
+@transaction.atomic
+def rebuild(project_ids=None):
+    """Recount from the task table; returns the number of cells that were wrong."""
+    tasks = Task.objects.all()
+    stored = TaskCounter.objects.all()
+    if project_ids is not None:
+        tasks = tasks.filter(project_id__in=project_ids)
+        stored = stored.filter(project_id__in=project_ids)
+
+    actual = {
+        (row["project_id"], row["status"], row["priority"]): row["n"]
+        for row in tasks.values("project_id", "status", "priority").annotate(n=Count("pk")).order_by()
+    }
+    stored = {(c.project_id, c.status, c.priority): c for c in stored.select_for_update()}
+
+    stale = []
+    for key, counter in stored.items():
+        count = actual.get(key, 0)
+        if counter.count != count:
+            counter.count = count
+            stale.append(counter)
+    missing = [
+        TaskCounter(project_id=project_id, status=status, priority=priority, count=count)
+        for (project_id, status, priority), count in actual.items()
+        if (project_id, status, priority) not in stored
+    ]
+    TaskCounter.objects.bulk_update(stale, ["count"], batch_size=500)
+    TaskCounter.objects.bulk_create(missing, batch_size=500)
+    return len(stale) + len(missing)
@@ -0,0 +1,127 @@
+import csv
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import router
+from django.http import StreamingHttpResponse
+
+from project_gestion.renderers import FastJSONRenderer
+from projects.models import ProjectMember
+from . import queries
+from .models import Task
+
+CHUNK_SIZE = 1000
+LINES_PER_WRITE = 200
+
+TASK_COLUMNS = (
+    "id", "title", "description", "status", "priority", "due_date",
+    "completed_at", "created_by", "created_at", "updated_at",
+)
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    # The export action streams its own body; renderers only serve content
+    # negotiation (?format= / Accept) and error payloads, as one JSON line
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+class CSVRenderer(FastJSONRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+def task_rows(project, using=None):
+    """
+    Task dicts of a project in id order. Rows come from one cursor read
+    ``CHUNK_SIZE`` at a time (server-side on PostgreSQL), and assignees
+    are prefetched per chunk, so memory does not grow with the project.
+    """
+    queryset = (
+        Task.objects.using(using).filter(project=project)
+        .defer("search_vector", "project")
+        .order_by("id")
+        .prefetch_related(queries.assignees_prefetch())
+    )
+    for task in queryset.iterator(chunk_size=CHUNK_SIZE):
+        yield {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "status": task.status,
+            "priority": task.priority,
+            "due_date": task.due_date,
+            "completed_at": task.completed_at,
+            "created_by": task.created_by_id,
+            "created_at": task.created_at,
+            "updated_at": task.updated_at,
+            "assignees": [{"id": user.id, "username": user.username} for user in task.assignees.all()],
+        }
+
+
+def member_rows(project, using=None):
+    members = ProjectMember.objects.using(using).filter(project=project).order_by("id")
+    for user_id, username, role in members.values_list("user_id", "user__username", "role").iterator(chunk_size=CHUNK_SIZE):
+        yield {"id": user_id, "username": username, "role": role}
+
+
+def ndjson_lines(project, using=None):
+    """One JSON document per line: the project, then its members, then its tasks."""
+    dumps = FastJSONRenderer().render
+    yield dumps({
+        "type": "project", "id": project.id, "name": project.name,
+        "description": project.description, "owner": project.owner_id,
+    }) + b"\n"
+    for member in member_rows(project, using):
+        yield dumps({"type": "member", **member}) + b"\n"
+    for task in task_rows(project, using):
+        yield dumps({"type": "task", **task}) + b"\n"
+
+
+class _Line:
+    def write(self, value):
+        return value
+
+
+def csv_lines(project, using=None):
+    """One row per task; assignees are ``username`` values joined by ``;``."""
+    writer = csv.writer(_Line())
+    yield writer.writerow(TASK_COLUMNS + ("assignees",)).encode()
+    for task in task_rows(project, using):
+        values = [task[column] for column in TASK_COLUMNS]
+        values = ["" if value is None else value.isoformat() if hasattr(value, "isoformat") else value for value in values]
+        assignees = ";".join(user["username"] for user in task["assignees"])
+        yield writer.writerow(values + [assignees]).encode()
+
+
+FORMATS = {
+    "ndjson": (ndjson_lines, NDJSONRenderer.media_type),
+    "csv": (csv_lines, "text/csv; charset=utf-8"),
+}
+
+
+def _writes(lines):
+    while chunk := b"".join(islice(lines, LINES_PER_WRITE)):
+        yield chunk
+
+
+async def _async_writes(lines):
+    # Same thread for every chunk: the cursor belongs to that thread's connection
+    next_chunk = sync_to_async(lambda: b"".join(islice(lines, LINES_PER_WRITE)), thread_sensitive=True)
+    while chunk := await next_chunk():
+        yield chunk
+
+
+def streaming_response(request, project, format):
+    build, content_type = FORMATS[format]
+    # The body is read after the view returns, outside the request's read routing: pin the alias now
+    lines = build(project, router.db_for_read(Task))
+    # Under ASGI a synchronous iterator would be read to the end before the first byte is sent
+    is_asgi = isinstance(getattr(request, "_request", request), ASGIRequest)
+    content = _async_writes(lines) if is_asgi else _writes(lines)
+    return StreamingHttpResponse(
+        content,
+        content_type=content_type,
+        headers={"Content-Disposition": f'attachment; filename="project-{project.id}.{format}"'},
+    )
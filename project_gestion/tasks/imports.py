@@ -0,0 +1,243 @@
+import codecs
+import csv
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from realtime.events import publish_on_commit
+from search import engine as search
+from users import dashboard
+from . import counters
+from .models import Task
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+FORMATS = {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/json": "ndjson"}
+
+
+class ImportRowSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=200)
+    description = serializers.CharField(allow_blank=True, required=False, default="")
+    status = serializers.ChoiceField(choices=Task.Status.choices, default=Task.Status.TODO)
+    priority = serializers.ChoiceField(choices=Task.Priority.choices, default=Task.Priority.MEDIUM)
+    due_date = serializers.DateField(allow_null=True, required=False, default=None)
+    completed_at = serializers.DateTimeField(allow_null=True, required=False, default=None)
+    # User ids or usernames
+    assignees = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+
+
+class UnreadableInput(ValueError):
+    """The stream cannot be parsed past this line: the import stops there."""
+
+
+def parse_csv(stream):
+    """(line, row) pairs from a CSV byte stream; same columns as the export, assignees joined by ``;``."""
+    reader = csv.DictReader(codecs.iterdecode(stream, "utf-8-sig"))
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            # A Latin-1 export from a spreadsheet, typically
+            yield reader.line_num + 1, UnreadableInput("Not valid UTF-8 text: save the file as UTF-8.")
+            return
+        except csv.Error as exc:
+            yield reader.line_num, UnreadableInput(f"Invalid CSV: {exc}")
+            return
+        row = {key: value for key, value in row.items() if key and value not in ("", None)}
+        if "assignees" in row:
+            row["assignees"] = [name for name in row["assignees"].split(";") if name]
+        yield reader.line_num, row
+
+
+def parse_ndjson(stream):
+    """(line, row) pairs from an NDJSON byte stream; project and member lines of an export are skipped."""
+    for line, raw in enumerate(stream, start=1):
+        if not raw.strip():
+            continue
+        try:
+            row = json.loads(raw)
+        except ValueError as exc:
+            yield line, exc
+            continue
+        if not isinstance(row, dict) or row.get("type", "task") != "task":
+            if not isinstance(row, dict):
+                yield line, ValueError("Expected a JSON object.")
+            continue
+        if isinstance(row.get("assignees"), list):
+            row["assignees"] = [
+                (user.get("id") or user.get("username")) if isinstance(user, dict) else user
+                for user in row["assignees"]
+            ]
+        yield line, row
+
+
+PARSERS = {"csv": parse_csv, "ndjson": parse_ndjson}
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+    # False when the input could not be read to the end: the rows after the last error were never seen
+    complete: bool = True
+
+    def error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "rows": self.rows, "created": self.created, "failed": self.failed, "errors": self.errors,
+            "complete": self.complete,
+        }
+
+
+class TaskImporter:
+    """
+    Imports parsed rows into one project, ``chunk_size`` rows at a time:
+    each chunk is validated, its assignees resolved with one query, and
+    its valid rows written in their own transaction (COPY on PostgreSQL,
+    bulk_create elsewhere). Invalid rows are reported and skipped;
+    ``on_progress(report)`` is called after every chunk. Input that
+    cannot be read to the end stops the import with ``report.complete``
+    false, the chunks before it being kept.
+    """
+
+    def __init__(self, user, project, chunk_size=CHUNK_SIZE, on_progress=None):
+        self.user = user
+        self.project = project
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.report = ImportReport()
+
+    def run(self, rows):
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.chunk_size)):
+            self._import(chunk)
+            if self.on_progress:
+                self.on_progress(self.report)
+        if self.report.created:
+            created = self.report.created
+            publish_on_commit(self.project.id, "tasks.imported", lambda: {"created": created})
+        return self.report
+
+    def _import(self, chunk):
+        self.report.rows += len(chunk)
+        reported = len(self.report.errors)
+        valid = []
+        for line, raw in chunk:
+            if isinstance(raw, Exception):
+                self.report.error(line, {"detail": str(raw)})
+                if isinstance(raw, UnreadableInput):
+                    self.report.complete = False
+                continue
+            row = ImportRowSerializer(data=raw)
+            if row.is_valid():
+                valid.append((line, row.validated_data))
+            else:
+                self.report.error(line, row.errors)
+
+        users = self._resolve_assignees(valid)
+        tasks, links = [], []
+        for line, values in valid:
+            values = dict(values)
+            names = dict.fromkeys(values.pop("assignees"))
+            unknown = [name for name in names if name not in users]
+            if unknown:
+                self.report.error(line, {"assignees": f"Unknown users: {', '.join(unknown)}"})
+                continue
+            tasks.append(Task(project=self.project, created_by=self.user, **values))
+            links.append(dict.fromkeys(users[name] for name in names))
+        self.report.errors[reported:] = sorted(self.report.errors[reported:], key=lambda error: error["line"])
+
+        if tasks:
+            with transaction.atomic(using=router.db_for_write(Task)):
+                self._write(tasks, links)
+            self.report.created += len(tasks)
+
+    @staticmethod
+    def _resolve_assignees(valid):
+        names = {name for _, values in valid for name in values["assignees"]}
+        if not names:
+            return {}
+        # isdecimal, not isdigit: int() rejects digits such as "²"
+        ids = {int(name) for name in names if name.isdecimal()}
+        found = User.objects.filter(Q(id__in=ids) | Q(username__in=names)).values_list("id", "username")
+        users = {}
+        for user_id, username in found:
+            if username in names:
+                users.setdefault(username, user_id)
+            if user_id in ids:
+                # An id wins over a username made of digits
+                users[str(user_id)] = user_id
+        return users
+
+    def _write(self, tasks, links):
+        connection = connections[router.db_for_write(Task)]
+        Through = Task.assignees.through
+        if connection.vendor == "postgresql":
+            copy_tasks(connection, tasks)
+            copy_rows(connection, Through._meta.db_table, ("task_id", "user_id"), [
+                (task.id, user_id) for task, user_ids in zip(tasks, links) for user_id in user_ids
+            ])
+        else:
+            Task.objects.bulk_create(tasks, batch_size=CHUNK_SIZE)
+            Through.objects.bulk_create(
+                [Through(task_id=task.id, user_id=user_id) for task, user_ids in zip(tasks, links) for user_id in user_ids],
+                batch_size=CHUNK_SIZE,
+            )
+        # Neither path sends the counter and search signals
+        counters.apply(Counter(task.counter_key() for task in tasks))
+        dashboard.invalidate_projects([self.project.id])
+        search.index(tasks)
+
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_rows(connection, table, columns, rows):
+    """``COPY table (columns) FROM STDIN`` in PostgreSQL's text format (psycopg 3)."""
+    if not rows:
+        return
+    quote = connection.ops.quote_name
+    body = "".join("\t".join(_copy_value(value) for value in row) + "\n" for row in rows)
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(f"COPY {quote(table)} ({', '.join(quote(column) for column in columns)}) FROM STDIN") as copy:
+            copy.write(body)
+
+
+def copy_tasks(connection, tasks):
+    # COPY returns no ids: take them from the sequence first, the through rows need them
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+            [Task._meta.db_table, len(tasks)],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    now = timezone.now()
+    for task, pk in zip(tasks, ids):
+        task.id = pk
+        task.created_at = task.updated_at = now
+    fields = [f for f in Task._meta.concrete_fields if f.name != "search_vector"]
+    copy_rows(connection, Task._meta.db_table, [f.column for f in fields], [
+        [getattr(task, f.attname) for f in fields] for task in tasks
+    ])
+
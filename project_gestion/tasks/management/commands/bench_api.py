@@ -0,0 +1,87 @@
+import json
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from tasks import bench
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API routes in-process against a seed_bench dataset: p50/p95 latency, "
+        "queries per request and throughput per scenario, saved as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prefix", default="bench", help="Dataset created by seed_bench.")
+        parser.add_argument("--requests", type=int, default=100, help="Measured requests per scenario")
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--clients", type=int, default=5, help="Project owners the requests rotate through")
+        parser.add_argument("--scenario", action="append", dest="scenarios", help="Only these scenarios (repeatable).")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument("--compare", help="Previous results file: report regressions against it.")
+        parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown reported as a regression")
+
+    def handle(self, *args, **options):
+        scenarios = bench.SCENARIOS
+        if options["scenarios"]:
+            known = {scenario.name: scenario for scenario in scenarios}
+            unknown = set(options["scenarios"]) - known.keys()
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}. Known: {', '.join(known)}")
+            scenarios = [known[name] for name in options["scenarios"]]
+
+        dataset = bench.load_dataset(options["prefix"])
+        if not dataset.project_ids:
+            raise CommandError(f"No '{options['prefix']}' dataset, run seed_bench first.")
+
+        benchmark = bench.ApiBenchmark(
+            dataset, clients=options["clients"], requests=options["requests"],
+            warmup=options["warmup"], seed=options["seed"],
+        )
+        results = {
+            "meta": {
+                "date": timezone.now().isoformat(),
+                "commit": self.git_commit(),
+                "vendor": connection.vendor,
+                "dataset": {
+                    "users": len(dataset.user_ids), "projects": len(dataset.project_ids), "tasks": dataset.task_count,
+                },
+                "requests": options["requests"],
+                "clients": len(benchmark.actors),
+            },
+            "scenarios": benchmark.run(scenarios),
+        }
+
+        self.stdout.write(f"{'scenario':<22}{'p50 ms':>9}{'p95 ms':>9}{'queries':>9}{'req/s':>9}{'errors':>8}")
+        for name, row in results["scenarios"].items():
+            self.stdout.write(
+                f"{name:<22}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['queries_mean']:>9.1f}"
+                f"{row['throughput_rps']:>9.1f}{row['errors']:>8}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                previous = json.load(file)
+            regressions = bench.compare(previous, results, options["threshold"])
+            for name, metric, old, new, change in regressions:
+                self.stdout.write(self.style.WARNING(f"{name} {metric}: {old} -> {new} ({change:+.0%})"))
+            if not regressions:
+                self.stdout.write(self.style.SUCCESS(f"No regression against {options['compare']}."))
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,64 @@
+import io
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from project_gestion import renderers
+from tasks import queries
+from tasks.bench import seed_dataset
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+
+
+class Command(BaseCommand):
+    help = "Render (and parse back) serialized Task rows with DRF's JSONRenderer and FastJSONRenderer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stderr.write("orjson is not installed: FastJSONRenderer falls back to the stdlib json module.")
+
+        with transaction.atomic():
+            projects = 10
+            seed_dataset(
+                users=50, projects=projects, members_per_project=10,
+                tasks_per_project=-(-options["rows"] // projects), seed=options["seed"], prefix="bench_renderers",
+            )
+            tasks = queries.for_list(Task.objects.filter(project__name__startswith="bench_renderers").order_by("id"))
+            data = TaskSerializer(tasks[: options["rows"]], many=True).data
+            transaction.set_rollback(True)
+        self.stdout.write(f"{len(data)} serialized tasks")
+
+        outputs = {}
+        for label, renderer, parser in (
+            ("json", JSONRenderer(), JSONParser()),
+            ("fast", renderers.FastJSONRenderer(), renderers.FastJSONParser()),
+        ):
+            outputs[label] = body = renderer.render(data)
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label} ({len(body) / 1e6:.2f} MB)"))
+            self.report("render", lambda: renderer.render(data), options["repeat"])
+            self.report("parse", lambda: parser.parse(io.BytesIO(body)), options["repeat"])
+
+        if json.loads(outputs["json"]) != json.loads(outputs["fast"]):
+            raise CommandError("The two renderers produced different documents.")
+        self.stdout.write("\nBoth renderers produced the same document.")
+
+    def report(self, name, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(f"{name}: median {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms")
+
@@ -0,0 +1,70 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from projects import access
+from tasks import queries
+from tasks.bench import seed_dataset
+from tasks.models import Task
+
+
+def legacy_visible_tasks(user):
+    # Former TaskViewSet.get_queryset filter, kept for comparison
+    return (Task.objects.filter(project__members=user) | Task.objects.filter(project__owner=user)).distinct()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the plans and timings of the legacy OR/DISTINCT task visibility filter and the one TaskViewSet "
+        "runs: project_id IN the user's cached accessible projects."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--projects", type=int, default=100)
+        parser.add_argument("--members", type=int, default=15)
+        parser.add_argument("--tasks", type=int, default=500, help="Tasks per project")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write("Seeding dataset...")
+            dataset = seed_dataset(
+                users=options["users"], projects=options["projects"],
+                members_per_project=options["members"], tasks_per_project=options["tasks"],
+                seed=options["seed"], prefix="bench_visibility",
+            )
+            self.stdout.write(f"{len(dataset.user_ids)} users, {len(dataset.project_ids)} projects, {dataset.task_count} tasks")
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+
+            user = User.objects.get(pk=dataset.members[dataset.project_ids[0]][0])
+
+            for label, build in (("legacy", legacy_visible_tasks), ("cached", queries.cached_visible_tasks)):
+                self.report(label, build(user).order_by("-updated_at", "-id"), options)
+
+            transaction.set_rollback(True)
+        # The roles cached above name rolled back projects
+        access.invalidate_users([user.id])
+
+    def report(self, label, queryset, options):
+        page = queryset[: options["page_size"]]
+        explain = {"analyze": True} if connection.vendor == "postgresql" else {}
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label}"))
+        self.stdout.write(page.explain(**explain))
+
+        for name, run in (("page", lambda: list(page.all())), ("count", queryset.count)):
+            timings = []
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(
+                f"{name}: median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms"
+            )
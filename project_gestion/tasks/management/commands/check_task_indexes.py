@@ -0,0 +1,96 @@
+import re
+from itertools import combinations
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tasks.bench import load_dataset
+from tasks.models import Task
+from tasks.queries import open_due
+from tasks.views import TaskViewSet
+
+CHECKED_TABLES = (Task._meta.db_table, Task.assignees.through._meta.db_table)
+PAGE_SIZE = 50
+
+
+def sequential_scans(queryset):
+    """Tables of CHECKED_TABLES the plan reads in full, with the plan itself."""
+    plan = queryset.explain()
+    if connection.vendor == "postgresql":
+        scanned = re.findall(r"Seq Scan on (\w+)", plan)
+    else:
+        # SQLite: "SCAN table" without "USING ... INDEX" reads every row
+        scanned = [m.group(1) for m in re.finditer(r"\bSCAN (\w+)(?! .*USING)", plan)]
+    return sorted({table for table in scanned if table in CHECKED_TABLES}), plan
+
+
+def list_queryset(user, params):
+    """The page query TaskViewSet.list runs for these query parameters."""
+    request = APIRequestFactory().get("/api/tasks/", params)
+    force_authenticate(request, user=user)
+    view = TaskViewSet(action_map={"get": "list"}, kwargs={}, format_kwarg=None)
+    view.request = view.initialize_request(request)
+    return view.get_queryset()[: PAGE_SIZE + 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN every filter combination TaskViewSet.list supports (and the due date queries) against "
+        "a seed_bench dataset; fail if any of them scans the task or assignee tables sequentially."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prefix", default="bench", help="Dataset created by seed_bench.")
+        parser.add_argument(
+            "--assume-large", action="store_true",
+            help="PostgreSQL: plan with enable_seqscan off, i.e. check that an index can serve each query "
+                 "even when the seeded tables are small enough for a sequential scan to win.",
+        )
+        parser.add_argument("--verbose-plans", action="store_true")
+
+    def handle(self, *args, **options):
+        dataset = load_dataset(options["prefix"])
+        if not dataset.project_ids:
+            raise CommandError(f"No '{options['prefix']}' dataset, run seed_bench first.")
+        project_id = max(dataset.project_ids, key=lambda p: len(dataset.members[p]))
+        user = User.objects.get(id=dataset.members[project_id][0])
+
+        filters = {
+            "project_id": project_id,
+            "status": Task.Status.IN_PROGRESS,
+            "priority": Task.Priority.HIGH,
+            "assignee": dataset.members[project_id][-1],
+        }
+        shapes = [
+            (", ".join(names) or "(no filter)", list_queryset(user, {name: filters[name] for name in names}))
+            for size in range(len(filters) + 1)
+            for names in combinations(filters, size)
+        ]
+        dated = Task.objects.filter(project_id=project_id, due_date__isnull=False)
+        shapes += [
+            ("dated tasks by due date", dated.order_by("due_date", "id")[:PAGE_SIZE]),
+            ("open tasks by due date", dated.exclude(status=Task.Status.DONE).order_by("due_date")[:PAGE_SIZE]),
+            ("overdue sweep batch", open_due(Task.objects.all(), timezone.localdate()).order_by("due_date", "id")[:PAGE_SIZE]),
+        ]
+
+        failures = []
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+                if options["assume_large"] and connection.vendor == "postgresql":
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+            for label, queryset in shapes:
+                scanned, plan = sequential_scans(queryset)
+                status = self.style.ERROR(f"seq scan on {', '.join(scanned)}") if scanned else self.style.SUCCESS("ok")
+                self.stdout.write(f"{label:<45} {status}")
+                if options["verbose_plans"] or scanned:
+                    self.stdout.write(plan + "\n")
+                if scanned:
+                    failures.append(label)
+
+        if failures:
+            raise CommandError(f"{len(failures)} of {len(shapes)} queries scan a task table sequentially.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(shapes)} queries use indexes."))
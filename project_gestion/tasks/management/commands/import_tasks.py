@@ -0,0 +1,52 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.models import Project
+from tasks import imports
+
+
+class Command(BaseCommand):
+    help = "Import tasks into a project from a CSV or NDJSON file (the export formats), in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for standard input.")
+        parser.add_argument("--project", type=int, required=True)
+        parser.add_argument("--user", required=True, help="Username recorded as the creator of the tasks.")
+        parser.add_argument("--format", choices=sorted(imports.PARSERS), help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=imports.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.get(id=options["project"])
+            user = User.objects.get(username=options["user"])
+        except (Project.DoesNotExist, User.DoesNotExist) as exc:
+            raise CommandError(exc)
+
+        path = options["path"]
+        format = options["format"] or path.rpartition(".")[2]
+        if format not in imports.PARSERS:
+            raise CommandError("Cannot guess the format, use --format.")
+
+        printed = 0
+
+        def progress(report):
+            nonlocal printed
+            for error in report.errors[printed:]:
+                self.stderr.write(f"line {error['line']}: {error['errors']}")
+            printed = len(report.errors)
+            self.stdout.write(f"{report.rows} rows read, {report.created} created, {report.failed} rejected")
+
+        stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+        with stream:
+            importer = imports.TaskImporter(user, project, chunk_size=options["chunk_size"], on_progress=progress)
+            report = importer.run(imports.PARSERS[format](stream))
+        if report.failed > len(report.errors):
+            self.stderr.write(f"{report.failed - len(report.errors)} more rejected rows not shown.")
+        if not report.complete:
+            raise CommandError(
+                f"The file cannot be read to the end: {report.created} tasks were imported into project "
+                f"{project.id} before the line it stopped at."
+            )
+        self.stdout.write(self.style.SUCCESS(f"{report.created} tasks imported into project {project.id}."))
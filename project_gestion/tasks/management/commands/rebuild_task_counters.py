@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tasks import counters
+
+
+class Command(BaseCommand):
+    help = "Recount the per-project task counters from the task table and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, action="append", dest="projects", help="Only these project ids (repeatable).")
+
+    def handle(self, *args, **options):
+        fixed = counters.rebuild(options["projects"])
+        self.stdout.write(f"{fixed} counters corrected.")
@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from projects.models import Project
+from tasks.bench import seed_dataset
+
+
+class Command(BaseCommand):
+    help = "Create a synthetic benchmark dataset (users, projects, members, tasks with assignees) and keep it."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--projects", type=int, default=50)
+        parser.add_argument("--members", type=int, default=10, help="Members per project, owner included")
+        parser.add_argument("--tasks", type=int, default=200, help="Tasks per project")
+        parser.add_argument("--max-assignees", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefix", default="bench", help="Prefix of the generated usernames and project names.")
+        parser.add_argument("--flush", action="store_true", help="Delete a dataset with the same prefix first.")
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        users = User.objects.filter(username__startswith=f"{prefix}_")
+        with transaction.atomic():
+            if users.exists():
+                if not options["flush"]:
+                    raise CommandError(f"A '{prefix}' dataset already exists, use --flush to replace it.")
+                Project.objects.filter(owner__in=users).delete()
+                deleted, _ = users.delete()
+                self.stdout.write(f"Previous dataset deleted ({deleted} rows).")
+
+            dataset = seed_dataset(
+                users=options["users"], projects=options["projects"], members_per_project=options["members"],
+                tasks_per_project=options["tasks"], max_assignees=options["max_assignees"],
+                seed=options["seed"], prefix=prefix,
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(dataset.user_ids)} users, {len(dataset.project_ids)} projects, {dataset.task_count} tasks"
+            f" seeded with prefix '{prefix}'."
+        ))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_visibility_indexes'),
+        ('tasks', '0002_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'priority'], name='task_project_status_prio_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing_tasks(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    TaskCounter = apps.get_model("tasks", "TaskCounter")
+    rows = Task.objects.values("project_id", "status", "priority").annotate(n=Count("pk")).order_by()
+    TaskCounter.objects.bulk_create(
+        [TaskCounter(project_id=r["project_id"], status=r["status"], priority=r["priority"], count=r["n"]) for r in rows],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_visibility_indexes'),
+        ('tasks', '0003_visibility_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('TODO', 'To Do'), ('IN_PROGRESS', 'In Progress'), ('DONE', 'Done')], max_length=20)),
+                ('priority', models.CharField(choices=[('LOW', 'Low'), ('MEDIUM', 'Medium'), ('HIGH', 'High'), ('CRITICAL', 'Critical')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to='projects.project')),
+            ],
+            options={
+                'unique_together': {('project', 'status', 'priority')},
+            },
+        ),
+        migrations.RunPython(count_existing_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_search_vector'),
+        ('tasks', '0005_task_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Auto-created through table: ?assignee= joins it on user_id and needs task_id from the same index
+        migrations.RunSQL(
+            "CREATE INDEX task_assignee_user_task_idx ON tasks_task_assignees (user_id, task_id)",
+            "DROP INDEX task_assignee_user_task_idx",
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'updated_at', 'id'], name='task_proj_status_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'priority', 'updated_at', 'id'], name='task_proj_prio_upd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False)), fields=['project', 'due_date', 'id'], name='task_proj_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), models.Q(('status', 'DONE'), _negated=True)), fields=['project', 'due_date'], name='task_open_due_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_search_vector'),
+        ('tasks', '0006_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DueDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('overdue', models.IntegerField(default=0)),
+                ('due_soon', models.IntegerField(default=0)),
+                ('tasks', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), models.Q(('status', 'DONE'), _negated=True)), fields=['due_date', 'id'], name='task_open_due_id_idx'),
+        ),
+        migrations.AddField(
+            model_name='duedigest',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='due_digests', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='duedigest',
+            unique_together={('user', 'date')},
+        ),
+    ]
@@ -1,4 +1,6 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from projects.models import TimeStampedModel, Project
 
@@ -23,3 +25,66 @@ class Task(TimeStampedModel):
     assignees = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name="assigned_tasks", blank=True)
     due_date = models.DateField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Maintained by a database trigger on PostgreSQL (search.postgres)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="task_updated_id_idx"),
+            models.Index(fields=["project", "updated_at", "id"], name="task_project_updated_id_idx"),
+            models.Index(fields=["project", "status", "priority"], name="task_project_status_prio_idx"),
+            # ?project_id= with ?status= or ?priority=, in list order
+            models.Index(fields=["project", "status", "updated_at", "id"], name="task_proj_status_upd_idx"),
+            models.Index(fields=["project", "priority", "updated_at", "id"], name="task_proj_prio_upd_idx"),
+            # Due dates: only dated tasks, and only open ones for what is coming up or late
+            models.Index(
+                fields=["project", "due_date", "id"], name="task_proj_due_idx", condition=Q(due_date__isnull=False)
+            ),
+            models.Index(
+                fields=["project", "due_date"], name="task_open_due_idx",
+                condition=Q(due_date__isnull=False) & ~Q(status="DONE"),
+            ),
+            # ?overdue= / sweep_due_tasks across projects, walked in (due_date, id) order
+            models.Index(
+                fields=["due_date", "id"], name="task_open_due_id_idx",
+                condition=Q(due_date__isnull=False) & ~Q(status="DONE"),
+            ),
+        ]
+
+    def counter_key(self):
+        return (self.project_id, self.status, self.priority)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        task = super().from_db(db, field_names, values)
+        # What the stored row is counted as, so a save can move it between counters
+        if {"project_id", "status", "priority"} <= task.__dict__.keys():
+            task._counted_as = task.counter_key()
+        return task
+
+
+class TaskCounter(models.Model):
+    """Number of tasks of a project in one (status, priority) cell, maintained by tasks.counters."""
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="task_counters")
+    status = models.CharField(max_length=20, choices=Task.Status.choices)
+    priority = models.CharField(max_length=20, choices=Task.Priority.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("project", "status", "priority")
+
+
+class DueDigest(models.Model):
+    """One user's open assigned tasks that are overdue or due soon, as of ``date`` (written by sweep_due_tasks)."""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="due_digests")
+    date = models.DateField()
+    overdue = models.IntegerField(default=0)
+    due_soon = models.IntegerField(default=0)
+    # The earliest ones: [{id, title, project, due_date}]
+    tasks = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("user", "date")
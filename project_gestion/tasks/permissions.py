@@ -1,7 +1,8 @@
 from rest_framework import permissions
+from projects import access
 
 class IsCreatorOrProjectOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return obj.created_by == request.user or obj.project.owner == request.user
+        return obj.created_by_id == request.user.id or access.is_project_owner(request.user, obj.project_id)
@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.db.models import Prefetch
+from projects import access
+from .models import Task
+
+
+def cached_visible_tasks(user):
+    # Tasks of the projects the user owns or belongs to, without a membership query once their access is cached
+    return Task.objects.filter(project_id__in=access.accessible_project_ids(user))
+
+
+def assignees_prefetch():
+    # Only what TaskSerializer.get_assignees_info reads
+    return Prefetch("assignees", queryset=User.objects.only("id", "username").order_by("id"))
+
+
+def for_list(queryset):
+    return queryset.prefetch_related(assignees_prefetch())
+
+
+def assignee_ids(task_ids):
+    """{task id: [user ids]} for compact rows, from the through table alone."""
+    assignees = {}
+    rows = Task.assignees.through.objects.filter(task_id__in=task_ids).order_by("task_id", "user_id")
+    for task_id, user_id in rows.values_list("task_id", "user_id"):
+        assignees.setdefault(task_id, []).append(user_id)
+    return assignees
+
+
+def open_due(queryset, on_or_before):
+    """Open tasks due on or before a date: the predicate of the task_open_due_* partial indexes."""
+    return queryset.filter(due_date__lte=on_or_before).exclude(status=Task.Status.DONE)
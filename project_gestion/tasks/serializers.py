@@ -1,13 +1,16 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import Task
 from django.contrib.auth.models import User
+from realtime.events import publish_on_commit
+from project_gestion.sparse import SparseFieldsSerializerMixin
 
 class UserMinimalSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username"]
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     assignees = serializers.ListField(
         child=serializers.IntegerField(), write_only=True, required=False
     )
@@ -25,16 +28,20 @@ class TaskSerializer(serializers.ModelSerializer):
     def get_assignees_info(self, obj):
         return [{"id": u.id, "username": u.username} for u in obj.assignees.all()]
 
+    @transaction.atomic
     def create(self, validated_data):
         assignees_ids = validated_data.pop("assignees", [])
         task = Task.objects.create(**validated_data)
         users = User.objects.filter(id__in=assignees_ids)
         task.assignees.set(users)
+        publish_on_commit(task.project_id, "task.created", lambda: self.to_representation(task))
         return task
 
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         assignees_ids = validated_data.pop("assignees", None)
+        previous_project_id = instance.project_id
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -44,4 +51,7 @@ class TaskSerializer(serializers.ModelSerializer):
             users = User.objects.filter(id__in=assignees_ids)
             instance.assignees.set(users)
 
+        if previous_project_id != instance.project_id:
+            publish_on_commit(previous_project_id, "task.deleted", lambda: {"id": instance.id})
+        publish_on_commit(instance.project_id, "task.updated", lambda: self.to_representation(instance))
         return instance
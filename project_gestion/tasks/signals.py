@@ -0,0 +1,34 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from users import dashboard
+from . import counters
+from .models import Task
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, **kwargs):
+    before = None if created else getattr(instance, "_counted_as", None)
+    dashboard.invalidate_projects([instance.project_id] + ([before[0]] if before else []))
+    if before is None and not created:
+        # Saved without having been loaded: nothing tells what it was counted as
+        return
+    counters.apply(counters.moved(before, instance.counter_key()))
+    instance._counted_as = instance.counter_key()
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    counters.apply(counters.moved(getattr(instance, "_counted_as", instance.counter_key()), None))
+    dashboard.invalidate_projects([instance.project_id])
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def invalidate_assignee_dashboards(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            dashboard.invalidate_projects([instance.project_id])
+    elif action in ("post_add", "post_remove"):
+        # user.assigned_tasks.add(...): the instance is the user, pk_set the tasks
+        dashboard.invalidate_projects(Task.objects.filter(id__in=pk_set).values_list("project_id", flat=True))
+    elif action == "pre_clear":
+        dashboard.invalidate_projects(instance.assigned_tasks.values_list("project_id", flat=True))
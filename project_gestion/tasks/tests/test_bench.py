@@ -0,0 +1,61 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from tasks import bench
+from tasks.models import Task
+
+
+class BenchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def seed(self):
+        call_command("seed_bench", users=12, projects=3, members=4, tasks=6, stdout=io.StringIO())
+
+    def test_seed_and_load(self):
+        self.seed()
+        dataset = bench.load_dataset()
+        self.assertEqual((len(dataset.user_ids), len(dataset.project_ids), dataset.task_count), (12, 3, 18))
+        with self.assertRaises(CommandError):
+            self.seed()
+        call_command("seed_bench", users=5, projects=1, members=2, tasks=2, flush=True, stdout=io.StringIO())
+        self.assertEqual(bench.load_dataset().task_count, 2)
+
+    def test_run_every_scenario(self):
+        self.seed()
+        tasks = Task.objects.count()
+        results = bench.ApiBenchmark(bench.load_dataset(), clients=2, requests=3, warmup=1).run()
+        self.assertEqual(set(results), {scenario.name for scenario in bench.SCENARIOS})
+        for name, row in results.items():
+            self.assertEqual(row["errors"], 0, (name, row["statuses"]))
+            self.assertLessEqual(row["p50_ms"], row["p95_ms"])
+            self.assertGreater(row["queries_mean"], 0)
+        # Created tasks are removed again
+        self.assertEqual(Task.objects.count(), tasks)
+
+    def test_command_output_and_compare(self):
+        self.seed()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.json")
+            call_command("bench_api", requests=2, warmup=0, scenario=["tasks.list"], output=path, stdout=io.StringIO())
+            with open(path) as file:
+                results = json.load(file)
+            self.assertEqual(list(results["scenarios"]), ["tasks.list"])
+            self.assertEqual(results["meta"]["dataset"]["tasks"], 18)
+
+        slower = json.loads(json.dumps(results))
+        slower["scenarios"]["tasks.list"]["p95_ms"] = results["scenarios"]["tasks.list"]["p95_ms"] * 2 + 1
+        self.assertEqual([row[:2] for row in bench.compare(results, slower)], [("tasks.list", "p95_ms")])
+        self.assertEqual(bench.compare(slower, results), [])
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual((bench.percentile(values, 50), bench.percentile(values, 95)), (50, 95))
+        self.assertEqual(bench.percentile([7], 95), 7)
@@ -0,0 +1,103 @@
+# project_gestion/tasks/tests/test_bulk.py
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APITestCase
+from projects import access
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class TaskBulkTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.tutu = User.objects.create_user(username="tutu", password="tutu")
+
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        ProjectMember.objects.create(project=self.project, user=self.tata, role="member")
+        self.other = Project.objects.create(name="Projet Tutu", owner=self.tutu)
+        ProjectMember.objects.create(project=self.other, user=self.tutu, role="owner")
+
+        self.task = Task.objects.create(project=self.project, title="Tâche 1", created_by=self.toto)
+        self.client.force_authenticate(user=self.toto)
+
+    def bulk(self, operations, mode="atomic"):
+        return self.client.post("/api/tasks/bulk/", {"mode": mode, "operations": operations}, format="json")
+
+    def test_bulk_mixed_operations(self):
+        doomed = Task.objects.create(project=self.project, title="À supprimer", created_by=self.toto)
+        response = self.bulk([
+            {"op": "create", "data": {"project": self.project.id, "title": "Nouvelle", "assignees": [self.tata.id, 9999]}},
+            {"op": "update", "id": self.task.id, "data": {"title": "Modifiée", "assignees": [self.toto.id]}},
+            {"op": "delete", "id": doomed.id},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["applied"])
+        self.assertEqual([r["status"] for r in response.data["results"]], ["ok", "ok", "ok"])
+
+        created = Task.objects.get(id=response.data["results"][0]["id"])
+        self.assertEqual(created.created_by, self.toto)
+        self.assertEqual(list(created.assignees.values_list("id", flat=True)), [self.tata.id])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Modifiée")
+        self.assertEqual(list(self.task.assignees.values_list("id", flat=True)), [self.toto.id])
+        self.assertFalse(Task.objects.filter(id=doomed.id).exists())
+
+    def test_bulk_move_status(self):
+        tasks = [Task.objects.create(project=self.project, title=f"T{i}", created_by=self.toto) for i in range(5)]
+        before = {t.id: t.updated_at for t in tasks}
+        access.get_project_roles(self.toto)
+        with self.assertNumQueries(8):
+            response = self.bulk([{"op": "move", "id": t.id, "status": "DONE"} for t in tasks])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for task in Task.objects.filter(id__in=before):
+            self.assertEqual(task.status, "DONE")
+            self.assertGreater(task.updated_at, before[task.id])
+
+    def test_bulk_atomic_rejects_everything(self):
+        response = self.bulk([
+            {"op": "update", "id": self.task.id, "data": {"title": "Modifiée"}},
+            {"op": "create", "data": {"project": self.other.id, "title": "Intrusion"}},
+            {"op": "move", "id": 9999, "status": "DONE"},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data["applied"])
+        self.assertEqual([r["status"] for r in response.data["results"]], ["skipped", "error", "error"])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Tâche 1")
+        self.assertFalse(Task.objects.filter(title="Intrusion").exists())
+
+    def test_bulk_best_effort_applies_valid_items(self):
+        response = self.bulk([
+            {"op": "update", "id": self.task.id, "data": {"title": "Modifiée"}},
+            {"op": "create", "data": {"project": self.project.id}},
+            {"op": "frobnicate"},
+        ], mode="best_effort")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["status"] for r in response.data["results"]], ["ok", "error", "error"])
+        self.assertIn("title", response.data["results"][1]["errors"])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Modifiée")
+
+    def test_bulk_requires_creator_or_owner(self):
+        self.client.force_authenticate(user=self.tata)
+        response = self.bulk([{"op": "delete", "id": self.task.id}], mode="best_effort")
+        self.assertEqual(response.data["results"][0]["status"], "error")
+        self.assertTrue(Task.objects.filter(id=self.task.id).exists())
+
+    def test_bulk_duplicate_task_reference(self):
+        response = self.bulk([
+            {"op": "move", "id": self.task.id, "status": "DONE"},
+            {"op": "delete", "id": self.task.id},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["results"][1]["status"], "error")
+
+    def test_bulk_empty_operations(self):
+        response = self.bulk([])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
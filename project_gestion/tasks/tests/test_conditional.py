@@ -0,0 +1,96 @@
+# project_gestion/tasks/tests/test_conditional.py
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class ConditionalRequestTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        self.task = Task.objects.create(project=self.project, title="Tâche 1", created_by=self.toto)
+        self.client.force_authenticate(user=self.toto)
+
+    def test_task_list_not_modified(self):
+        response = self.client.get("/api/tasks/")
+        etag = response["ETag"]
+        self.assertNotIn("Last-Modified", response)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_task_list_etag_changes(self):
+        etag = self.client.get("/api/tasks/")["ETag"]
+
+        Task.objects.create(project=self.project, title="Tâche 2", created_by=self.toto)
+        response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response["ETag"]
+        self.task.delete()
+        response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_task_list_deletion_is_not_a_304(self):
+        latest = Task.objects.create(project=self.project, title="Tâche 2", created_by=self.toto)
+        # What the list's max(updated_at) was, and still is after the deletion
+        since = http_date(latest.updated_at.timestamp() + 1)
+        self.task.delete()
+        response = self.client.get("/api/tasks/", HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_task_list_without_count_skips_the_aggregate(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/tasks/?count=false")
+        self.assertNotIn("ETag", response)
+        self.assertFalse([q for q in ctx.captured_queries if "COUNT(" in q["sql"]])
+
+    def test_task_list_etag_depends_on_filters(self):
+        etag = self.client.get("/api/tasks/")["ETag"]
+        response = self.client.get("/api/tasks/?status=DONE", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_task_detail_not_modified(self):
+        response = self.client.get(f"/api/tasks/{self.task.id}/")
+        response = self.client.get(f"/api/tasks/{self.task.id}/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_task_update_if_match(self):
+        etag = self.client.get(f"/api/tasks/{self.task.id}/")["ETag"]
+
+        response = self.client.patch(f"/api/tasks/{self.task.id}/", {"title": "A"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        response = self.client.patch(f"/api/tasks/{self.task.id}/", {"title": "B"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "A")
+
+    def test_task_delete_if_match(self):
+        response = self.client.delete(f"/api/tasks/{self.task.id}/", HTTP_IF_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertTrue(Task.objects.filter(id=self.task.id).exists())
+
+    def test_project_detail_and_list(self):
+        response = self.client.get(f"/api/projects/{self.project.id}/")
+        response = self.client.get(f"/api/projects/{self.project.id}/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        etag = self.client.get("/api/projects/")["ETag"]
+        self.client.patch(f"/api/projects/{self.project.id}/", {"name": "Renommé"}, format="json")
+        response = self.client.get("/api/projects/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,156 @@
+# project_gestion/tasks/tests/test_counters.py
+import random
+import threading
+import time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from projects.models import Project, ProjectMember
+from tasks import counters
+from tasks.models import Task, TaskCounter
+
+User = get_user_model()
+
+
+class TaskCounterTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        self.other = Project.objects.create(name="Projet Bis", owner=self.toto)
+        ProjectMember.objects.create(project=self.other, user=self.toto, role="owner")
+        self.client.force_authenticate(user=self.toto)
+
+    def stats(self, project=None):
+        response = self.client.get(f"/api/projects/{(project or self.project).id}/stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_counters_follow_task_writes(self):
+        response = self.client.post("/api/tasks/", {"project": self.project.id, "title": "A", "priority": "HIGH"}, format="json")
+        task_id = response.data["id"]
+        self.client.post("/api/tasks/", {"project": self.project.id, "title": "B"}, format="json")
+
+        stats = self.stats()
+        self.assertEqual(stats["total"], 2)
+        self.assertEqual(stats["status"], {"TODO": 2, "IN_PROGRESS": 0, "DONE": 0})
+        self.assertEqual(stats["priority"], {"LOW": 0, "MEDIUM": 1, "HIGH": 1, "CRITICAL": 0})
+
+        self.client.patch(f"/api/tasks/{task_id}/", {"status": "DONE"}, format="json")
+        self.assertEqual(self.stats()["status"], {"TODO": 1, "IN_PROGRESS": 0, "DONE": 1})
+
+        self.client.patch(f"/api/tasks/{task_id}/", {"project": self.other.id}, format="json")
+        self.assertEqual(self.stats()["total"], 1)
+        self.assertEqual(self.stats(self.other)["status"]["DONE"], 1)
+
+        self.client.delete(f"/api/tasks/{task_id}/")
+        self.assertEqual(self.stats(self.other)["total"], 0)
+
+    def test_counters_follow_bulk_writes(self):
+        tasks = [Task.objects.create(project=self.project, title=f"T{i}", created_by=self.toto) for i in range(3)]
+        self.client.post("/api/tasks/bulk/", {"operations": [
+            {"op": "create", "data": {"project": self.project.id, "title": "N", "priority": "LOW"}},
+            {"op": "move", "id": tasks[0].id, "status": "IN_PROGRESS"},
+            {"op": "update", "id": tasks[1].id, "data": {"project": self.other.id}},
+            {"op": "delete", "id": tasks[2].id},
+        ]}, format="json")
+
+        stats = self.stats()
+        self.assertEqual(stats["total"], 2)
+        self.assertEqual(stats["status"], {"TODO": 1, "IN_PROGRESS": 1, "DONE": 0})
+        self.assertEqual(stats["priority"]["LOW"], 1)
+        self.assertEqual(self.stats(self.other)["total"], 1)
+
+    def test_stats_read_is_constant(self):
+        for i in range(20):
+            Task.objects.create(project=self.project, title=f"T{i}", status=["TODO", "DONE"][i % 2], created_by=self.toto)
+        with self.assertNumQueries(2):
+            stats = self.stats()
+        self.assertEqual(stats["status"]["DONE"], 10)
+
+    def test_stats_embedded_on_request(self):
+        Task.objects.create(project=self.project, title="T", created_by=self.toto)
+        response = self.client.get("/api/projects/")
+        self.assertNotIn("stats", response.data["results"][0])
+
+        response = self.client.get("/api/projects/?stats=true")
+        stats = {p["id"]: p["stats"]["total"] for p in response.data["results"]}
+        self.assertEqual(stats, {self.project.id: 1, self.other.id: 0})
+
+        etag = self.client.get(f"/api/projects/{self.project.id}/?stats=true")["ETag"]
+        Task.objects.create(project=self.project, title="T2", created_by=self.toto)
+        response = self.client.get(f"/api/projects/{self.project.id}/?stats=true", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["stats"]["total"], 2)
+
+    def test_rebuild_command_repairs_drift(self):
+        Task.objects.create(project=self.project, title="T", created_by=self.toto)
+        Task.objects.filter(project=self.project).update(status="DONE")
+        TaskCounter.objects.create(project=self.other, status="TODO", priority="LOW", count=3)
+
+        out = StringIO()
+        call_command("rebuild_task_counters", stdout=out)
+        self.assertEqual(out.getvalue().strip(), "3 counters corrected.")
+        self.assertEqual(self.stats()["status"], {"TODO": 0, "IN_PROGRESS": 0, "DONE": 1})
+        self.assertEqual(self.stats(self.other)["total"], 0)
+
+
+class ConcurrentCounterTests(TransactionTestCase):
+    THREADS = 3
+    OPERATIONS = 15
+
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        self.tasks = [Task.objects.create(project=self.project, title=f"T{i}", created_by=self.toto) for i in range(2)]
+
+    def operation(self, client, rng):
+        # Every write starts from the same rows: a stale read of their status would move the wrong cell
+        task, new_status = rng.choice(self.tasks), rng.choice(Task.Status.values)
+        if rng.random() < 0.5:
+            response = client.patch(f"/api/tasks/{task.id}/", {"status": new_status}, format="json")
+        else:
+            response = client.post("/api/tasks/bulk/", {"operations": [
+                {"op": "move", "id": task.id, "status": new_status},
+            ]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def worker(self, seed, errors):
+        rng = random.Random(seed)
+        client = APIClient()
+        client.force_authenticate(user=self.toto)
+        deadline = time.monotonic() + 60
+        try:
+            for _ in range(self.OPERATIONS):
+                while True:
+                    try:
+                        self.operation(client, rng)
+                        break
+                    except OperationalError as error:
+                        # SQLite fails instead of waiting for the lock: try again
+                        if "locked" not in str(error) or time.monotonic() > deadline:
+                            raise
+                        time.sleep(rng.random() * 0.02)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            connection.close()
+
+    def test_parallel_updates_keep_counters_exact(self):
+        errors = []
+        threads = [threading.Thread(target=self.worker, args=(seed, errors)) for seed in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(counters.rebuild([self.project.id]), 0)
@@ -0,0 +1,104 @@
+import io
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from projects.models import Project, ProjectMember
+from tasks.models import DueDigest, Task
+
+
+class DueDateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        ProjectMember.objects.create(project=self.project, user=self.tata, role="member")
+
+        def task(title, days, status="TODO", assignees=()):
+            due = None if days is None else self.today + timedelta(days=days)
+            task = Task.objects.create(project=self.project, title=title, due_date=due, status=status, created_by=self.toto)
+            task.assignees.set(assignees)
+            return task
+
+        self.late = task("En retard", -3, assignees=[self.toto, self.tata])
+        self.late_done = task("En retard terminée", -2, status="DONE", assignees=[self.toto])
+        self.yesterday = task("Hier", -1, status="IN_PROGRESS", assignees=[self.toto])
+        self.today_task = task("Aujourd'hui", 0, assignees=[self.tata])
+        self.soon = task("Bientôt", 2, assignees=[self.toto])
+        self.later = task("Plus tard", 10, assignees=[self.toto])
+        self.undated = task("Sans échéance", None, assignees=[self.toto])
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.toto)
+
+    def titles(self, query):
+        response = self.client.get(f"/api/tasks/?{query}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["title"] for row in response.data["results"]]
+
+    def test_due_filters(self):
+        soon = (self.today + timedelta(days=2)).isoformat()
+        self.assertEqual(
+            self.titles(f"due_before={soon}"),
+            ["En retard", "En retard terminée", "Hier", "Aujourd'hui", "Bientôt"],
+        )
+        self.assertEqual(self.titles(f"due_after={self.today.isoformat()}"), ["Aujourd'hui", "Bientôt", "Plus tard"])
+        self.assertEqual(self.titles(f"due_after={self.today.isoformat()}&due_before={soon}"), ["Aujourd'hui", "Bientôt"])
+
+    def test_overdue(self):
+        self.assertEqual(self.titles("overdue=true"), ["En retard", "Hier"])
+        self.assertEqual(self.titles("overdue=true&assignee=%d" % self.tata.id), ["En retard"])
+        self.assertEqual(len(self.titles("overdue=false")), 7)
+
+    def test_pages_follow_due_date(self):
+        first = self.client.get("/api/tasks/?overdue=1&page_size=1")
+        second = self.client.get(first.data["next"])
+        self.assertEqual([row["title"] for row in first.data["results"] + second.data["results"]], ["En retard", "Hier"])
+        self.assertIsNone(second.data["next"])
+
+    def test_invalid_date(self):
+        response = self.client.get("/api/tasks/?due_before=demain")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("due_before", response.data)
+
+    def sweep(self, **options):
+        out = io.StringIO()
+        call_command("sweep_due_tasks", stdout=out, **options)
+        return out.getvalue()
+
+    def test_sweep(self):
+        out = self.sweep(batch_size=2)
+        self.assertIn(f"2 digests written for {self.today}", out)
+
+        toto = DueDigest.objects.get(user=self.toto, date=self.today)
+        self.assertEqual((toto.overdue, toto.due_soon), (2, 1))
+        self.assertEqual([task["id"] for task in toto.tasks], [self.late.id, self.yesterday.id, self.soon.id])
+        self.assertEqual(toto.tasks[0]["due_date"], self.late.due_date.isoformat())
+        tata = DueDigest.objects.get(user=self.tata, date=self.today)
+        self.assertEqual((tata.overdue, tata.due_soon), (1, 1))
+
+        # Batch size changes nothing
+        self.sweep(batch_size=1000)
+        self.assertEqual(DueDigest.objects.get(user=self.toto).tasks, toto.tasks)
+
+    def test_sweep_replaces_and_prunes(self):
+        DueDigest.objects.create(user=self.toto, date=self.today - timedelta(days=31))
+        DueDigest.objects.create(user=self.tata, date=self.today - timedelta(days=5))
+        self.sweep()
+        self.sweep(days=0)
+
+        self.assertEqual(DueDigest.objects.filter(date=self.today).count(), 2)
+        self.assertEqual(DueDigest.objects.get(user=self.toto, date=self.today).due_soon, 0)
+        self.assertEqual(DueDigest.objects.filter(date__lt=self.today).count(), 1)
+
+    def test_sweep_dry_run(self):
+        self.assertIn("Dry run: 2 digests not written.", self.sweep(dry_run=True))
+        self.assertFalse(DueDigest.objects.exists())
@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from projects.models import Project, ProjectMember
+from tasks import export
+from tasks.models import Task
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.tutu = User.objects.create_user(username="tutu", password="tutu")
+        self.project = Project.objects.create(name="Projet Toto", description="Export", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        ProjectMember.objects.create(project=self.project, user=self.tata, role="member")
+        self.tasks = [
+            Task.objects.create(project=self.project, title=f"Tâche {i}", description="a, \"b\"\nc", created_by=self.toto)
+            for i in range(5)
+        ]
+        self.tasks[0].assignees.set([self.toto, self.tata])
+        self.tasks[3].assignees.set([self.tata])
+        self.url = f"/api/projects/{self.project.id}/export/"
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.toto)
+
+    def read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn(f"project-{self.project.id}.ndjson", response["Content-Disposition"])
+        lines = [json.loads(line) for line in self.read(response).splitlines()]
+
+        self.assertEqual(lines[0]["type"], "project")
+        self.assertEqual(lines[0]["name"], "Projet Toto")
+        self.assertEqual(
+            [(line["username"], line["role"]) for line in lines if line["type"] == "member"],
+            [("toto", "owner"), ("tata", "member")],
+        )
+        tasks = [line for line in lines if line["type"] == "task"]
+        self.assertEqual([task["id"] for task in tasks], [task.id for task in self.tasks])
+        self.assertEqual([user["username"] for user in tasks[0]["assignees"]], ["toto", "tata"])
+        self.assertEqual(tasks[1]["assignees"], [])
+        self.assertEqual(tasks[0]["description"], "a, \"b\"\nc")
+
+    def test_csv(self):
+        response = self.client.get(self.url, {"format": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual([int(row["id"]) for row in rows], [task.id for task in self.tasks])
+        self.assertEqual(rows[0]["assignees"], "toto;tata")
+        self.assertEqual(rows[3]["assignees"], "tata")
+        self.assertEqual(rows[0]["description"], "a, \"b\"\nc")
+        self.assertEqual(rows[0]["due_date"], "")
+
+    def test_accept_header(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="text/csv")
+        self.assertTrue(self.read(response).startswith("id,title,"))
+
+    def test_queries_per_chunk(self):
+        # Project, access roles (2), members, one task read, then one assignee prefetch per chunk
+        with mock.patch.object(export, "CHUNK_SIZE", 2):
+            with self.assertNumQueries(8):
+                self.read(self.client.get(self.url))
+
+    async def test_asgi_streams_asynchronously(self):
+        token = AccessToken.for_user(self.toto)
+        response = await self.async_client.get(self.url, {"format": "csv"}, headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(body)))), len(self.tasks))
+
+    def test_requires_membership(self):
+        self.client.force_authenticate(user=self.tutu)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unknown_format(self):
+        response = self.client.get(self.url, {"format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,149 @@
+import io
+import json
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from projects.models import Project, ProjectMember
+from tasks import counters, imports
+from tasks.models import Task, TaskCounter
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.tutu = User.objects.create_user(username="tutu", password="tutu")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        ProjectMember.objects.create(project=self.project, user=self.tata, role="member")
+        self.url = f"/api/projects/{self.project.id}/import/"
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.toto)
+
+    def post(self, body, content_type):
+        return self.client.generic("POST", self.url, body.encode(), content_type=content_type)
+
+    def test_csv(self):
+        body = (
+            "title,description,status,priority,due_date,assignees\n"
+            f"Première,\"multi\nligne\",DONE,HIGH,2025-01-31,toto;{self.tata.id}\n"
+            "Seconde,,,,,\n"
+        )
+        response = self.post(body, "text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"rows": 2, "created": 2, "failed": 0, "errors": [], "complete": True})
+
+        first, second = Task.objects.filter(project=self.project).order_by("id")
+        self.assertEqual(first.description, "multi\nligne")
+        self.assertEqual((first.status, first.priority, str(first.due_date)), ("DONE", "HIGH", "2025-01-31"))
+        self.assertEqual(set(first.assignees.values_list("username", flat=True)), {"toto", "tata"})
+        self.assertEqual((second.status, second.priority, second.description), ("TODO", "MEDIUM", ""))
+        self.assertEqual(second.created_by, self.toto)
+
+    def test_ndjson_reports_row_errors(self):
+        lines = [
+            {"type": "project", "id": 1, "name": "ignored"},
+            {"type": "task", "title": "Ok", "assignees": [{"id": self.tata.id, "username": "tata"}]},
+            {"type": "task", "title": "", "status": "NOPE"},
+            {"type": "task", "title": "Inconnu", "assignees": ["personne"]},
+        ]
+        body = "\n".join(json.dumps(line) for line in lines) + "\n{broken\n"
+        response = self.post(body, "application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["rows"], response.data["created"], response.data["failed"]), (4, 1, 3))
+        self.assertEqual([error["line"] for error in response.data["errors"]], [3, 4, 5])
+        self.assertEqual(set(response.data["errors"][0]["errors"]), {"title", "status"})
+        self.assertIn("personne", response.data["errors"][1]["errors"]["assignees"])
+        self.assertEqual(list(Task.objects.get(title="Ok").assignees.all()), [self.tata])
+
+    def test_counters_and_search_follow(self):
+        body = "\n".join(json.dumps({"title": f"Migration {i}", "status": "DONE"}) for i in range(5))
+        self.post(body, "application/x-ndjson")
+        self.assertEqual(TaskCounter.objects.get(project=self.project, status="DONE", priority="MEDIUM").count, 5)
+        self.assertEqual(counters.rebuild([self.project.id]), 0)
+        response = self.client.get("/api/tasks/", {"q": "migration"})
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_export_round_trip(self):
+        task = Task.objects.create(project=self.project, title="Export", created_by=self.toto)
+        task.assignees.set([self.tata])
+        exported = b"".join(self.client.get(f"/api/projects/{self.project.id}/export/").streaming_content)
+        response = self.post(exported.decode(), "application/x-ndjson")
+        self.assertEqual(response.data["created"], 1)
+        copy = Task.objects.exclude(id=task.id).get()
+        self.assertEqual((copy.title, list(copy.assignees.all())), ("Export", [self.tata]))
+
+    def test_csv_not_utf8_stops_the_import(self):
+        body = "title\nUn\nDeux\nÉté\nQuatre\n".encode("latin-1")
+        report = imports.TaskImporter(self.toto, self.project, chunk_size=2).run(imports.parse_csv(io.BytesIO(body)))
+        self.assertFalse(report.complete)
+        self.assertEqual((report.rows, report.created, report.failed), (3, 2, 1))
+        self.assertEqual(report.errors[0]["line"], 4)
+        self.assertIn("UTF-8", report.errors[0]["errors"]["detail"])
+        self.assertEqual(Task.objects.filter(project=self.project).count(), 2)
+
+    def test_unreadable_body_imports_nothing(self):
+        body = "title\nUn\nÉté\n".encode("latin-1")
+        response = self.client.generic("POST", self.url, body, content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["line"], 3)
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(TaskCounter.objects.filter(count__gt=0).exists())
+
+    def test_command_unreadable_file(self):
+        with tempfile.NamedTemporaryFile("wb", suffix=".csv") as file:
+            file.write("title\nUn\nDeux\nÉté\n".encode("latin-1"))
+            file.flush()
+            err = io.StringIO()
+            with self.assertRaisesMessage(CommandError, "2 tasks were imported"):
+                call_command(
+                    "import_tasks", file.name, project=self.project.id, user="toto", chunk_size=2,
+                    stdout=io.StringIO(), stderr=err,
+                )
+        self.assertIn("line 4:", err.getvalue())
+
+    def test_assignee_with_digit_characters(self):
+        body = json.dumps({"title": "Exposant", "assignees": ["²", str(self.tata.id)]})
+        response = self.post(body, "application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["failed"], 1)
+        self.assertIn("²", response.data["errors"][0]["errors"]["assignees"])
+
+    def test_queries_per_chunk(self):
+        rows = [(i, {"title": f"T{i}", "assignees": ["toto", "tata"]}) for i in range(6)]
+        importer = imports.TaskImporter(self.toto, self.project, chunk_size=3)
+        # Per chunk: assignees lookup, savepoint pair, tasks and links inserts, counter update and
+        # two search index queries; the first chunk also creates the counter cell (2 more)
+        with self.assertNumQueries(18):
+            report = importer.run(rows)
+        self.assertEqual(report.created, 6)
+
+    def test_requires_membership(self):
+        self.client.force_authenticate(user=self.tutu)
+        response = self.post("title\nNon\n", "text/csv")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Task.objects.exists())
+
+    def test_unsupported_media_type(self):
+        response = self.post("<tasks/>", "application/xml")
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write("title,assignees\nUn,tata\nDeux,personne\nTrois,\n")
+            file.flush()
+            out, err = io.StringIO(), io.StringIO()
+            call_command(
+                "import_tasks", file.name, project=self.project.id, user="toto", chunk_size=2, stdout=out, stderr=err
+            )
+        self.assertIn("2 rows read, 1 created, 1 rejected", out.getvalue())
+        self.assertIn("2 tasks imported", out.getvalue())
+        self.assertIn("line 3:", err.getvalue())
+        self.assertEqual(Task.objects.filter(project=self.project).count(), 2)
@@ -0,0 +1,24 @@
+import io
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from tasks.management.commands.check_task_indexes import sequential_scans
+from tasks.models import Task
+
+
+class IndexCheckTests(TestCase):
+    def test_every_filter_combination_uses_an_index(self):
+        call_command("seed_bench", users=40, projects=8, members=6, tasks=50, stdout=io.StringIO())
+        out = io.StringIO()
+        call_command("check_task_indexes", stdout=out)
+        self.assertIn("All 19 queries use indexes.", out.getvalue())
+
+    def test_sequential_scan_is_reported(self):
+        scanned, plan = sequential_scans(Task.objects.filter(title="Tâche"))
+        self.assertEqual(scanned, [Task._meta.db_table], plan)
+
+    def test_requires_dataset(self):
+        with self.assertRaises(CommandError):
+            call_command("check_task_indexes", prefix="missing", stdout=io.StringIO())
@@ -0,0 +1,72 @@
+# project_gestion/tasks/tests/test_queries.py
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+
+User = get_user_model()
+
+
+class QueryCountMixin:
+    """Asserts that a request costs the same number of queries whatever the row count."""
+
+    def count_queries(self, method, url, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url, **kwargs)
+        self.assertLess(response.status_code, 400, response.data)
+        return len(ctx.captured_queries)
+
+    def assertConstantQueries(self, method, url, grow, steps=(1, 10, 40), **kwargs):
+        self.count_queries(method, url, **kwargs)  # warm per-user caches
+        counts = []
+        for size in steps:
+            grow(size)
+            counts.append(self.count_queries(method, url, **kwargs))
+        self.assertEqual(len(set(counts)), 1, f"query count grows with rows: {dict(zip(steps, counts))}")
+        return counts[0]
+
+
+class TaskQueryCountTests(QueryCountMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.members = [User.objects.create_user(username=f"user{i}", password="x") for i in range(3)]
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        for user in self.members:
+            ProjectMember.objects.create(project=self.project, user=user)
+        self.client.force_authenticate(user=self.toto)
+
+    def add_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(project=self.project, title=f"Tâche {i}", created_by=self.toto)
+            task.assignees.set(self.members[: i % 3 + 1])
+
+    def test_list_query_count_is_constant(self):
+        self.assertConstantQueries("get", "/api/tasks/?page_size=500", self.add_tasks)
+
+    def test_filtered_list_query_count_is_constant(self):
+        url = f"/api/tasks/?project_id={self.project.id}&assignee={self.members[0].id}&page_size=500"
+        self.assertConstantQueries("get", url, self.add_tasks)
+
+    def test_detail_query_count_is_constant(self):
+        task = Task.objects.create(project=self.project, title="Détail", created_by=self.toto)
+
+        def grow(size):
+            task.assignees.add(*[User.objects.create_user(username=f"extra{task.assignees.count()}-{i}") for i in range(size)])
+
+        self.assertConstantQueries("get", f"/api/tasks/{task.id}/", grow)
+
+    def test_detail_assignees_info(self):
+        task = Task.objects.create(project=self.project, title="Détail", created_by=self.toto)
+        task.assignees.set(self.members)
+        response = self.client.get(f"/api/tasks/{task.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["assignees_info"],
+            [{"id": u.id, "username": u.username} for u in self.members],
+        )
@@ -1,5 +1,9 @@
 # project_gestion/tasks/tests/test_tasks.py
+import base64
+import json
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.test import APITestCase
 from projects.models import Project, ProjectMember
@@ -9,6 +13,7 @@ User = get_user_model()
 
 class TaskTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.toto = User.objects.create_user(username="toto", password="toto")
         self.tata = User.objects.create_user(username="tata", password="tata")
         self.tutu = User.objects.create_user(username="tutu", password="tutu")
@@ -94,19 +99,19 @@ class TaskTests(APITestCase):
         self.client.force_authenticate(user=self.toto)
         response = self.client.get(f"/api/tasks/?project_id={self.project.id}")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(all(t["project"] == self.project.id for t in response.data))
+        self.assertTrue(all(t["project"] == self.project.id for t in response.data["results"]))
 
     def test_filter_tasks_by_status(self):
         self.client.force_authenticate(user=self.toto)
         response = self.client.get(f"/api/tasks/?status=TODO")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(all(t["status"] == "TODO" for t in response.data))
+        self.assertTrue(all(t["status"] == "TODO" for t in response.data["results"]))
 
     def test_filter_tasks_by_assignee(self):
         self.client.force_authenticate(user=self.toto)
         response = self.client.get(f"/api/tasks/?assignee={self.tutu.id}")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        for t in response.data:
+        for t in response.data["results"]:
             self.assertIn(self.tutu.id, [a["id"] for a in t["assignees_info"]])
 
     def test_filter_tasks_by_priority(self):
@@ -115,4 +120,76 @@ class TaskTests(APITestCase):
         self.task.save()
         response = self.client.get(f"/api/tasks/?priority=HIGH")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(all(t["priority"] == "HIGH" for t in response.data))
+        self.assertTrue(all(t["priority"] == "HIGH" for t in response.data["results"]))
+
+    # VISIBILITY
+    def test_list_tasks_only_visible_projects(self):
+        other = Project.objects.create(name="Autre projet", owner=self.tata)
+        Task.objects.create(project=other, title="Cachée", created_by=self.tata)
+        self.client.force_authenticate(user=self.tutu)
+        response = self.client.get("/api/tasks/")
+        self.assertEqual([t["id"] for t in response.data["results"]], [self.task.id])
+
+    def test_list_tasks_owner_without_membership(self):
+        owned = Project.objects.create(name="Projet sans membre", owner=self.tata)
+        task = Task.objects.create(project=owned, title="Visible", created_by=self.tata)
+        self.client.force_authenticate(user=self.tata)
+        response = self.client.get("/api/tasks/")
+        self.assertCountEqual([t["id"] for t in response.data["results"]], [self.task.id, task.id])
+
+    # PAGINATION
+    def test_list_tasks_keyset_pages(self):
+        for i in range(6):
+            Task.objects.create(project=self.project, title=f"Tâche {i + 2}", created_by=self.toto)
+        self.client.force_authenticate(user=self.toto)
+
+        seen = []
+        url = "/api/tasks/?page_size=3"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 7)
+            seen.extend(t["id"] for t in response.data["results"])
+            url = response.data["next"]
+
+        expected = list(Task.objects.order_by("-updated_at", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_list_tasks_previous_page(self):
+        for i in range(4):
+            Task.objects.create(project=self.project, title=f"Tâche {i + 2}", created_by=self.toto)
+        self.client.force_authenticate(user=self.toto)
+        first = self.client.get("/api/tasks/?page_size=2")
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(
+            [t["id"] for t in back.data["results"]],
+            [t["id"] for t in first.data["results"]],
+        )
+        self.assertIsNone(first.data["previous"])
+
+    def test_list_tasks_without_count(self):
+        self.client.force_authenticate(user=self.toto)
+        response = self.client.get("/api/tasks/?count=false")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+
+    def test_list_tasks_without_count_on_later_pages(self):
+        Task.objects.create(project=self.project, title="Tâche 2", created_by=self.toto)
+        self.client.force_authenticate(user=self.toto)
+        first = self.client.get("/api/tasks/?page_size=1&count=false")
+        self.assertIn("count=false", first.data["next"])
+        second = self.client.get(first.data["next"])
+        self.assertNotIn("count", second.data)
+        self.assertIn("count=false", second.data["previous"])
+
+    def test_list_tasks_invalid_cursor(self):
+        self.client.force_authenticate(user=self.toto)
+        response = self.client.get("/api/tasks/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        # Well formed, but not a datetime and an id
+        for position in (["abc", 1], [{"dt": "2025-01-01T00:00:00+00:00"}, "x"], [None, 1], [[1], 1]):
+            cursor = base64.urlsafe_b64encode(json.dumps({"p": position}).encode()).decode()
+            response = self.client.get("/api/tasks/", {"cursor": cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
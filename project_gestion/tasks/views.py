@@ -1,23 +1,45 @@
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import viewsets, permissions
-from .models import Task
+from rest_framework import status as http_status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from .serializers import TaskSerializer
+from .bulk import BulkRequestSerializer, TaskBulkProcessor
+from . import queries
 from .permissions import IsCreatorOrProjectOwner
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from project_gestion.pagination import KeysetPagination
+from project_gestion.conditional import ConditionalRequestMixin
+from project_gestion.replicas import ReplicaReadMixin
+from project_gestion.sparse import SparseFieldsMixin
+from projects import access
+from realtime.events import publish_on_commit
+from search import engine as search
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ReplicaReadMixin, ConditionalRequestMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated, IsCreatorOrProjectOwner]
+    pagination_class = KeysetPagination
+    # Board cards: ?view=compact
+    compact_fields = {"id": "id", "project": "project_id", "title": "title", "status": "status", "priority": "priority"}
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Task.objects.filter(
-            project__members=user
-        ) | Task.objects.filter(project__owner=user)
+        queryset = queries.cached_visible_tasks(user)
+        if self.action in ("update", "partial_update", "destroy"):
+            # Locked until the write commits: the counters move the task out of the cell it is really in
+            queryset = queryset.select_for_update(of=("self",))
 
         project_id = self.request.query_params.get("project_id")
         status = self.request.query_params.get("status")
         assignee = self.request.query_params.get("assignee")
         priority = self.request.query_params.get("priority")
+        q = self.request.query_params.get("q")
+        due_before = self.date_param("due_before")
+        due_after = self.date_param("due_after")
 
         if project_id:
             queryset = queryset.filter(project_id=project_id)
@@ -27,13 +49,75 @@ class TaskViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(assignees__id=assignee)
         if priority:
             queryset = queryset.filter(priority=priority)
+        if due_before:
+            queryset = queryset.filter(due_date__lte=due_before)
+        if due_after:
+            queryset = queryset.filter(due_date__gte=due_after)
+        if self.overdue:
+            queryset = queries.open_due(queryset, timezone.localdate() - timedelta(days=1))
+        if q:
+            queryset = search.search(queryset, q)
+
+        queryset = self.only_sparse_columns(queryset.order_by(*self.get_keyset_ordering()))
+        if not self.renders("assignees_info"):
+            return queryset
+        return queries.for_list(queryset)
+
+    def add_compact_relations(self, rows):
+        assignees = queries.assignee_ids([row["id"] for row in rows])
+        for row in rows:
+            row["assignees"] = assignees.get(row["id"], [])
+
+    def get_keyset_ordering(self):
+        # Search results come best match first, due date filters soonest first
+        params = self.request.query_params
+        if params.get("q"):
+            return ("-search_rank", "-id")
+        if self.overdue or params.get("due_before") or params.get("due_after"):
+            return ("due_date", "id")
+        return ("-updated_at", "-id")
+
+    @property
+    def overdue(self):
+        return self.request.query_params.get("overdue", "").lower() in ("1", "true", "yes", "on")
 
-        return queryset.distinct()
+    def date_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValidationError({name: "Expected a date (YYYY-MM-DD)."})
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    @transaction.atomic
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         project = serializer.validated_data["project"]
         user = self.request.user
-        if user != project.owner and not project.members.filter(id=user.id).exists():
+        if access.get_project_role(user, project.id) is None:
             raise PermissionDenied("You must be a project member to create a task.")
         serializer.save(created_by=user)
 
+    def perform_destroy(self, instance):
+        task_id, project_id = instance.id, instance.project_id
+        instance.delete()
+        publish_on_commit(project_id, "task.deleted", lambda: {"id": task_id})
+
+
+    @action(detail=False, methods=["post"], url_path="bulk", serializer_class=BulkRequestSerializer)
+    def bulk(self, request):
+        serializer = BulkRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        processor = TaskBulkProcessor(request.user, **serializer.validated_data)
+        results = processor.run()
+        return Response(
+            {"applied": processor.applied, "results": results},
+            status=http_status.HTTP_200_OK if processor.applied else http_status.HTTP_400_BAD_REQUEST,
+        )
@@ -0,0 +1,100 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """
+    Bounded, thread-safe LRU of users keyed by id (as a string, as token
+    claims may be), each entry tagged with the token version it was
+    checked against and dropped after ``ttl`` seconds. Per process:
+    invalidations reach other workers only through the TTL.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation: a load that raced one is not stored
+        self.epoch = 0
+
+    def get(self, user_id, version):
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            cached_version, user, expires = entry
+            if cached_version != version or expires <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # Requests get their own instance: views and permissions may set attributes on request.user
+        return copy.copy(user)
+
+    def set(self, user_id, version, user, epoch):
+        if self.max_size <= 0:
+            return
+        user_id = str(user_id)
+        with self._lock:
+            if epoch != self.epoch:
+                return
+            self._entries[user_id] = (version, copy.copy(user), time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self.epoch += 1
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_SECONDS)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication resolving ``request.user`` from ``user_cache`` instead of one users query per request."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        # A password change gives new tokens another version (with CHECK_REVOKE_TOKEN)
+        version = validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+        user = user_cache.get(user_id, version)
+        if user is not None:
+            return user
+        epoch = user_cache.epoch
+
+        # Always from the primary, so a replica lagging behind a deactivation cannot refill the cache
+        users = self.user_model._default_manager.db_manager(router.db_for_write(self.user_model))
+        try:
+            user = users.get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and version != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        user_cache.set(user_id, version, user, epoch)
+        return user
@@ -0,0 +1,109 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from django.db.models import Case, CharField, Count, F, Value, When, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from projects import access
+from projects.models import Project
+from tasks import counters
+from tasks.models import Task, TaskCounter
+
+CACHE_TIMEOUT = getattr(settings, "DASHBOARD_CACHE_SECONDS", 60)
+# Tasks listed per due date group; the counts cover all of them
+DUE_LIMIT = 20
+
+
+def _cache_key(user_id):
+    return f"users:dashboard:{user_id}"
+
+
+def _generation_key(project_id):
+    return f"users:dashboard:project:{project_id}"
+
+
+def invalidate_projects(project_ids):
+    """
+    Outdates the cached dashboards of everyone in these projects. Each
+    dashboard remembers the generation of its projects: a new one here
+    makes the next read rebuild it, without looking up who is concerned.
+    The generations move once the transaction commits, so no read can
+    cache the numbers from before the write under the new generation.
+    """
+    keys = [_generation_key(project_id) for project_id in set(project_ids)]
+    transaction.on_commit(
+        lambda: cache.set_many(dict.fromkeys(keys, time.time_ns()), None), using=router.db_for_write(Task)
+    )
+
+
+def get_dashboard(user):
+    roles = access.get_project_roles(user)
+    today = timezone.localdate()
+    keys = [_generation_key(project_id) for project_id in roles]
+    cached = cache.get_many([_cache_key(user.id)] + keys)
+    entry = cached.pop(_cache_key(user.id), None)
+    if entry is not None and entry["date"] == today and entry["generations"] == cached:
+        return entry["dashboard"]
+
+    # Projects never written to since the cache was emptied get a generation now, so the entry can match later
+    missing = {key: time.time_ns() for key in keys if key not in cached}
+    if missing:
+        cache.set_many(missing, None)
+        cached.update(missing)
+    dashboard = build_dashboard(user, roles, today)
+    cache.set(_cache_key(user.id), {"date": today, "generations": cached, "dashboard": dashboard}, CACHE_TIMEOUT)
+    return dashboard
+
+
+def build_dashboard(user, roles, today):
+    """Projects with role, open assigned tasks by status and priority, overdue and due this week."""
+    # Cached for a while: read from the primary, a lagging replica would pin stale numbers
+    using = router.db_for_write(Task)
+    projects = Project.objects.using(using).filter(id__in=roles).order_by("name", "id").values("id", "name")
+    open_assigned = (
+        Task.objects.using(using)
+        .filter(assignees=user.id, project_id__in=roles)
+        .exclude(status=Task.Status.DONE)
+    )
+
+    grouped = open_assigned.values("status", "priority").annotate(count=Count("id")).order_by()
+    cells = [TaskCounter(**row) for row in grouped]
+    assigned = counters.project_stats(cells)
+    assigned["status_priority"] = {
+        status: dict.fromkeys(Task.Priority.values, 0) for status in Task.Status.values if status != Task.Status.DONE
+    }
+    for cell in cells:
+        assigned["status_priority"][cell.status][cell.priority] = cell.count
+    del assigned["status"][Task.Status.DONE]
+
+    # Overdue and due this week in one pass: per group, the first DUE_LIMIT rows and the group size
+    week_end = today + timedelta(days=6 - today.weekday())
+    group = Case(When(due_date__lt=today, then=Value("overdue")), default=Value("due_this_week"), output_field=CharField())
+    due = (
+        open_assigned.filter(due_date__lte=week_end)
+        .annotate(
+            group=group,
+            position=Window(RowNumber(), partition_by=[group], order_by=[F("due_date").asc(), F("id").asc()]),
+            group_count=Window(Count("id"), partition_by=[group]),
+        )
+        .filter(position__lte=DUE_LIMIT)
+        .order_by("group", "position")
+        .values("id", "title", "project_id", "status", "priority", "due_date", "group", "group_count")
+    )
+    groups = {"overdue": {"count": 0, "tasks": []}, "due_this_week": {"count": 0, "tasks": []}}
+    for row in due:
+        bucket = groups[row.pop("group")]
+        bucket["count"] = row.pop("group_count")
+        row["project"] = row.pop("project_id")
+        bucket["tasks"].append(row)
+
+    return {
+        "projects": [{**project, "role": roles[project["id"]]} for project in projects],
+        "assigned": assigned,
+        **groups,
+        "week_end": week_end,
+    }
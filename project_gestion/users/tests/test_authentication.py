@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import UserCache, user_cache
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.toto)}")
+
+    def test_user_query_only_on_first_request(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get("/api/users/me/").data["username"], "toto")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/users/me/").data["username"], "toto")
+
+    def test_requests_get_their_own_instance(self):
+        self.client.get("/api/users/me/")
+        first = user_cache.get(self.toto.id, None)
+        first.username = "changed"
+        self.assertEqual(user_cache.get(self.toto.id, None).username, "toto")
+
+    def test_save_invalidates(self):
+        self.client.get("/api/users/me/")
+        self.toto.username = "toto2"
+        self.toto.save()
+        self.assertEqual(self.client.get("/api/users/me/").data["username"], "toto2")
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get("/api/users/me/")
+        self.toto.is_active = False
+        self.toto.save()
+        self.assertEqual(self.client.get("/api/users/me/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        self.client.get("/api/users/me/")
+        self.toto.delete()
+        self.assertEqual(self.client.get("/api/users/me/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    # simplejwt modules keep the api_settings object they imported: patch it rather than override SIMPLE_JWT
+    @mock.patch.object(api_settings, "CHECK_REVOKE_TOKEN", True)
+    def test_token_version(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.toto)}")
+        self.assertEqual(self.client.get("/api/users/me/").status_code, status.HTTP_200_OK)
+        self.toto.set_password("nouveau")
+        self.toto.save()
+        self.assertEqual(self.client.get("/api/users/me/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.toto)}")
+        self.assertEqual(self.client.get("/api/users/me/").status_code, status.HTTP_200_OK)
+
+
+class UserCacheTests(TestCase):
+    def test_lru_and_ttl(self):
+        users = [User(id=i, username=f"user{i}") for i in range(3)]
+        cache = UserCache(max_size=2, ttl=10)
+        with mock.patch("users.authentication.time.monotonic", return_value=100):
+            cache.set(0, None, users[0], cache.epoch)
+            cache.set(1, None, users[1], cache.epoch)
+            cache.get("0", None)
+            cache.set(2, None, users[2], cache.epoch)
+            self.assertIsNone(cache.get(1, None))
+            self.assertEqual(cache.get(0, None).username, "user0")
+            self.assertIsNone(cache.get(2, "other version"))
+        with mock.patch("users.authentication.time.monotonic", return_value=110):
+            self.assertIsNone(cache.get(0, None))
+
+    def test_load_racing_an_invalidation_is_dropped(self):
+        cache = UserCache(max_size=2, ttl=10)
+        epoch = cache.epoch
+        cache.invalidate(1)
+        cache.set(1, None, User(id=1, username="stale"), epoch)
+        self.assertIsNone(cache.get(1, None))
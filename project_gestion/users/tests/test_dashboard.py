@@ -0,0 +1,129 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+from users import dashboard
+
+
+class DashboardTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.toto = User.objects.create_user(username="toto", password="toto")
+        self.tata = User.objects.create_user(username="tata", password="tata")
+        self.project = Project.objects.create(name="Projet Toto", owner=self.toto)
+        ProjectMember.objects.create(project=self.project, user=self.toto, role="owner")
+        self.other = Project.objects.create(name="Projet Tata", owner=self.tata)
+        ProjectMember.objects.create(project=self.other, user=self.tata, role="owner")
+        ProjectMember.objects.create(project=self.other, user=self.toto, role="member")
+
+        self.today = timezone.localdate()
+        week_end = self.today + timedelta(days=6 - self.today.weekday())
+        self.overdue = self.task(self.project, "En retard", due_date=self.today - timedelta(days=2), priority="HIGH")
+        self.due = self.task(self.other, "Cette semaine", due_date=week_end)
+        self.task(self.project, "Plus tard", due_date=week_end + timedelta(days=1), status="IN_PROGRESS")
+        self.task(self.project, "Terminée", due_date=self.today - timedelta(days=1), status="DONE")
+        self.task(self.project, "Pas à moi", due_date=self.today - timedelta(days=1), assignee=self.tata)
+        self.url = "/api/users/me/dashboard/"
+        self.client.force_authenticate(user=self.toto)
+
+    def task(self, project, title, assignee=None, **fields):
+        task = Task.objects.create(project=project, title=title, created_by=self.toto, **fields)
+        task.assignees.add(assignee or self.toto)
+        return task
+
+    def test_content(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(
+            data["projects"],
+            [
+                {"id": self.other.id, "name": "Projet Tata", "role": "member"},
+                {"id": self.project.id, "name": "Projet Toto", "role": "owner"},
+            ],
+        )
+        self.assertEqual(data["assigned"]["total"], 3)
+        self.assertEqual(data["assigned"]["status"], {"TODO": 2, "IN_PROGRESS": 1})
+        self.assertEqual(data["assigned"]["priority"], {"LOW": 0, "MEDIUM": 2, "HIGH": 1, "CRITICAL": 0})
+        self.assertEqual(data["assigned"]["status_priority"]["TODO"], {"LOW": 0, "MEDIUM": 1, "HIGH": 1, "CRITICAL": 0})
+        self.assertEqual(data["overdue"]["count"], 1)
+        self.assertEqual([t["id"] for t in data["overdue"]["tasks"]], [self.overdue.id])
+        self.assertEqual(data["overdue"]["tasks"][0]["project"], self.project.id)
+        self.assertEqual(data["due_this_week"]["count"], 1)
+        self.assertEqual([t["title"] for t in data["due_this_week"]["tasks"]], ["Cette semaine"])
+
+    def test_listed_tasks_are_capped_not_the_counts(self):
+        for i in range(3):
+            self.task(self.project, f"Retard {i}", due_date=self.today - timedelta(days=10 + i))
+        with mock.patch.object(dashboard, "DUE_LIMIT", 2):
+            data = self.client.get(self.url).json()
+        self.assertEqual(data["overdue"]["count"], 4)
+        # Oldest first
+        self.assertEqual([t["title"] for t in data["overdue"]["tasks"]], ["Retard 2", "Retard 1"])
+
+    def test_query_count_and_cache(self):
+        # Project roles (2), projects, counts by status and priority, due tasks
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(self.url)
+        self.assertEqual(len(captured), 0)
+
+    def test_invalidated_by_task_writes(self):
+        self.assertEqual(self.client.get(self.url).json()["assigned"]["total"], 3)
+
+        self.overdue.status = "DONE"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.overdue.save()
+        data = self.client.get(self.url).json()
+        self.assertEqual((data["assigned"]["total"], data["overdue"]["count"]), (2, 0))
+
+        # Assigned from the other side of the relation, in the other project
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(project=self.other, title="Nouvelle", created_by=self.tata)
+        self.assertEqual(self.client.get(self.url).json()["assigned"]["total"], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.toto.assigned_tasks.add(task)
+        self.assertEqual(self.client.get(self.url).json()["assigned"]["total"], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.due.delete()
+        self.assertEqual(self.client.get(self.url).json()["due_this_week"]["count"], 0)
+
+    def test_invalidated_by_bulk_writes_and_membership(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/tasks/bulk/", {"operations": [
+                {"op": "create", "data": {"project": self.project.id, "title": "Lot", "assignees": [self.toto.id]}},
+            ]}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.client.get(self.url).json()["assigned"]["total"], 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectMember.objects.filter(project=self.other, user=self.toto).get().delete()
+        data = self.client.get(self.url).json()
+        self.assertEqual([p["id"] for p in data["projects"]], [self.project.id])
+        self.assertEqual(data["due_this_week"]["count"], 0)
+
+    def test_generation_moves_after_commit(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.overdue.status = "DONE"
+            self.overdue.save()
+            # Read before the commit: still the cached numbers, and nothing cached under a new generation
+            self.assertEqual(self.client.get(self.url).json()["overdue"]["count"], 1)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(self.url).json()["overdue"]["count"], 0)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
@@ -1,10 +1,12 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APITestCase
 from rest_framework import status
 
 class UserTests(APITestCase):
 
     def setUp(self):
+        cache.clear()
         self.user1 = User.objects.create_user(username="toto", password="toto")
         self.user2 = User.objects.create_user(username="tata", password="tata")
 
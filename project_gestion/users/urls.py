@@ -12,5 +12,6 @@ urlpatterns = [
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("me/", UserViewSet.as_view({'get': 'me'}), name="user_me"),
+    path("me/dashboard/", UserViewSet.as_view({'get': 'dashboard'}), name="user_dashboard"),
     path("", include(router.urls)),
 ]
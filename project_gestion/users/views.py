@@ -3,12 +3,14 @@ from .serializers import RegisterSerializer, UserSerializer
 from django.contrib.auth.models import User
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from project_gestion.replicas import ReplicaReadMixin
+from .dashboard import get_dashboard
 
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+class UserViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -16,4 +18,8 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'], url_path='me')
     def me(self, request):
         serializer = self.get_serializer(request.user)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'], url_path='me/dashboard')
+    def dashboard(self, request):
+        return Response(get_dashboard(request.user))